@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/2.1/ref/settings/
 """
 
 import os
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
@@ -26,10 +26,29 @@ SECRET_KEY = "rh@f3&8l=ai&18!r8vy#ongu+(z12qf(d4#_son(07+h+6%(vj"
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True if bool(os.getenv("DJANGO_DEBUG")) else False
 
+# Load the ephemeris and the timezone finder on start-up instead of on the first astro request
+ASTRO_WARM_UP = True if bool(os.getenv("ASTRO_WARM_UP")) else False
+
 VEREINSFLIEGER_APP_KEY = os.getenv("VEREINSFLIEGER_APP_KEY")
 VEREINSFLIEGER_USERNAME = os.getenv("VEREINSFLIEGER_USERNAME")
 VEREINSFLIEGER_PASSWORD = os.getenv("VEREINSFLIEGER_PASSWORD")
 
+# Raw flight data fetched from Vereinsflieger is cached on disk to avoid repeated requests and browser sessions
+VEREINSFLIEGER_CACHE_DIR = Path(os.getenv("VEREINSFLIEGER_CACHE_DIR", BASE_DIR / ".cache" / "vereinsflieger"))
+VEREINSFLIEGER_CACHE_TTL = timedelta(days=int(os.getenv("VEREINSFLIEGER_CACHE_TTL_DAYS", "30")))
+VEREINSFLIEGER_CACHE_MAX_SIZE = int(os.getenv("VEREINSFLIEGER_CACHE_MAX_SIZE", str(64 * 1024 * 1024)))
+
+# Vereinsflieger imports requested from the entries page run in a thread pool of the web process
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "4"))
+
+# Shared by the processes of the web server, e.g. to invalidate the filter choices in all of them
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": Path(os.getenv("DJANGO_CACHE_DIR", BASE_DIR / ".cache" / "django")),
+    }
+}
+
 if not DEBUG:
     SECURE_HSTS_SECONDS = 31536000
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
@@ -1,9 +1,11 @@
 import typing
 
-from django.contrib import admin
+from django.contrib import admin, messages
 
+from .classifiers.night import apply_night_classification, classify_night
 from .models.aerodrome import Aerodrome
 from .models.aircraft import Aircraft, FuelType
+from .models.import_job import ImportJob
 from .models.log_entry import LogEntry
 from .models.pilot import Certificate, Pilot
 from .templatetags.logbook_utils import duration
@@ -49,6 +51,13 @@ class AircraftAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "flight_id", "status", "log_entry", "created_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = ("log_entry", "created_at", "started_at", "finished_at")
+
+
 @admin.register(LogEntry)
 class LogEntryAdmin(admin.ModelAdmin):
     autocomplete_fields = ("aircraft", "from_aerodrome", "to_aerodrome", "pilot", "copilot")
@@ -69,6 +78,17 @@ class LogEntryAdmin(admin.ModelAdmin):
         "remarks",
     )
     save_as = True
+    actions = ("set_night_flag",)
+
+    @admin.action(description="Set night flag from twilight times")
+    def set_night_flag(self, request, queryset):
+        classifications = classify_night(queryset.select_related("from_aerodrome", "to_aerodrome"))
+        updated = apply_night_classification(classifications)
+
+        self.message_user(request, f"Updated the night flag of {len(updated)} of {len(classifications)} entries.")
+
+        if unknown := sum(classification.night is None for classification in classifications):
+            self.message_user(request, f"Twilight times unknown for {unknown} entries.", messages.WARNING)
 
     def get_time(self, obj):
         return (
@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class LogbookConfig(AppConfig):
     name = "logbook"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if settings.ASTRO_WARM_UP:
+            from . import astro
+
+            astro.warm_up()
@@ -0,0 +1,286 @@
+import enum
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from functools import wraps
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from skyfield import almanac
+from skyfield import api as sf_api
+from skyfield.jpllib import SpiceKernel
+from skyfield.timelib import Timescale
+from timezonefinder import TimezoneFinder
+
+from .models.aerodrome import Aerodrome, AerodromeAlmanac
+from .templatetags.logbook_utils import duration
+
+EPHEMERIS_PATH = Path(__file__).parent / "fixtures" / "data" / "de421.bsp"
+
+# Missing dates closer than this are computed in one search, which is cheaper than searching for each date separately
+ALMANAC_MAX_GAP = timedelta(days=7)
+
+
+class SkyfieldTwilight(enum.IntEnum):
+    NIGHT = 0
+    ASTRONOMICAL = 1
+    NAUTICAL = 2
+    CIVIL = 3
+    DAY = 4
+
+
+class SkyfieldLocation(enum.IntEnum):
+    SUNSET = 0
+    SUNRISE = 1
+
+
+def round_to_nearest_minute(dt: datetime) -> datetime:
+    return (dt + timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LocationData:
+    aerodrome: Aerodrome
+    timezone: ZoneInfo
+    morning_twilight: datetime
+    sunrise: datetime
+    sunset: datetime
+    evening_twilight: datetime
+
+    @property
+    def morning_twilight_duration(self) -> timedelta:
+        return self.sunrise - self.morning_twilight
+
+    @property
+    def evening_twilight_duration(self) -> timedelta:
+        return self.evening_twilight - self.sunset
+
+    @property
+    def utc_offset(self) -> str:
+        utc_offset = self.timezone.utcoffset(datetime.now(tz=UTC))
+        return "UTC" + ("-" if utc_offset.total_seconds() < 0 else "+") + duration(utc_offset, "%H:%M")
+
+    @classmethod
+    def from_almanac(cls, row: AerodromeAlmanac) -> "LocationData":
+        return cls(
+            aerodrome=row.aerodrome,
+            timezone=ZoneInfo(row.timezone),
+            morning_twilight=row.morning_twilight,
+            sunrise=row.sunrise,
+            sunset=row.sunset,
+            evening_twilight=row.evening_twilight,
+        )
+
+    def to_almanac(self, day: date) -> AerodromeAlmanac:
+        return AerodromeAlmanac(
+            aerodrome=self.aerodrome,
+            date=day,
+            timezone=self.timezone.key,
+            morning_twilight=self.morning_twilight,
+            sunrise=self.sunrise,
+            sunset=self.sunset,
+            evening_twilight=self.evening_twilight,
+        )
+
+
+_lock = threading.Lock()
+_loaders: list[Callable] = []
+
+
+def load_once(loader: Callable) -> Callable:
+    """
+    Shares the result of the loader across all threads of the process, initializing it lazily under a lock
+    """
+    value, loaded = None, False
+
+    @wraps(loader)
+    def wrapper():
+        nonlocal value, loaded
+        if not loaded:
+            with _lock:
+                if not loaded:
+                    value, loaded = loader(), True
+        return value
+
+    def reset():
+        nonlocal value, loaded
+        with _lock:
+            value, loaded = None, False
+
+    wrapper.reset = reset
+    _loaders.append(wrapper)
+    return wrapper
+
+
+@load_once
+def get_ephemeris() -> SpiceKernel:
+    return sf_api.load_file(EPHEMERIS_PATH)
+
+
+@load_once
+def get_timescale() -> Timescale:
+    return sf_api.load.timescale()
+
+
+@load_once
+def get_timezone_finder() -> TimezoneFinder:
+    return TimezoneFinder()
+
+
+def warm_up():
+    for loader in _loaders:
+        loader()
+
+
+def reset():
+    for loader in _loaders:
+        loader.reset()
+
+
+def get_timezone(aerodrome: Aerodrome) -> ZoneInfo:
+    return ZoneInfo(get_timezone_finder().timezone_at(lng=float(aerodrome.longitude), lat=float(aerodrome.latitude)))
+
+
+def compute_location_data(aerodrome: Aerodrome, day: date) -> LocationData:
+    ephemeris = get_ephemeris()
+    zi = get_timezone(aerodrome)
+
+    today_midnight = datetime.combine(day, datetime.min.time(), tzinfo=zi)
+
+    timescale = get_timescale()
+    t0 = timescale.from_datetime(today_midnight)
+    t1 = timescale.from_datetime(today_midnight + timedelta(days=1))
+
+    location = sf_api.wgs84.latlon(aerodrome.latitude, aerodrome.longitude)
+
+    find_discrete = almanac.find_discrete(t0, t1, almanac.sunrise_sunset(ephemeris, location))
+    (sunrise_time, sunset_time), ss_events = find_discrete
+
+    assert tuple(ss_events) == (SkyfieldLocation.SUNRISE, SkyfieldLocation.SUNSET)
+
+    find_discrete = almanac.find_discrete(t0, t1, almanac.dark_twilight_day(ephemeris, location))
+    twilight_times, twilight_events = find_discrete
+
+    reference_events = [
+        str(item)
+        for item in (
+            SkyfieldTwilight.NIGHT,
+            SkyfieldTwilight.ASTRONOMICAL,
+            SkyfieldTwilight.NAUTICAL,
+            SkyfieldTwilight.CIVIL,
+            SkyfieldTwilight.DAY,
+            SkyfieldTwilight.CIVIL,
+            SkyfieldTwilight.NAUTICAL,
+            SkyfieldTwilight.ASTRONOMICAL,
+        )
+    ]
+
+    assert "".join(map(str, twilight_events)) in "".join(reference_events + reference_events[::1])
+
+    labeled_twilight_events = list(zip(twilight_times, twilight_events))
+
+    def filter_first(label: SkyfieldTwilight, events: list[tuple[sf_api.Time, int]]):
+        return next(filter(lambda event: event[1] == label, events))
+
+    morning_twilight, _ = filter_first(SkyfieldTwilight.CIVIL, labeled_twilight_events)
+    evening_twilight, _ = filter_first(SkyfieldTwilight.NAUTICAL, labeled_twilight_events[::-1])
+
+    return LocationData(
+        aerodrome=aerodrome,
+        timezone=zi,
+        sunrise=round_to_nearest_minute(sunrise_time.utc_datetime()),
+        sunset=round_to_nearest_minute(sunset_time.utc_datetime()),
+        morning_twilight=round_to_nearest_minute(morning_twilight.utc_datetime()),
+        evening_twilight=round_to_nearest_minute(evening_twilight.utc_datetime()),
+    )
+
+
+def compute_almanac(aerodrome: Aerodrome, start: date, days: int) -> Iterator[tuple[date, LocationData]]:
+    """
+    Computes the location data for a range of local dates with one event search over the whole range
+
+    Dates without exactly one sunrise and one sunset, or without civil and nautical twilight (polar days and nights),
+    are skipped.
+    """
+    ephemeris = get_ephemeris()
+    zi = get_timezone(aerodrome)
+
+    timescale = get_timescale()
+    t0 = timescale.from_datetime(datetime.combine(start, datetime.min.time(), tzinfo=zi))
+    t1 = timescale.from_datetime(datetime.combine(start + timedelta(days=days), datetime.min.time(), tzinfo=zi))
+
+    location = sf_api.wgs84.latlon(aerodrome.latitude, aerodrome.longitude)
+
+    def events_by_date(function) -> dict[date, list[tuple[datetime, int]]]:
+        times, events = almanac.find_discrete(t0, t1, function)
+        result = defaultdict(list)
+        for time, event in zip(times.utc_datetime(), events):
+            result[time.astimezone(zi).date()].append((time, event))
+        return result
+
+    sun_events = events_by_date(almanac.sunrise_sunset(ephemeris, location))
+    twilight_events = events_by_date(almanac.dark_twilight_day(ephemeris, location))
+
+    for day in (start + timedelta(days=offset) for offset in range(days)):
+        sun = sun_events.get(day, [])
+        twilight = twilight_events.get(day, [])
+
+        if tuple(event for _, event in sun) != (SkyfieldLocation.SUNRISE, SkyfieldLocation.SUNSET):
+            continue
+
+        morning_twilight = next((time for time, event in twilight if event == SkyfieldTwilight.CIVIL), None)
+        evening_twilight = next(
+            (time for time, event in reversed(twilight) if event == SkyfieldTwilight.NAUTICAL), None
+        )
+
+        if morning_twilight is None or evening_twilight is None:
+            continue
+
+        (sunrise, _), (sunset, _) = sun
+
+        yield (
+            day,
+            LocationData(
+                aerodrome=aerodrome,
+                timezone=zi,
+                sunrise=round_to_nearest_minute(sunrise),
+                sunset=round_to_nearest_minute(sunset),
+                morning_twilight=round_to_nearest_minute(morning_twilight),
+                evening_twilight=round_to_nearest_minute(evening_twilight),
+            ),
+        )
+
+
+def get_almanac(aerodrome: Aerodrome, days: Iterable[date], store: bool = True) -> dict[date, LocationData]:
+    """
+    Looks up the location data of an aerodrome for the given local dates, computing and storing the missing ones
+
+    With `store=False`, the missing dates are computed without storing them, e.g. for dry runs.
+    """
+    days = sorted(set(days))
+
+    result = {}
+    for row in AerodromeAlmanac.objects.filter(aerodrome=aerodrome, date__in=days):
+        row.aerodrome = aerodrome
+        result[row.date] = LocationData.from_almanac(row)
+
+    runs: list[list[date]] = []
+    for day in (day for day in days if day not in result):
+        if runs and day - runs[-1][-1] <= ALMANAC_MAX_GAP:
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+
+    computed = {}
+    for run in runs:
+        computed.update(compute_almanac(aerodrome, run[0], (run[-1] - run[0]).days + 1))
+
+    if store:
+        AerodromeAlmanac.objects.bulk_create(
+            (location_data.to_almanac(day) for day, location_data in computed.items()),
+            ignore_conflicts=True,
+        )
+
+    return result | computed
@@ -0,0 +1,139 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections.abc import Container, Sequence
+from dataclasses import dataclass
+
+from .models.aerodrome import Aerodrome
+from .versions import bump_version, get_version
+
+DEFAULT_LIMIT = 10
+
+WORD_SEPARATOR = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercases the text and strips diacritics, so that e.g. "merzbruck" matches "Merzbrück"
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(character for character in decomposed if not unicodedata.combining(character))
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in WORD_SEPARATOR.split(normalize(text)) if token]
+
+
+@dataclass(frozen=True, kw_only=True)
+class AerodromeSuggestion:
+    id: int
+    icao_code: str
+    name: str
+    city: str
+    priority: int
+
+    def to_json(self) -> dict:
+        return {
+            "id": self.id,
+            "text": f"{self.icao_code} ({self.name})",
+            "icao_code": self.icao_code,
+            "name": self.name,
+            "city": self.city,
+        }
+
+
+class AerodromePrefixIndex:
+    """
+    Sorted words of the ICAO codes, names and cities of all aerodromes, searched for prefixes with bisect
+
+    Every word of a query has to be a prefix of a word of the aerodrome. Suggestions whose ICAO code starts with the
+    query come first, then they are ranked by priority.
+    """
+
+    def __init__(self, aerodromes: Sequence[AerodromeSuggestion]):
+        self.aerodromes = list(aerodromes)
+        self._tokens = [
+            frozenset(tokenize(f"{aerodrome.icao_code} {aerodrome.name} {aerodrome.city}"))
+            for aerodrome in self.aerodromes
+        ]
+
+        entries = sorted((token, position) for position, tokens in enumerate(self._tokens) for token in tokens)
+        self._words = [token for token, _ in entries]
+        self._positions = [position for _, position in entries]
+
+    @classmethod
+    def from_database(cls) -> "AerodromePrefixIndex":
+        return cls(
+            [
+                AerodromeSuggestion(id=pk, icao_code=icao_code, name=name, city=city, priority=priority)
+                for pk, icao_code, name, city, priority in Aerodrome.objects.values_list(
+                    "pk", "icao_code", "name", "city", "priority"
+                )
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self.aerodromes)
+
+    def _prefixed(self, prefix: str) -> set[int]:
+        start = bisect_left(self._words, prefix)
+        # Words consist of lowercase letters and digits, so every word with the prefix sorts before the prefix + "{"
+        stop = bisect_left(self._words, prefix + "{", lo=start)
+        return set(self._positions[start:stop])
+
+    def search(
+        self, query: str, limit: int = DEFAULT_LIMIT, ids: Container[int] | None = None
+    ) -> list[AerodromeSuggestion]:
+        """
+        Returns the best matching aerodromes, optionally only those whose IDs are in `ids`
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # Look up the longest word, which matches the fewest aerodromes, and check the others against their tokens
+        words.sort(key=len, reverse=True)
+        candidates = [
+            position
+            for position in self._prefixed(words[0])
+            if (ids is None or self.aerodromes[position].id in ids)
+            and all(any(token.startswith(word) for token in self._tokens[position]) for word in words[1:])
+        ]
+
+        code = normalize(query.strip())
+        candidates.sort(
+            key=lambda position: (
+                not normalize(self.aerodromes[position].icao_code).startswith(code),
+                self.aerodromes[position].priority,
+                self.aerodromes[position].icao_code,
+            )
+        )
+        return [self.aerodromes[position] for position in candidates[:limit]]
+
+
+VERSION_CACHE_KEY = "logbook:aerodrome-prefix-index:version"
+
+_index_lock = threading.Lock()
+_index: AerodromePrefixIndex | None = None
+_index_version: int | None = None
+
+
+def get_aerodrome_prefix_index() -> AerodromePrefixIndex:
+    """
+    Returns the prefix index of the process, built on first use and after `invalidate_aerodrome_prefix_index()`
+
+    Like the filter choices, the index is kept along with the shared version read before building it, so an
+    invalidation by any process makes the next call build it again.
+    """
+    global _index, _index_version
+
+    version = get_version(VERSION_CACHE_KEY)
+    with _index_lock:
+        if _index is None or _index_version != version:
+            _index, _index_version = AerodromePrefixIndex.from_database(), version
+        return _index
+
+
+def invalidate_aerodrome_prefix_index():
+    bump_version(VERSION_CACHE_KEY)
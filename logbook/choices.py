@@ -0,0 +1,72 @@
+import threading
+from dataclasses import dataclass
+
+from django.db.models import QuerySet
+
+from .models.aerodrome import Aerodrome
+from .models.log_entry import LogEntry
+from .versions import bump_version, get_version
+
+
+@dataclass(frozen=True, kw_only=True)
+class FilterChoices:
+    registrations: list[tuple[str, str]]
+    aerodromes: frozenset[int]  # IDs of the aerodromes that occur in the logbook
+
+    @classmethod
+    def from_database(cls) -> "FilterChoices":
+        registrations = (
+            LogEntry.objects.order_by("aircraft__registration")
+            .values_list("aircraft__registration", flat=True)
+            .distinct()
+        )
+        # One UNION of both foreign keys, which also removes the duplicates
+        aerodromes = (
+            LogEntry.objects.order_by()
+            .values_list("from_aerodrome", flat=True)
+            .union(LogEntry.objects.order_by().values_list("to_aerodrome", flat=True))
+        )
+        return cls(
+            registrations=[(registration, registration) for registration in registrations],
+            aerodromes=frozenset(aerodromes),
+        )
+
+
+VERSION_CACHE_KEY = "logbook:filter-choices:version"
+
+_choices_lock = threading.Lock()
+_choices: FilterChoices | None = None
+_choices_version: int | None = None
+
+
+def get_filter_choices() -> FilterChoices:
+    """
+    Returns the choices of the entries filter, computed on first use and after `invalidate_filter_choices()`
+
+    The choices are kept along with the version read before computing them, so a write that races with the
+    computation bumps the version and the next call computes them again.
+    """
+    global _choices, _choices_version
+
+    version = get_version(VERSION_CACHE_KEY)
+    with _choices_lock:
+        if _choices is not None and _choices_version == version:
+            return _choices
+
+    choices = FilterChoices.from_database()
+
+    with _choices_lock:
+        _choices, _choices_version = choices, version
+    return choices
+
+
+def invalidate_filter_choices():
+    bump_version(VERSION_CACHE_KEY)
+
+
+def registration_choices() -> list[tuple[str, str]]:
+    return get_filter_choices().registrations
+
+
+def logbook_aerodromes(request=None) -> QuerySet[Aerodrome]:
+    return Aerodrome.objects.filter(pk__in=get_filter_choices().aerodromes)
@@ -0,0 +1,73 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.utils.timezone import localdate
+
+from ..geo import get_aerodrome_index
+from ..models.daily_totals import DailyTotals
+from ..models.log_entry import FunctionType, LogEntry
+
+# Legs longer than this count as cross-country, e.g. for the night rating (more than 27 NM / 50 km)
+CROSS_COUNTRY_DISTANCE = 27.0
+
+
+@dataclass(frozen=True, kw_only=True)
+class CrossCountryClassification:
+    entry: LogEntry
+    distance: float  # Great-circle distance between the aerodromes in NM
+    threshold: float = CROSS_COUNTRY_DISTANCE
+
+    @property
+    def cross_country(self) -> bool:
+        # Only PIC time may be cross-country, see the `no_pic_no_xc` constraint
+        return self.entry.time_function == FunctionType.PIC and self.distance > self.threshold
+
+    @property
+    def changed(self) -> bool:
+        # Entries are only ever promoted, flags set by hand (e.g. for round trips via other aerodromes) are kept
+        return self.cross_country and not self.entry.cross_country
+
+
+def classify_cross_country(
+    entries: Iterable[LogEntry], threshold: float = CROSS_COUNTRY_DISTANCE
+) -> list[CrossCountryClassification]:
+    """
+    Computes the leg distance of each entry from its aerodromes in one vectorised pass over the aerodrome index
+
+    Entries don't have to be saved, only their aerodromes have to be.
+    """
+    entries = list(entries)
+    pairs = [(entry.from_aerodrome_id, entry.to_aerodrome_id) for entry in entries]
+    index = get_aerodrome_index(pk for pair in pairs for pk in pair)
+
+    return [
+        CrossCountryClassification(entry=entry, distance=float(distance), threshold=threshold)
+        for entry, distance in zip(entries, index.distances(pairs))
+    ]
+
+
+def promote_cross_country(classifications: Iterable[CrossCountryClassification]) -> list[LogEntry]:
+    """
+    Sets the cross-country flag of the entries whose classification changed without saving them, returns them
+    """
+    entries = []
+    for classification in classifications:
+        if classification.changed:
+            classification.entry.cross_country = True
+            entries.append(classification.entry)
+    return entries
+
+
+def apply_cross_country_classification(classifications: Iterable[CrossCountryClassification]) -> list[LogEntry]:
+    """
+    Updates the cross-country flag of the entries whose classification changed and returns them
+    """
+    entries = promote_cross_country(classifications)
+
+    with transaction.atomic():
+        LogEntry.objects.bulk_update(entries, ["cross_country"])
+        # Bulk updates bypass signals, which bucket the rollup by local date
+        DailyTotals.rebuild(localdate(entry.departure_time) for entry in entries)
+
+    return entries
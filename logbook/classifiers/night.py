@@ -0,0 +1,113 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.db import transaction
+from django.utils.timezone import localdate
+
+from ..astro import get_almanac, get_timezone
+from ..models.aerodrome import Aerodrome
+from ..models.daily_totals import DailyTotals
+from ..models.log_entry import LogEntry
+
+# Entries with less night time are rounding artifacts of the minute precision of the almanac
+MINIMUM_NIGHT_TIME = timedelta(minutes=1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class NightClassification:
+    entry: LogEntry
+    night_time: timedelta | None  # None if the twilight times could not be determined
+
+    @property
+    def night(self) -> bool | None:
+        return None if self.night_time is None else self.night_time >= MINIMUM_NIGHT_TIME
+
+    @property
+    def changed(self) -> bool:
+        return self.night is not None and self.night != self.entry.night
+
+
+def get_nights(departure_time: datetime, arrival_time: datetime, from_zone: ZoneInfo, to_zone: ZoneInfo) -> list[date]:
+    """
+    Returns the local dates of the evenings whose nights may overlap with the flight
+    """
+    first = departure_time.astimezone(from_zone).date() - timedelta(days=1)
+    last = arrival_time.astimezone(to_zone).date()
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def classify_night(entries: Iterable[LogEntry], store: bool = True) -> list[NightClassification]:
+    """
+    Computes the time of each entry between evening civil twilight at the departure aerodrome and morning civil
+    twilight at the arrival aerodrome
+
+    Twilight times are taken from the aerodrome almanac, and the missing dates are computed with one search per
+    aerodrome and range of dates rather than per entry. They are only stored in the almanac with `store=True`.
+    """
+    entries = list(entries)
+
+    aerodromes: dict[int, Aerodrome] = {}
+    timezones: dict[int, ZoneInfo] = {}
+    days: dict[int, set[date]] = defaultdict(set)
+    nights: dict[int, list[date]] = {}
+
+    for entry in entries:
+        for aerodrome in (entry.from_aerodrome, entry.to_aerodrome):
+            if aerodrome.pk not in aerodromes:
+                aerodromes[aerodrome.pk] = aerodrome
+                timezones[aerodrome.pk] = get_timezone(aerodrome)
+
+        nights[entry.pk] = get_nights(
+            entry.departure_time,
+            entry.arrival_time,
+            timezones[entry.from_aerodrome_id],
+            timezones[entry.to_aerodrome_id],
+        )
+
+        days[entry.from_aerodrome_id].update(nights[entry.pk])
+        days[entry.to_aerodrome_id].update(day + timedelta(days=1) for day in nights[entry.pk])
+
+    almanacs = {pk: get_almanac(aerodromes[pk], aerodrome_days, store=store) for pk, aerodrome_days in days.items()}
+
+    classifications = []
+    for entry in entries:
+        night_time = timedelta()
+
+        for day in nights[entry.pk]:
+            dusk = almanacs[entry.from_aerodrome_id].get(day)
+            dawn = almanacs[entry.to_aerodrome_id].get(day + timedelta(days=1))
+
+            if dusk is None or dawn is None:
+                night_time = None
+                break
+
+            start = max(entry.departure_time, dusk.evening_twilight)
+            end = min(entry.arrival_time, dawn.morning_twilight)
+
+            if end > start:
+                night_time += end - start
+
+        classifications.append(NightClassification(entry=entry, night_time=night_time))
+
+    return classifications
+
+
+def apply_night_classification(classifications: Iterable[NightClassification]) -> list[LogEntry]:
+    """
+    Updates the night flag of the entries whose classification changed and returns them
+    """
+    entries = []
+    for classification in classifications:
+        if classification.changed:
+            classification.entry.night = classification.night
+            entries.append(classification.entry)
+
+    with transaction.atomic():
+        LogEntry.objects.bulk_update(entries, ["night"])
+        # Bulk updates bypass signals, which bucket the rollup by local date
+        DailyTotals.rebuild(localdate(entry.departure_time) for entry in entries)
+
+    return entries
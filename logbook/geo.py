@@ -0,0 +1,242 @@
+import heapq
+import threading
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .models.aerodrome import Aerodrome
+from .versions import bump_version, get_version
+
+EARTH_RADIUS_NM = 3440.065
+
+
+def haversine(latitude1, longitude1, latitude2, longitude2) -> np.ndarray:
+    """
+    Great-circle distances in nautical miles between points given in degrees, element-wise for arrays
+    """
+    coordinates = (latitude1, longitude1, latitude2, longitude2)
+    phi1, lambda1, phi2, lambda2 = (np.radians(np.asarray(value, dtype=float)) for value in coordinates)
+
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin((lambda2 - lambda1) / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def unit_vectors(latitudes, longitudes) -> np.ndarray:
+    phi, lambda_ = np.radians(np.asarray(latitudes, dtype=float)), np.radians(np.asarray(longitudes, dtype=float))
+    return np.stack((np.cos(phi) * np.cos(lambda_), np.cos(phi) * np.sin(lambda_), np.sin(phi)), axis=-1)
+
+
+def chord_to_distance(chord) -> np.ndarray:
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def distance_to_chord(distance: float) -> float:
+    return 2 * np.sin(min(distance / EARTH_RADIUS_NM, np.pi) / 2)
+
+
+class KDTree:
+    """
+    Static k-d tree over 3D points, split at the median of the widest axis down to leaves of at most `leaf_size` points
+
+    Distances are Euclidean; for unit vectors the chord length orders points like the great-circle distance.
+    """
+
+    DEFAULT_LEAF_SIZE = 16
+
+    def __init__(self, points: np.ndarray, leaf_size: int = DEFAULT_LEAF_SIZE):
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(points))
+
+        points = np.asarray(points, dtype=float)
+        # Nodes are (start, stop, axis, split, left, right) over `order`, leaves have no axis
+        self._nodes: list[tuple[int, int, int, float, int, int]] = []
+        if len(points):
+            self._build(points, 0, len(points))
+
+        self.points = points[self.order]
+
+    def _build(self, points: np.ndarray, start: int, stop: int) -> int:
+        node = len(self._nodes)
+        self._nodes.append((start, stop, -1, 0.0, -1, -1))
+        if stop - start <= self.leaf_size:
+            return node
+
+        indices = self.order[start:stop]
+        coordinates = points[indices]
+        axis = int(np.argmax(coordinates.max(axis=0) - coordinates.min(axis=0)))
+
+        middle = (stop - start) // 2
+        self.order[start:stop] = indices[np.argpartition(coordinates[:, axis], middle)]
+        split = float(points[self.order[start + middle], axis])
+
+        left = self._build(points, start, start + middle)
+        right = self._build(points, start + middle, stop)
+        self._nodes[node] = (start, stop, axis, split, left, right)
+        return node
+
+    def _squared_distances(self, point: np.ndarray, start: int, stop: int) -> np.ndarray:
+        return ((self.points[start:stop] - point) ** 2).sum(axis=1)
+
+    def nearest(self, point: np.ndarray, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the indices of the `k` nearest points and their distances, nearest first
+        """
+        if not self._nodes or k < 1:
+            return np.empty(0, dtype=int), np.empty(0)
+
+        # Max-heap of the best candidates by negated squared distance
+        best: list[tuple[float, int]] = []
+
+        def visit(node: int):
+            start, stop, axis, split, left, right = self._nodes[node]
+            if axis < 0:
+                for position, distance in zip(range(start, stop), self._squared_distances(point, start, stop)):
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, position))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, position))
+                return
+
+            offset = point[axis] - split
+            near, far = (left, right) if offset < 0 else (right, left)
+            visit(near)
+            if len(best) < k or offset**2 < -best[0][0]:
+                visit(far)
+
+        visit(0)
+
+        best.sort(reverse=True)
+        positions = np.array([position for _, position in best], dtype=int)
+        return self.order[positions], np.sqrt([-distance for distance, _ in best])
+
+    def within(self, point: np.ndarray, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the indices of all points within `radius` and their distances, nearest first
+        """
+        positions, distances = [], []
+        squared_radius = radius**2
+
+        def visit(node: int):
+            start, stop, axis, split, left, right = self._nodes[node]
+            if axis < 0:
+                squared_distances = self._squared_distances(point, start, stop)
+                (found,) = np.nonzero(squared_distances <= squared_radius)
+                positions.append(found + start)
+                distances.append(squared_distances[found])
+                return
+
+            offset = point[axis] - split
+            if offset <= radius:
+                visit(left)
+            if offset >= -radius:
+                visit(right)
+
+        if self._nodes:
+            visit(0)
+
+        if not positions:
+            return np.empty(0, dtype=int), np.empty(0)
+
+        positions, distances = np.concatenate(positions), np.concatenate(distances)
+        order = np.argsort(distances, kind="stable")
+        return self.order[positions[order]], np.sqrt(distances[order])
+
+
+@dataclass(frozen=True, kw_only=True)
+class Neighbour:
+    aerodrome_id: int
+    icao_code: str
+    distance: float
+
+
+class AerodromeIndex:
+    """
+    In-memory spatial index of all aerodromes, see `get_aerodrome_index()`
+    """
+
+    def __init__(self, rows: Sequence[tuple[int, str, float, float]]):
+        ids, icao_codes, latitudes, longitudes = zip(*rows) if rows else ((), (), (), ())
+
+        self.ids = np.array(ids, dtype=int)
+        self.icao_codes = list(icao_codes)
+        self.latitudes = np.array(latitudes, dtype=float)
+        self.longitudes = np.array(longitudes, dtype=float)
+
+        self._positions = {pk: position for position, pk in enumerate(ids)}
+        self._tree = KDTree(unit_vectors(self.latitudes, self.longitudes).reshape(-1, 3))
+
+    @staticmethod
+    def rows_from_database() -> list[tuple[int, str, float, float]]:
+        return [
+            (pk, icao_code, float(latitude), float(longitude))
+            for pk, icao_code, latitude, longitude in Aerodrome.objects.values_list(
+                "pk", "icao_code", "latitude", "longitude"
+            )
+        ]
+
+    @classmethod
+    def from_database(cls) -> "AerodromeIndex":
+        return cls(cls.rows_from_database())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, aerodrome_id: int) -> bool:
+        return aerodrome_id in self._positions
+
+    def _neighbours(self, indices: np.ndarray, chords: np.ndarray) -> list[Neighbour]:
+        return [
+            Neighbour(aerodrome_id=int(self.ids[index]), icao_code=self.icao_codes[index], distance=float(distance))
+            for index, distance in zip(indices, chord_to_distance(chords))
+        ]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> list[Neighbour]:
+        return self._neighbours(*self._tree.nearest(unit_vectors(latitude, longitude), k))
+
+    def within(self, latitude: float, longitude: float, radius: float) -> list[Neighbour]:
+        """
+        Aerodromes within `radius` nautical miles, nearest first
+        """
+        return self._neighbours(*self._tree.within(unit_vectors(latitude, longitude), distance_to_chord(radius)))
+
+    def distances(self, pairs: Iterable[tuple[int, int]]) -> np.ndarray:
+        """
+        Great-circle distances in nautical miles between pairs of aerodrome IDs
+        """
+        positions = np.array([(self._positions[a], self._positions[b]) for a, b in pairs], dtype=int).reshape(-1, 2)
+        a, b = positions[:, 0], positions[:, 1]
+        return haversine(self.latitudes[a], self.longitudes[a], self.latitudes[b], self.longitudes[b])
+
+    def distance(self, a: int, b: int) -> float:
+        return float(self.distances([(a, b)])[0])
+
+
+VERSION_CACHE_KEY = "logbook:aerodrome-index:version"
+
+_index_lock = threading.Lock()
+_index: AerodromeIndex | None = None
+_index_version: int | None = None
+
+
+def get_aerodrome_index(aerodrome_ids: Iterable[int] = ()) -> AerodromeIndex:
+    """
+    Returns the aerodrome index of the process, built on first use and after `invalidate_aerodrome_index()`
+
+    The index is kept along with the version read before building it, so an invalidation by any process, or one that
+    races with the build, makes the next call build it again. It's also rebuilt if it lacks any of the given
+    aerodromes, e.g. created by bulk writes that bypass the invalidation.
+    """
+    global _index, _index_version
+
+    version = get_version(VERSION_CACHE_KEY)
+    with _index_lock:
+        if _index is not None and _index_version == version and all(pk in _index for pk in aerodrome_ids):
+            return _index
+
+        _index, _index_version = AerodromeIndex.from_database(), version
+        return _index
+
+
+def invalidate_aerodrome_index():
+    bump_version(VERSION_CACHE_KEY)
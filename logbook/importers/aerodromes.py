@@ -0,0 +1,128 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TextIO
+
+from django.db import transaction
+from django.db.models import Q
+from django_countries import countries
+
+from ..autocomplete import invalidate_aerodrome_prefix_index
+from ..choices import invalidate_filter_choices
+from ..geo import invalidate_aerodrome_index
+from ..models.aerodrome import Aerodrome, AerodromeDistance
+from .flightlog import chunked
+
+# Reference data from http://ourairports.com/data/
+OURAIRPORTS_TYPES = {"small_airport", "medium_airport", "large_airport", "seaplane_base"}
+
+# Aerodromes only known from OurAirports are sorted after the curated ones, whose priority is the distance in km
+OURAIRPORTS_PRIORITY = 1000
+
+COORDINATE_PRECISION = Decimal("0.000001")
+
+AERODROME_FIELDS = ("name", "city", "country", "latitude", "longitude", "elevation", "priority")
+
+
+def read_bitbringers(fp: TextIO) -> Iterator[Aerodrome]:
+    # Later entries of duplicate ICAO codes replace earlier ones, they are the more complete records
+    aerodromes = {aerodrome["icao"]: aerodrome for aerodrome in json.load(fp, parse_float=Decimal)}
+
+    for aerodrome in aerodromes.values():
+        yield Aerodrome(
+            icao_code=aerodrome["icao"],
+            name=aerodrome["name"],
+            city=aerodrome["city"],
+            country=countries.by_name(aerodrome["country"]),
+            latitude=aerodrome["lat"].quantize(COORDINATE_PRECISION),
+            longitude=aerodrome["lng"].quantize(COORDINATE_PRECISION),
+            elevation=aerodrome["elev"],
+            priority=aerodrome["distance"],
+        )
+
+
+def read_ourairports(fp: TextIO) -> Iterator[Aerodrome]:
+    """
+    Streams the aerodromes with a four-letter ICAO identifier from an OurAirports `airports.csv` file
+    """
+    for row in csv.DictReader(fp):
+        if row["type"] not in OURAIRPORTS_TYPES or len(row["ident"]) != 4 or not row["ident"].isalpha():
+            continue
+
+        yield Aerodrome(
+            icao_code=row["ident"],
+            name=row["name"][: Aerodrome._meta.get_field("name").max_length],
+            city=row["municipality"][: Aerodrome._meta.get_field("city").max_length],
+            country=row["iso_country"],
+            latitude=Decimal(row["latitude_deg"]).quantize(COORDINATE_PRECISION),
+            longitude=Decimal(row["longitude_deg"]).quantize(COORDINATE_PRECISION),
+            elevation=round(float(row["elevation_ft"] or 0)),
+            priority=OURAIRPORTS_PRIORITY,
+        )
+
+
+def read_reference_icao_codes(fp: TextIO) -> set[str]:
+    return {row["ident"] for row in csv.DictReader(fp)}
+
+
+@dataclass(kw_only=True)
+class AerodromeImport:
+    created: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def invalidate_aerodrome_caches():
+    invalidate_aerodrome_index()
+    invalidate_aerodrome_prefix_index()
+    invalidate_filter_choices()
+
+
+def upsert_aerodromes(
+    aerodromes: Iterable[Aerodrome], update_fields: Iterable[str], batch_size: int
+) -> AerodromeImport:
+    """
+    Inserts new aerodromes and updates changed ones by ICAO code in chunks, skipping those that are unchanged
+
+    Only the given fields are compared and updated, and the ICAO codes must be unique. Call it inside a transaction.
+    Bulk writes bypass signals, so the distances of updated aerodromes are deleted and the caches invalidated here.
+    """
+    update_fields = list(update_fields)
+    existing = {values[0]: values[1:] for values in Aerodrome.objects.values_list("icao_code", *update_fields)}
+
+    result = AerodromeImport()
+
+    def changed(aerodrome: Aerodrome) -> bool:
+        if (values := existing.get(aerodrome.icao_code)) is None:
+            result.created.append(aerodrome.icao_code)
+            return True
+
+        # Normalize the parsed values by the model fields, e.g. floats to decimals and country names to codes
+        parsed = tuple(Aerodrome._meta.get_field(name).to_python(getattr(aerodrome, name)) for name in update_fields)
+        if parsed == values:
+            result.unchanged += 1
+            return False
+
+        result.updated.append(aerodrome.icao_code)
+        return True
+
+    for batch in chunked(filter(changed, aerodromes), batch_size):
+        Aerodrome.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["icao_code"],
+            update_fields=update_fields,
+        )
+
+    if result.updated:
+        AerodromeDistance.objects.filter(
+            Q(from_aerodrome__icao_code__in=result.updated) | Q(to_aerodrome__icao_code__in=result.updated)
+        ).delete()
+
+    if result.created or result.updated:
+        # Invalidated only once committed, so that no request rebuilds the caches from uncommitted data in between
+        transaction.on_commit(invalidate_aerodrome_caches)
+
+    return result
@@ -0,0 +1,387 @@
+import csv
+import enum
+import hashlib
+import json
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+from django.db import transaction
+from django.utils.timezone import localdate
+
+from ..choices import invalidate_filter_choices
+from ..models.aerodrome import Aerodrome
+from ..models.aircraft import Aircraft, AircraftType
+from ..models.daily_totals import DailyTotals
+from ..models.import_job import ImportJob
+from ..models.log_entry import FunctionType, LaunchType, LogEntry
+from ..models.pilot import Pilot
+
+OWNER_LAST_NAME = "Zaytsev"
+
+LAUNCH_TYPES = {
+    "Self": LaunchType.SELF,
+    "Tow": LaunchType.TOW,
+    "Winch": LaunchType.WINCH,
+}
+
+IMPORTED_FIELDS = (
+    "departure_time",
+    "aircraft",
+    "from_aerodrome",
+    "to_aerodrome",
+    "arrival_time",
+    "landings",
+    "time_function",
+    "pilot",
+    "copilot",
+    "launch_type",
+    "remarks",
+)
+
+
+class Fields(enum.StrEnum):
+    DATE = "Date"
+    REGISTRATION = "Registration"
+    FROM = "From"
+    TO = "To"
+    TOTAL_TIME = "Total Time"
+    TIME_PIC = "PIC"
+    TIME_DUAL = "Dual"
+    LANDINGS = "Landings"
+    COPILOT = "0. Co-pilot"
+    DEPARTURE_TIME = "1. Start time"
+    ARRIVAL_TIME = "2. Landing time"
+    NOTE = "Note"
+
+
+# Stored entries are matched to rows by this key, the unique field that `bulk_write_entries()` upserts on, so that
+# `compute_diff()` reports what the write does
+ENTRY_KEY_FIELDS = ("departure_time",)
+
+
+class FlightLogError(ValueError):
+    def __init__(self, row_number: int, message: str):
+        super().__init__(f"Row {row_number}: {message}")
+        self.row_number = row_number
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FlightLogRecord:
+    row_number: int
+    departure_time: datetime
+    arrival_time: datetime
+    registration: str
+    from_aerodrome: str
+    to_aerodrome: str
+    landings: int
+    time_function: FunctionType
+    copilot: str
+    note: str
+
+
+def parse_row(row: dict[str, str], row_number: int) -> FlightLogRecord:
+    try:
+        day, month, year = [int(value) for value in row[Fields.DATE].split("/")]
+        hour_departure, minute_departure = [int(value) for value in row[Fields.DEPARTURE_TIME].split(":")]
+        hour_arrival, minute_arrival = [int(value) for value in row[Fields.ARRIVAL_TIME].split(":")]
+
+        departure_time = datetime(year, month, day, hour_departure, minute_departure, tzinfo=UTC)
+        arrival_time = datetime(year, month, day, hour_arrival, minute_arrival, tzinfo=UTC)
+
+        pic_time, _ = map(int, row[Fields.TIME_PIC].split(":"))
+        dual_time, _ = map(int, row[Fields.TIME_DUAL].split(":"))
+
+        landings = int(row[Fields.LANDINGS])
+    except (KeyError, ValueError) as e:
+        raise FlightLogError(row_number, f"Malformed row ({e})") from e
+
+    duration_recorded = (hour_arrival * 60 + minute_arrival) - (hour_departure * 60 + minute_departure)
+    duration_computed = (arrival_time - departure_time).total_seconds() / 60
+
+    if duration_computed != duration_recorded:
+        raise FlightLogError(row_number, f"Duration mismatch ({duration_computed}, {duration_recorded})")
+
+    if (pic_time + dual_time) != duration_recorded or not (bool(pic_time) ^ bool(dual_time)):
+        raise FlightLogError(row_number, f"Function time mismatch ({duration_recorded}, {pic_time}, {dual_time})")
+
+    return FlightLogRecord(
+        row_number=row_number,
+        departure_time=departure_time,
+        arrival_time=arrival_time,
+        registration=row[Fields.REGISTRATION],
+        from_aerodrome=row[Fields.FROM].strip(),
+        to_aerodrome=row[Fields.TO].strip(),
+        landings=landings,
+        time_function=FunctionType.PIC if pic_time else FunctionType.DUAL,
+        copilot=row[Fields.COPILOT].strip(),
+        note=row[Fields.NOTE].strip(),
+    )
+
+
+def read_rows(fp: TextIO) -> Iterator[tuple[int, dict[str, str]]]:
+    yield from enumerate(csv.DictReader(fp), start=1)
+
+
+def read_records(fp: TextIO) -> Iterator[FlightLogRecord]:
+    for row_number, row in read_rows(fp):
+        yield parse_row(row, row_number)
+
+
+@dataclass(frozen=True, kw_only=True)
+class Checkpoint:
+    """
+    Position after the last committed row of a streaming import
+    """
+
+    offset: int = 0
+    row_number: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "Checkpoint":
+        return cls(**json.loads(path.read_text()))
+
+    def save(self, path: Path):
+        # Replace the file atomically, so that an interruption never leaves a partial checkpoint behind
+        temporary_path = path.with_name(path.name + ".tmp")
+        temporary_path.write_text(json.dumps(asdict(self)))
+        temporary_path.replace(path)
+
+
+class _OffsetLines:
+    """
+    Decoded lines of a binary file, keeping track of the byte offset after the last line consumed
+    """
+
+    def __init__(self, fp: BinaryIO, encoding: str):
+        self.fp = fp
+        self.encoding = encoding
+        self.offset = fp.tell()
+
+    def __iter__(self) -> Iterator[str]:
+        for line in iter(self.fp.readline, b""):
+            self.offset += len(line)
+            yield line.decode(self.encoding)
+
+
+def stream_records(
+    fp: BinaryIO, checkpoint: Checkpoint | None = None, encoding: str = "utf-8"
+) -> Iterator[tuple[FlightLogRecord, Checkpoint]]:
+    """
+    Parses the rows after the checkpoint one at a time, each with the checkpoint to resume after it
+    """
+    checkpoint = checkpoint or Checkpoint()
+    header = next(csv.reader([fp.readline().decode(encoding)]))
+
+    if checkpoint.offset:
+        fp.seek(checkpoint.offset)
+
+    lines = _OffsetLines(fp, encoding)
+
+    # The reader consumes exactly the lines of each row, so the offset is at the row end whenever it yields
+    for row_number, row in enumerate(csv.DictReader(lines, fieldnames=header), start=checkpoint.row_number + 1):
+        yield parse_row(row, row_number), Checkpoint(offset=lines.offset, row_number=row_number)
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@dataclass(frozen=True, kw_only=True)
+class Lookups:
+    """
+    Aircraft, aerodromes and pilots preloaded once per import instead of fetched for every row
+    """
+
+    aircraft: dict[str, Aircraft]
+    aerodromes: dict[str, Aerodrome]
+    pilots: dict[str, list[Pilot]]
+
+    @classmethod
+    def preload(cls) -> "Lookups":
+        pilots = defaultdict(list)
+        for pilot in Pilot.objects.all():
+            pilots[pilot.last_name].append(pilot)
+
+        return cls(
+            aircraft={aircraft.registration: aircraft for aircraft in Aircraft.objects.all()},
+            aerodromes={aerodrome.icao_code: aerodrome for aerodrome in Aerodrome.objects.all()},
+            pilots=dict(pilots),
+        )
+
+    def get_pilot(self, row_number: int, last_name: str) -> Pilot:
+        match self.pilots.get(last_name, []):
+            case [pilot]:
+                return pilot
+            case []:
+                raise FlightLogError(row_number, f"Pilot {last_name!r} not found")
+            case _:
+                raise FlightLogError(row_number, f"Pilot {last_name!r} is ambiguous")
+
+    def get_aircraft(self, row_number: int, registration: str) -> Aircraft:
+        try:
+            return self.aircraft[registration]
+        except KeyError:
+            raise FlightLogError(row_number, f"Aircraft {registration!r} not found") from None
+
+    def get_aerodrome(self, row_number: int, icao_code: str) -> Aerodrome:
+        try:
+            return self.aerodromes[icao_code]
+        except KeyError:
+            raise FlightLogError(row_number, f"Aerodrome {icao_code!r} not found") from None
+
+    def build_entry(self, record: FlightLogRecord) -> LogEntry:
+        aircraft = self.get_aircraft(record.row_number, record.registration)
+
+        me = self.get_pilot(record.row_number, OWNER_LAST_NAME)
+        recorded_copilot = self.get_pilot(record.row_number, record.copilot)
+
+        pilot, copilot = (me, recorded_copilot) if record.time_function is FunctionType.PIC else (recorded_copilot, me)
+
+        remarks = record.note
+        launch_type = ""
+
+        if aircraft.type == AircraftType.GLD:
+            try:
+                launch_type = LAUNCH_TYPES[remarks]
+            except KeyError:
+                raise FlightLogError(record.row_number, f"Unknown launch type {remarks!r}") from None
+
+            # Clear remarks field, if used for glider launch type
+            remarks = ""
+
+        return LogEntry(
+            aircraft=aircraft,
+            from_aerodrome=self.get_aerodrome(record.row_number, record.from_aerodrome),
+            to_aerodrome=self.get_aerodrome(record.row_number, record.to_aerodrome),
+            departure_time=record.departure_time,
+            arrival_time=record.arrival_time,
+            landings=record.landings,
+            time_function=record.time_function,
+            pilot=pilot,
+            copilot=copilot,
+            launch_type=launch_type,
+            remarks=remarks,
+        )
+
+
+def load_entries(fp: TextIO, lookups: Lookups) -> tuple[list[LogEntry], list[FlightLogError]]:
+    """
+    Parses and resolves all rows, collecting the errors instead of stopping at the first one
+    """
+    entries, errors = [], []
+    departure_times = {}
+
+    for row_number, row in read_rows(fp):
+        try:
+            record = parse_row(row, row_number)
+            entries.append(lookups.build_entry(record))
+        except FlightLogError as e:
+            errors.append(e)
+            continue
+
+        if (previous := departure_times.setdefault(record.departure_time, row_number)) != row_number:
+            errors.append(FlightLogError(row_number, f"Same departure time as row {previous}"))
+
+    return entries, errors
+
+
+def bulk_write_entries(entries: Iterable[LogEntry], batch_size: int, fields: Iterable[str] = IMPORTED_FIELDS) -> int:
+    """
+    Creates or updates the entries by departure time in chunks and refreshes the daily totals of the affected days
+
+    Bulk writes bypass the `LogEntry` signals, so the rollup is rebuilt here and the filter choices are invalidated on
+    commit. Call it inside a transaction.
+    """
+    count = 0
+    days = set()
+    update_fields = [field for field in fields if field not in ENTRY_KEY_FIELDS]
+
+    for batch in chunked(entries, batch_size):
+        LogEntry.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=ENTRY_KEY_FIELDS,
+            update_fields=update_fields,
+        )
+        count += len(batch)
+        days.update(localdate(entry.departure_time) for entry in batch)  # like the `LogEntry` signals
+
+    DailyTotals.rebuild(days)
+    transaction.on_commit(invalidate_filter_choices)
+    return count
+
+
+def delete_entries() -> int:
+    """
+    Deletes all entries at once, unlike `QuerySet.delete()` which sends the `LogEntry` signals for every row
+
+    The signals are replaced by clearing the rollup and invalidating the filter choices once, on commit.
+    """
+    with transaction.atomic():
+        ImportJob.objects.filter(log_entry__isnull=False).update(log_entry=None)  # like `on_delete=SET_NULL`
+        entries = LogEntry.objects.all()
+        count = entries._raw_delete(entries.db)
+
+        DailyTotals.rebuild()
+        transaction.on_commit(invalidate_filter_choices)
+    return count
+
+
+def fingerprint(values: Iterable) -> str:
+    """
+    Hashes normalized field values, so that parsed and stored entries compare equal regardless of value types
+    """
+
+    def normalize(value) -> str | None:
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return value.astimezone(UTC).isoformat()
+        return str(value)
+
+    return hashlib.sha256(repr(tuple(map(normalize, values))).encode()).hexdigest()
+
+
+@dataclass(frozen=True, kw_only=True)
+class FlightLogDiff:
+    new: list[LogEntry]
+    changed: list[LogEntry]
+    unchanged: list[LogEntry]
+    missing: list[int]  # Primary keys of stored entries without a row
+
+    @property
+    def modified(self) -> list[LogEntry]:
+        return self.new + self.changed
+
+
+def compute_diff(entries: Iterable[LogEntry]) -> FlightLogDiff:
+    """
+    Compares the imported entries with the stored ones by fingerprint, keyed by departure time
+    """
+    attnames = [LogEntry._meta.get_field(field).attname for field in IMPORTED_FIELDS]
+
+    stored = {}
+    for values in LogEntry.objects.order_by().values_list("id", *attnames):
+        pk, values = values[0], dict(zip(attnames, values[1:]))
+        stored[tuple(values[field] for field in ENTRY_KEY_FIELDS)] = pk, fingerprint(values.values())
+
+    new, changed, unchanged = [], [], []
+    for entry in entries:
+        key = tuple(getattr(entry, field) for field in ENTRY_KEY_FIELDS)
+
+        match stored.pop(key, None):
+            case None:
+                new.append(entry)
+            case (_, stored_fingerprint) if stored_fingerprint == fingerprint(getattr(entry, a) for a in attnames):
+                unchanged.append(entry)
+            case _:
+                changed.append(entry)
+
+    return FlightLogDiff(new=new, changed=changed, unchanged=unchanged, missing=[pk for pk, _ in stored.values()])
@@ -0,0 +1,101 @@
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from vereinsflieger.models import Flight, Person
+
+from ..classifiers.cross_country import classify_cross_country, promote_cross_country
+from ..models.aerodrome import Aerodrome
+from ..models.aircraft import Aircraft
+from ..models.log_entry import LogEntry
+from ..models.pilot import Pilot
+from .flightlog import IMPORTED_FIELDS, bulk_write_entries
+
+
+@dataclass(frozen=True, kw_only=True)
+class FlightLookups:
+    """
+    Aircraft, aerodromes and pilots of a batch of flights loaded up front, creating unknown pilots on demand
+    """
+
+    aircraft: dict[str, Aircraft]
+    aerodromes: dict[str, Aerodrome]
+    pilots: dict[tuple[str, str], Pilot]
+
+    @classmethod
+    def preload(cls, flights: Sequence[Flight]) -> "FlightLookups":
+        registrations = {flight.registration for flight in flights}
+        icao_codes = {icao_code for flight in flights for icao_code in (flight.from_aerodrome, flight.to_aerodrome)}
+        last_names = {person.last_name for flight in flights for person in (flight.pilot, flight.copilot) if person}
+
+        return cls(
+            aircraft={
+                aircraft.registration: aircraft for aircraft in Aircraft.objects.filter(registration__in=registrations)
+            },
+            aerodromes={
+                aerodrome.icao_code: aerodrome for aerodrome in Aerodrome.objects.filter(icao_code__in=icao_codes)
+            },
+            pilots={
+                (pilot.first_name, pilot.last_name): pilot for pilot in Pilot.objects.filter(last_name__in=last_names)
+            },
+        )
+
+    def get_aircraft(self, registration: str) -> Aircraft:
+        try:
+            return self.aircraft[registration]
+        except KeyError:
+            raise Aircraft.DoesNotExist(f"Aircraft {registration} not found") from None
+
+    def get_aerodrome(self, icao_code: str) -> Aerodrome:
+        try:
+            return self.aerodromes[icao_code]
+        except KeyError:
+            raise Aerodrome.DoesNotExist(f"Aerodrome {icao_code} not found") from None
+
+    def get_pilot(self, person: Person) -> Pilot:
+        key = (person.first_name, person.last_name)
+        if key not in self.pilots:
+            self.pilots[key], _ = Pilot.objects.get_or_create(first_name=person.first_name, last_name=person.last_name)
+        return self.pilots[key]
+
+
+def build_log_entry(flight: Flight, lookups: FlightLookups) -> LogEntry:
+    return build_log_entries([flight], lookups)[0]
+
+
+def build_log_entries(flights: Iterable[Flight], lookups: FlightLookups) -> list[LogEntry]:
+    """
+    Builds the log entries of the flights, which are cross-country by their remarks or by their leg distance
+    """
+    log_entries = [
+        LogEntry(
+            aircraft=lookups.get_aircraft(flight.registration),
+            from_aerodrome=lookups.get_aerodrome(flight.from_aerodrome),
+            to_aerodrome=lookups.get_aerodrome(flight.to_aerodrome),
+            departure_time=flight.departure_time,
+            arrival_time=flight.arrival_time,
+            landings=flight.landings,
+            time_function=flight.function,
+            pilot=lookups.get_pilot(flight.pilot),
+            copilot=lookups.get_pilot(flight.copilot) if flight.copilot is not None else None,
+            remarks=flight.remarks,
+            cross_country="XC" in flight.remarks or "Nav." in flight.remarks,
+        )
+        for flight in flights
+    ]
+    promote_cross_country(classify_cross_country(log_entries))
+    return log_entries
+
+
+def import_flights(flights: list[Flight], batch_size: int = 500) -> int:
+    """
+    Creates or updates the log entries of the flights by departure time in one transaction
+    """
+    with transaction.atomic():
+        lookups = FlightLookups.preload(flights)
+        return bulk_write_entries(
+            build_log_entries(flights, lookups),
+            batch_size,
+            fields=(*IMPORTED_FIELDS, "cross_country"),
+        )
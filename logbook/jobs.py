@@ -0,0 +1,142 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from vereinsflieger.vereinsflieger import import_from_vereinsflieger
+
+from .importers.vereinsflieger import FlightLookups, build_log_entry
+from .models.import_job import ImportJob, ImportJobStatus
+
+logger = logging.getLogger(__name__)
+
+# Jobs running for longer than this are considered interrupted, even if the process that claimed them is alive
+STALE_JOB_TIMEOUT = timedelta(minutes=10)
+
+
+def make_runner_id() -> str:
+    # The random part tells apart processes that got the same PID after a restart
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def is_runner_alive(runner_id: str) -> bool:
+    """
+    Checks whether the process of another runner is still running, e.g. another worker of the web server on this host
+
+    Runners of other hosts or of a previous process with the same PID are considered gone.
+    """
+    host, _, pid = runner_id.partition(":")
+    pid = pid.partition(":")[0]
+
+    if os.name != "posix" or host != socket.gethostname() or not pid.isdigit() or int(pid) == os.getpid():
+        return False
+
+    try:
+        os.kill(int(pid), 0)  # Only checks for the process
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def run_import_job(job_id: int, runner_id: str = "") -> ImportJob | None:
+    """
+    Runs a queued import job, returns `None` if another worker has already claimed it
+    """
+    close_old_connections()
+    try:
+        claimed = ImportJob.objects.filter(pk=job_id, status=ImportJobStatus.QUEUED).update(
+            status=ImportJobStatus.RUNNING, started_at=timezone.now(), runner=runner_id
+        )
+        if not claimed:
+            return None
+
+        job = ImportJob.objects.get(pk=job_id)
+        try:
+            flight = import_from_vereinsflieger(settings, job.flight_id)
+            log_entry = build_log_entry(flight, FlightLookups.preload([flight]))
+            log_entry.save()
+        except Exception as e:
+            logger.exception(f"Import job {job} failed")
+            job.status, job.error = ImportJobStatus.FAILED, str(e) or e.__class__.__name__
+        else:
+            job.status, job.log_entry = ImportJobStatus.SUCCEEDED, log_entry
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "log_entry", "error", "finished_at"])
+
+        return job
+    finally:
+        close_old_connections()
+
+
+class ImportJobRunner:
+    """
+    Thread pool running import jobs in the background of the web process
+    """
+
+    def __init__(self, max_workers: int):
+        self.runner_id = make_runner_id()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import-job")
+
+    def submit(self, job: ImportJob) -> Future:
+        return self._executor.submit(run_import_job, job.pk, self.runner_id)
+
+    def resume(self):
+        """
+        Fails the jobs interrupted by a restart and resubmits the ones that were still queued
+
+        A running job is interrupted if the process that claimed it is gone, or if it has been running for too long.
+        """
+        stale = timezone.now() - STALE_JOB_TIMEOUT
+        interrupted = [
+            pk
+            for pk, runner, started_at in ImportJob.objects.filter(status=ImportJobStatus.RUNNING)
+            .exclude(runner=self.runner_id)
+            .values_list("pk", "runner", "started_at")
+            if started_at < stale or not is_runner_alive(runner)
+        ]
+        ImportJob.objects.filter(pk__in=interrupted, status=ImportJobStatus.RUNNING).update(
+            status=ImportJobStatus.FAILED, error="Interrupted", finished_at=timezone.now()
+        )
+
+        for job in ImportJob.objects.filter(status=ImportJobStatus.QUEUED).order_by("created_at"):
+            self.submit(job)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_runner_lock = threading.Lock()
+_runner: ImportJobRunner | None = None
+
+
+def get_import_job_runner() -> ImportJobRunner:
+    """
+    Returns the runner of the process, which resumes the jobs left behind by previous processes when it's started
+    """
+    global _runner
+
+    with _runner_lock:
+        if _runner is None:
+            _runner = ImportJobRunner(settings.IMPORT_JOB_WORKERS)
+            _runner.resume()
+
+        return _runner
+
+
+def enqueue_import(flight_id: int) -> ImportJob:
+    """
+    Creates an import job for the flight and hands it to the runner once the job is committed
+    """
+    job = ImportJob.objects.create(flight_id=flight_id)
+    transaction.on_commit(lambda: get_import_job_runner().submit(job))
+    return job
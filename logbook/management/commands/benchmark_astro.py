@@ -0,0 +1,51 @@
+import statistics
+import time
+from datetime import UTC, datetime
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from logbook import astro
+from logbook.models.aerodrome import Aerodrome
+from logbook.views.astro import AerodromeForm, AstroIndexView
+
+
+class Command(BaseCommand):
+    help = "Measures cold and warm per-request latency of the astro form"
+
+    def add_arguments(self, parser):
+        parser.add_argument("icao_code", type=str)
+        parser.add_argument("--repeat", type=int, default=10, help="Number of measured requests per mode")
+
+    def handle(self, *args, **options):
+        aerodrome = Aerodrome.objects.get(icao_code=options["icao_code"].upper())
+        data = {"date": datetime.now(tz=UTC).date(), "aerodrome": aerodrome.icao_code}
+
+        def request() -> float:
+            start = time.perf_counter()
+
+            view = AstroIndexView()
+            view.setup(RequestFactory().post("/astro/", data))
+
+            form = AerodromeForm(data)
+            assert form.is_valid(), form.errors
+            view.form_valid(form).render()
+
+            return time.perf_counter() - start
+
+        def measure(cold: bool) -> list[float]:
+            timings = []
+            for _ in range(options["repeat"]):
+                if cold:
+                    astro.reset()
+                timings.append(request())
+            return timings
+
+        request()  # Import templates and modules outside of the measurements
+
+        for mode, timings in (("cold", measure(cold=True)), ("warm", measure(cold=False))):
+            self.stdout.write(
+                f"{mode}: median {statistics.median(timings) * 1000:.1f} ms, "
+                f"min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms "
+                f"({len(timings)} requests)"
+            )
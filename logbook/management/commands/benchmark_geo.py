@@ -0,0 +1,75 @@
+import random
+import statistics
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logbook.geo import AerodromeIndex, haversine
+from logbook.importers.aerodromes import read_bitbringers
+
+FIXTURE_PATH = Path(__file__).parents[2] / "fixtures" / "data" / "aerodromes.json"
+
+
+class Command(BaseCommand):
+    help = "Measures nearest-k and radius queries of the aerodrome index against a brute-force scan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=1000, help="Number of measured queries per mode")
+        parser.add_argument("--k", type=int, default=5, help="Number of nearest aerodromes")
+        parser.add_argument("--radius", type=float, default=50, help="Radius in nautical miles")
+        parser.add_argument(
+            "--fixture",
+            action="store_true",
+            dest="fixture",
+            default=False,
+            help="Use the bundled aerodrome data instead of the database",
+        )
+
+    def handle(self, *args, **options):
+        if options["fixture"]:
+            with FIXTURE_PATH.open() as fp:
+                rows = [
+                    (pk, aerodrome.icao_code, float(aerodrome.latitude), float(aerodrome.longitude))
+                    for pk, aerodrome in enumerate(read_bitbringers(fp))
+                ]
+        else:
+            rows = AerodromeIndex.rows_from_database()
+
+        start = time.perf_counter()
+        index = AerodromeIndex(rows)
+        build_time = time.perf_counter() - start
+
+        if not len(index):
+            raise CommandError("No aerodromes found, import them or use --fixture")
+
+        self.stdout.write(f"Built index of {len(index)} aerodromes in {build_time * 1000:.1f} ms")
+
+        # Query points around the aerodromes, where the queries of the app are
+        random.seed(0)
+        points = [
+            (index.latitudes[position] + random.uniform(-1, 1), index.longitudes[position] + random.uniform(-1, 1))
+            for position in (random.randrange(len(index)) for _ in range(options["repeat"]))
+        ]
+
+        def brute_force(latitude: float, longitude: float):
+            distances = haversine(latitude, longitude, index.latitudes, index.longitudes)
+            return distances.argsort()[: options["k"]], (distances <= options["radius"]).nonzero()
+
+        def measure(query) -> list[float]:
+            timings = []
+            for latitude, longitude in points:
+                query_start = time.perf_counter()
+                query(latitude, longitude)
+                timings.append(time.perf_counter() - query_start)
+            return timings
+
+        for mode, timings in (
+            (f"nearest {options['k']}", measure(lambda lat, lon: index.nearest(lat, lon, options["k"]))),
+            (f"within {options['radius']:g} NM", measure(lambda lat, lon: index.within(lat, lon, options["radius"]))),
+            ("brute force", measure(brute_force)),
+        ):
+            self.stdout.write(
+                f"{mode}: median {statistics.median(timings) * 1e6:.0f} µs, "
+                f"p99 {statistics.quantiles(timings, n=100)[-1] * 1e6:.0f} µs ({len(timings)} queries)"
+            )
@@ -0,0 +1,67 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+
+from vereinsflieger.standin import StandinServer
+from vereinsflieger.vereinsflieger_scraper import VereinsfliegerBrowserPool, VereinsfliegerScraperSession
+
+USERNAME = "benchmark"
+PASSWORD = "benchmark"
+
+
+class Command(BaseCommand):
+    help = "Measures cold and warm per-flight latency of the Vereinsflieger scraper against a local stand-in"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=10, help="Number of measured flights per mode")
+        parser.add_argument("--concurrency", type=int, default=VereinsfliegerBrowserPool.DEFAULT_MAX_PAGES)
+        parser.add_argument("--asset-delay", type=float, default=0.05, help="Delay of the stand-in assets in seconds")
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+
+        @async_to_sync
+        async def cold_flight(base_url: str, fid: int):
+            async with VereinsfliegerScraperSession(USERNAME, PASSWORD, base_url=base_url) as vs:
+                await vs.get_flight_fields(fid)
+
+        def timed(function, *args) -> float:
+            start = time.perf_counter()
+            function(*args)
+            return time.perf_counter() - start
+
+        def report(mode: str, timings: list[float]):
+            self.stdout.write(
+                f"{mode}: median {statistics.median(timings) * 1000:.1f} ms, "
+                f"min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms "
+                f"({len(timings)} flights)"
+            )
+
+        with StandinServer(USERNAME, PASSWORD, asset_delay=options["asset_delay"]) as server:
+            report("cold", [timed(cold_flight, server.base_url, fid) for fid in range(repeat)])
+
+            pool = VereinsfliegerBrowserPool(
+                USERNAME, PASSWORD, base_url=server.base_url, max_pages=options["concurrency"]
+            )
+            try:
+                pool.warm_up()
+                report("warm", [timed(pool.get_flight_fields, fid) for fid in range(repeat)])
+
+                with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+                    start = time.perf_counter()
+                    list(executor.map(pool.get_flight_fields, range(repeat)))
+                    elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f"warm concurrent: {elapsed / repeat * 1000:.1f} ms per flight "
+                    f"({repeat} flights, {options['concurrency']} pages)"
+                )
+
+                server.expire_sessions()
+                report("expired", [timed(pool.get_flight_fields, repeat)])
+            finally:
+                pool.close()
+
+            self.stdout.write(f"sign-ins: {server.sign_ins}")
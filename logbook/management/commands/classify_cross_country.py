@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from logbook.classifiers.cross_country import (
+    CROSS_COUNTRY_DISTANCE,
+    apply_cross_country_classification,
+    classify_cross_country,
+)
+from logbook.models.log_entry import LogEntry
+
+from .classify_night import parse_date
+
+
+class Command(BaseCommand):
+    help = "Sets the cross-country flag of PIC log entries from the distance between their aerodromes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=parse_date, help="Only classify entries departing on or after this date")
+        parser.add_argument("--until", type=parse_date, help="Only classify entries departing before this date")
+        parser.add_argument(
+            "--distance",
+            type=float,
+            default=CROSS_COUNTRY_DISTANCE,
+            help=f"Minimum leg distance in NM (default: {CROSS_COUNTRY_DISTANCE:g})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Only show the entries that would change",
+        )
+
+    def handle(self, *args, **options):
+        entries = LogEntry.objects.select_related("aircraft", "from_aerodrome", "to_aerodrome", "pilot", "copilot")
+        if options["since"] is not None:
+            entries = entries.filter(departure_time__gte=options["since"])
+        if options["until"] is not None:
+            entries = entries.filter(departure_time__lt=options["until"])
+
+        self.stdout.write(self.style.WARNING("Classifying log entries..."))
+        classifications = classify_cross_country(entries.order_by("departure_time"), threshold=options["distance"])
+
+        changed = [classification for classification in classifications if classification.changed]
+        for classification in changed:
+            self.stdout.write(f"+ {classification.entry} ({classification.distance:.1f} NM)")
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"{len(changed)} of {len(classifications)} entries would change (dry run)")
+            )
+            return
+
+        apply_cross_country_classification(changed)
+        self.stdout.write(self.style.SUCCESS(f"Successfully updated {len(changed)} of {len(classifications)} entries!"))
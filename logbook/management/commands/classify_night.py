@@ -0,0 +1,57 @@
+from datetime import UTC, date, datetime, time
+
+from django.core.management.base import BaseCommand
+
+from logbook.classifiers.night import apply_night_classification, classify_night
+from logbook.models.log_entry import LogEntry
+from logbook.templatetags.logbook_utils import duration
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.combine(date.fromisoformat(value), time.min, tzinfo=UTC)
+
+
+class Command(BaseCommand):
+    help = "Sets the night flag of log entries from the civil twilight times at their aerodromes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=parse_date, help="Only classify entries departing on or after this date")
+        parser.add_argument("--until", type=parse_date, help="Only classify entries departing before this date")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Only show the entries that would change",
+        )
+
+    def handle(self, *args, **options):
+        entries = LogEntry.objects.select_related("aircraft", "from_aerodrome", "to_aerodrome", "pilot", "copilot")
+        if options["since"] is not None:
+            entries = entries.filter(departure_time__gte=options["since"])
+        if options["until"] is not None:
+            entries = entries.filter(departure_time__lt=options["until"])
+
+        self.stdout.write(self.style.WARNING("Classifying log entries..."))
+        classifications = classify_night(entries.order_by("departure_time"), store=not options["dry_run"])
+
+        changed = [classification for classification in classifications if classification.changed]
+        unknown = [classification for classification in classifications if classification.night is None]
+
+        for classification in changed:
+            self.stdout.write(
+                f"{'+' if classification.night else '-'} {classification.entry} "
+                f"(night time {duration(classification.night_time, '%H:%M')})"
+            )
+
+        for classification in unknown:
+            self.stdout.write(self.style.NOTICE(f"? {classification.entry} (twilight times unknown)"))
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"{len(changed)} of {len(classifications)} entries would change (dry run)")
+            )
+            return
+
+        apply_night_classification(changed)
+        self.stdout.write(self.style.SUCCESS(f"Successfully updated {len(changed)} of {len(classifications)} entries!"))
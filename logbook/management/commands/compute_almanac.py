@@ -0,0 +1,45 @@
+from datetime import UTC, date, datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from logbook.astro import compute_almanac
+from logbook.models.aerodrome import Aerodrome, AerodromeAlmanac
+
+ALMANAC_FIELDS = ("timezone", "morning_twilight", "sunrise", "sunset", "evening_twilight")
+
+
+class Command(BaseCommand):
+    help = "Precomputes twilight, sunrise and sunset times of aerodromes for a range of dates"
+
+    def add_arguments(self, parser):
+        parser.add_argument("icao_codes", nargs="*", type=str, help="Aerodromes to compute (default: all)")
+        parser.add_argument("--start", type=date.fromisoformat, help="First date (default: today)")
+        parser.add_argument("--days", type=int, default=365, help="Number of dates to compute")
+
+    def handle(self, *args, **options):
+        start = options["start"] or datetime.now(tz=UTC).date()
+        days = options["days"]
+
+        aerodromes = Aerodrome.objects.order_by("icao_code")
+        if options["icao_codes"]:
+            aerodromes = aerodromes.filter(icao_code__in=[code.upper() for code in options["icao_codes"]])
+
+        self.stdout.write(self.style.WARNING(f"Computing almanac from {start} for {days} days..."))
+
+        total = 0
+        for aerodrome in aerodromes:
+            rows = [location_data.to_almanac(day) for day, location_data in compute_almanac(aerodrome, start, days)]
+
+            with transaction.atomic():
+                AerodromeAlmanac.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["aerodrome", "date"],
+                    update_fields=ALMANAC_FIELDS,
+                )
+
+            total += len(rows)
+            self.stdout.write(f"{aerodrome.icao_code}: {len(rows)} dates")
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully computed {total} almanac entries!"))
@@ -0,0 +1,79 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from logbook.importers.aerodromes import (
+    AERODROME_FIELDS,
+    read_bitbringers,
+    read_ourairports,
+    read_reference_icao_codes,
+    upsert_aerodromes,
+)
+
+DEFAULT_FILENAME = Path(__file__).parents[2] / "fixtures" / "data" / "aerodromes.json"
+
+
+class Command(BaseCommand):
+    help = "Imports aerodromes from the bundled JSON database or an OurAirports airports.csv file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("filename", nargs="?", type=Path, default=DEFAULT_FILENAME)
+        parser.add_argument(
+            "--ourairports",
+            action="store_true",
+            dest="ourairports",
+            default=False,
+            help="Stream an OurAirports airports.csv file (implied by the .csv suffix), keeping existing priorities",
+        )
+        parser.add_argument(
+            "--check-codes",
+            type=Path,
+            metavar="AIRPORTS_CSV",
+            help="Warn about ICAO codes missing from an OurAirports airports.csv file",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of aerodromes per bulk write")
+
+    def handle(self, *args, **options):
+        path = options["filename"]
+        ourairports = options["ourairports"] or path.suffix.lower() == ".csv"
+
+        reference_codes = None
+        if options["check_codes"] is not None:
+            with options["check_codes"].open(newline="") as fp:
+                reference_codes = read_reference_icao_codes(fp)
+
+        suspicious_codes = set()
+
+        def check(aerodromes):
+            for aerodrome in aerodromes:
+                if not all([aerodrome.name, aerodrome.city, aerodrome.country]):
+                    self.stdout.write(self.style.WARNING(f"Empty name/city/country for {aerodrome.icao_code}!"))
+
+                if reference_codes is not None and aerodrome.icao_code not in reference_codes:
+                    suspicious_codes.add(aerodrome.icao_code)
+
+                yield aerodrome
+
+        self.stdout.write(self.style.SUCCESS(f"Importing aerodromes from {path}..."))
+        start = time.perf_counter()
+
+        if ourairports:
+            reader, update_fields = read_ourairports, [name for name in AERODROME_FIELDS if name != "priority"]
+        else:
+            reader, update_fields = read_bitbringers, AERODROME_FIELDS
+
+        with path.open(newline="") as fp, transaction.atomic():
+            result = upsert_aerodromes(check(reader(fp)), update_fields, options["batch_size"])
+
+        if suspicious_codes:
+            self.stdout.write(self.style.WARNING(f"Found suspicious codes: {len(suspicious_codes)}"))
+            self.stdout.write(self.style.WARNING(" ".join(sorted(suspicious_codes))))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully imported aerodromes in {time.perf_counter() - start:.2f} s: {len(result.created)} "
+                f"created, {len(result.updated)} updated, {result.unchanged} unchanged!"
+            )
+        )
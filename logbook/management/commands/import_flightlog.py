@@ -1,29 +1,26 @@
-import csv
-import enum
-from datetime import UTC, datetime
+import time
 from pathlib import Path
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
-import logbook.models.aerodrome
-import logbook.models.aircraft
-import logbook.models.log_entry
-import logbook.models.pilot
+from logbook.importers.flightlog import (
+    IMPORTED_FIELDS,
+    Checkpoint,
+    FlightLogError,
+    Lookups,
+    bulk_write_entries,
+    chunked,
+    compute_diff,
+    delete_entries,
+    load_entries,
+    read_records,
+    stream_records,
+)
+from logbook.models.log_entry import LogEntry
 
-
-class Fields(enum.StrEnum):
-    DATE = "Date"
-    REGISTRATION = "Registration"
-    FROM = "From"
-    TO = "To"
-    TOTAL_TIME = "Total Time"
-    TIME_PIC = "PIC"
-    TIME_DUAL = "Dual"
-    LANDINGS = "Landings"
-    COPILOT = "0. Co-pilot"
-    DEPARTURE_TIME = "1. Start time"
-    ARRIVAL_TIME = "2. Landing time"
-    NOTE = "Note"
+MAX_REPORTED_ERRORS = 20
+PROGRESS_BAR_WIDTH = 30
 
 
 class Command(BaseCommand):
@@ -39,99 +36,217 @@ class Command(BaseCommand):
             default=False,
             help="Re-initialize the database by removing all entries and importing them anew",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            dest="bulk",
+            default=False,
+            help="Validate all rows up front and write them in chunks inside one transaction",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            dest="incremental",
+            default=False,
+            help="Only write new and changed entries, comparing rows with stored entries by fingerprint",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            default=False,
+            help="Only show the differences of an incremental import",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            dest="stream",
+            default=False,
+            help="Import very large files in batches, committing and recording a checkpoint after each batch",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            dest="resume",
+            default=False,
+            help="Continue a streaming import after the last checkpoint, the rows before it must not be changed",
+        )
+        parser.add_argument("--checkpoint", type=str, help="Checkpoint file (default: <filename>.checkpoint)")
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of entries per bulk write")
 
     def handle(self, *args, **options):
+        if options["dry_run"] and not options["incremental"]:
+            raise CommandError("--dry-run requires --incremental")
+
+        if options["resume"] and not options["stream"]:
+            raise CommandError("--resume requires --stream")
+
+        if options["stream"]:
+            if options["init"] and options["resume"]:
+                raise CommandError("--init and --resume are mutually exclusive")
+            self.handle_stream(options)
+            return
+
+        if options["incremental"]:
+            if options["init"]:
+                raise CommandError("--init and --incremental are mutually exclusive")
+            self.handle_incremental(options)
+            return
+
+        if options["bulk"]:
+            self.handle_bulk(options)
+            return
+
         if options["init"]:
             self.stdout.write(self.style.WARNING("Removing old database records..."))
-            logbook.models.log_entry.LogEntry.objects.all().delete()
+            delete_entries()
 
         self.stdout.write(self.style.SUCCESS("Importing FlightLog records..."))
 
+        lookups = Lookups.preload()
+
         with Path(options["filename"]).open(newline="") as fp:
-            reader = csv.DictReader(fp)
-            for row in reader:
-                day, month, year = [int(value) for value in row[Fields.DATE].split("/")]
-                hour_departure, minute_departure = [int(value) for value in row[Fields.DEPARTURE_TIME].split(":")]
-                hour_arrival, minute_arrival = [int(value) for value in row[Fields.ARRIVAL_TIME].split(":")]
+            for record in read_records(fp):
+                entry = lookups.build_entry(record)
 
-                departure_time = datetime(year, month, day, hour_departure, minute_departure, tzinfo=UTC)
-                arrival_time = datetime(year, month, day, hour_arrival, minute_arrival, tzinfo=UTC)
+                self.stdout.write(
+                    "Processing entry "
+                    f"{entry.departure_time.date()} {entry.departure_time.time()} {entry.arrival_time.time()} "
+                    f"{entry.aircraft.registration} "
+                    f"{entry.from_aerodrome.icao_code} -> {entry.to_aerodrome.icao_code} "
+                    f"{entry.pilot.last_name} / {entry.copilot.last_name} "
+                    f"{f'({entry.remarks})' if entry.remarks else ''}",
+                )
 
-                duration_recorded = (hour_arrival * 60 + minute_arrival) - (hour_departure * 60 + minute_departure)
-                duration_computed = (arrival_time - departure_time).total_seconds() / 60
+                entry, created = LogEntry.objects.update_or_create(
+                    departure_time=entry.departure_time,
+                    from_aerodrome=entry.from_aerodrome,
+                    defaults={field: getattr(entry, field) for field in IMPORTED_FIELDS},
+                )
 
-                assert duration_computed == duration_recorded, f"{duration_computed}, {duration_recorded}"
+                self.stdout.write(("Created new object" if created else "Updated object") + f" (pk={entry.id})")
 
-                pic_time, _ = map(int, row[Fields.TIME_PIC].split(":"))
-                dual_time, _ = map(int, row[Fields.TIME_DUAL].split(":"))
+        self.stdout.write(self.style.SUCCESS("Successfully completed FlightLog import!"))
 
-                assert (pic_time + dual_time) == duration_recorded, f"{duration_recorded}, {pic_time}, {dual_time}"
-                assert bool(pic_time) ^ bool(dual_time)
+    def load_entries(self, filename: str) -> list[LogEntry]:
+        self.stdout.write(self.style.SUCCESS("Validating FlightLog records..."))
 
-                time_function = (
-                    logbook.models.log_entry.FunctionType.PIC
-                    if pic_time
-                    else logbook.models.log_entry.FunctionType.DUAL
-                )
-                registration = row[Fields.REGISTRATION]
+        with Path(filename).open(newline="") as fp:
+            entries, errors = load_entries(fp, Lookups.preload())
 
-                aircraft = logbook.models.aircraft.Aircraft.objects.get(registration=registration)
+        if errors:
+            for error in errors[:MAX_REPORTED_ERRORS]:
+                self.stderr.write(str(error))
+            raise CommandError(f"{len(errors)} invalid rows, nothing was imported")
 
-                me = logbook.models.pilot.Pilot.objects.get(last_name="Zaytsev")
-                recorded_copilot = logbook.models.pilot.Pilot.objects.get(last_name=row[Fields.COPILOT].strip())
+        return entries
 
-                pilot, copilot = (
-                    (me, recorded_copilot)
-                    if time_function is logbook.models.log_entry.FunctionType.PIC
-                    else (recorded_copilot, me)
-                )
+    def handle_bulk(self, options):
+        start = time.perf_counter()
 
-                from_aerodrome = logbook.models.aerodrome.Aerodrome.objects.get(icao_code=row[Fields.FROM].strip())
-                to_aerodrome = logbook.models.aerodrome.Aerodrome.objects.get(icao_code=row[Fields.TO].strip())
+        entries = self.load_entries(options["filename"])
 
-                remarks = row[Fields.NOTE].strip()
+        self.stdout.write(self.style.SUCCESS(f"Importing {len(entries)} FlightLog records..."))
 
-                launch_type = (
-                    {
-                        "Self": logbook.models.log_entry.LaunchType.SELF,
-                        "Tow": logbook.models.log_entry.LaunchType.TOW,
-                        "Winch": logbook.models.log_entry.LaunchType.WINCH,
-                    }[remarks]
-                    if aircraft.type == logbook.models.aircraft.AircraftType.GLD
-                    else ""
-                )
+        with transaction.atomic():
+            if options["init"]:
+                self.stdout.write(self.style.WARNING("Removing old database records..."))
+                delete_entries()
 
-                # Clear remarks field, if used for glider launch type
-                if launch_type:
-                    remarks = ""
+            count = bulk_write_entries(entries, options["batch_size"])
 
-                self.stdout.write(
-                    "Processing entry "
-                    f"{departure_time.date()} {departure_time.time()} {arrival_time.time()} {aircraft.registration} "
-                    f"{from_aerodrome.icao_code} -> {to_aerodrome.icao_code} {pilot.last_name} / {copilot.last_name} "
-                    f"{f'({remarks})' if remarks else ''}",
-                )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully imported {count} records in {elapsed:.2f} s ({count / elapsed:.0f} rows/s)!"
+            )
+        )
 
-                defaults = {
-                    "aircraft": aircraft,
-                    "from_aerodrome": from_aerodrome,
-                    "to_aerodrome": to_aerodrome,
-                    "departure_time": departure_time,
-                    "arrival_time": arrival_time,
-                    "landings": int(row[Fields.LANDINGS]),
-                    "time_function": time_function,
-                    "pilot": pilot,
-                    "copilot": copilot,
-                    "launch_type": launch_type,
-                    "remarks": remarks,
-                }
-
-                entry, created = logbook.models.log_entry.LogEntry.objects.update_or_create(
-                    departure_time=departure_time,
-                    from_aerodrome=from_aerodrome,
-                    defaults=defaults,
-                )
+    def handle_incremental(self, options):
+        start = time.perf_counter()
 
-                self.stdout.write(("Created new object" if created else "Updated object") + f" (pk={entry.id})")
+        diff = compute_diff(self.load_entries(options["filename"]))
 
-        self.stdout.write(self.style.SUCCESS("Successfully completed FlightLog import!"))
+        if options["dry_run"]:
+            for prefix, entries in (("+", diff.new), ("~", diff.changed)):
+                for entry in entries:
+                    self.stdout.write(f"{prefix} {entry}")
+
+            missing = LogEntry.objects.filter(pk__in=diff.missing).select_related(
+                "aircraft", "from_aerodrome", "to_aerodrome", "pilot", "copilot"
+            )
+            for entry in missing.order_by("departure_time"):
+                self.stdout.write(f"- {entry}")
+
+        self.stdout.write(
+            f"{len(diff.new)} new, {len(diff.changed)} changed, {len(diff.unchanged)} unchanged, "
+            f"{len(diff.missing)} missing from CSV"
+        )
+
+        if options["dry_run"]:
+            return
+
+        with transaction.atomic():
+            count = bulk_write_entries(diff.modified, options["batch_size"])
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"Successfully wrote {count} records in {elapsed:.2f} s!"))
+
+    def handle_stream(self, options):
+        path = Path(options["filename"])
+        checkpoint_path = Path(options["checkpoint"] or path.with_name(path.name + ".checkpoint"))
+
+        checkpoint = Checkpoint()
+        if options["resume"]:
+            if not checkpoint_path.exists():
+                raise CommandError(f"Checkpoint {checkpoint_path} not found")
+            checkpoint = Checkpoint.load(checkpoint_path)
+            self.stdout.write(self.style.WARNING(f"Resuming after row {checkpoint.row_number}..."))
+        elif options["init"]:
+            self.stdout.write(self.style.WARNING("Removing old database records..."))
+            delete_entries()
+
+        self.stdout.write(self.style.SUCCESS("Streaming FlightLog records..."))
+
+        lookups = Lookups.preload()
+        size = path.stat().st_size
+        start, count = time.perf_counter(), 0
+
+        with path.open("rb") as fp:
+            try:
+                for batch in chunked(stream_records(fp, checkpoint), options["batch_size"]):
+                    entries = [lookups.build_entry(record) for record, _ in batch]
+
+                    with transaction.atomic():
+                        bulk_write_entries(entries, len(entries))
+
+                    _, checkpoint = batch[-1]
+                    checkpoint.save(checkpoint_path)
+
+                    count += len(batch)
+                    self.write_progress(checkpoint, count, size, time.perf_counter() - start)
+            except FlightLogError as e:
+                self.stdout.write("")
+                raise CommandError(
+                    f"{e}, rows up to {checkpoint.row_number} were imported; fix the row and continue with --resume"
+                ) from e
+
+        checkpoint_path.unlink(missing_ok=True)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write("")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully imported {count} records in {elapsed:.2f} s ({count / elapsed:.0f} rows/s)!"
+            )
+        )
+
+    def write_progress(self, checkpoint: Checkpoint, count: int, size: int, elapsed: float):
+        progress = checkpoint.offset / size if size else 1
+        filled = round(progress * PROGRESS_BAR_WIDTH)
+        self.stdout.write(
+            f"[{'#' * filled}{'-' * (PROGRESS_BAR_WIDTH - filled)}] {progress:4.0%} "
+            f"row {checkpoint.row_number} ({count / elapsed:.0f} rows/s)",
+            ending="\r",
+        )
+        self.stdout.flush()
@@ -0,0 +1,71 @@
+import time
+from datetime import UTC, date, datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from logbook.importers.vereinsflieger import import_flights
+from vereinsflieger.transport import DEFAULT_METRICS
+from vereinsflieger.vereinsflieger import batch_import_from_vereinsflieger_api
+from vereinsflieger.vereinsflieger_api import AsyncVereinsfliegerApiSession
+
+
+class Command(BaseCommand):
+    help = "Imports flights by ID or date range from the Vereinsflieger API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("flight_ids", nargs="*", type=int, help="Vereinsflieger flight IDs")
+        parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First date of flights")
+        parser.add_argument(
+            "--to", dest="date_to", type=date.fromisoformat, help="Last date of flights (default: today)"
+        )
+        parser.add_argument("--member", type=str, help='Only flights of this member as listed, e.g. "Pilot, Peter"')
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=AsyncVereinsfliegerApiSession.DEFAULT_CONCURRENCY,
+            help="Maximum number of concurrent requests",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            dest="refresh",
+            default=False,
+            help="Fetch all flights anew instead of using the local cache",
+        )
+
+    def handle(self, *args, **options):
+        if settings.VEREINSFLIEGER_APP_KEY is None:
+            raise CommandError("Batch imports require VEREINSFLIEGER_APP_KEY for the Vereinsflieger API")
+
+        if not options["flight_ids"] and options["date_from"] is None:
+            raise CommandError("Either flight IDs or --from are required")
+
+        date_range = (
+            (options["date_from"], options["date_to"] or datetime.now(tz=UTC).date())
+            if options["date_from"] is not None
+            else None
+        )
+
+        DEFAULT_METRICS.reset()
+
+        start = time.perf_counter()
+        self.stdout.write(self.style.WARNING("Fetching flights from Vereinsflieger..."))
+
+        flights = batch_import_from_vereinsflieger_api(
+            settings,
+            flight_ids=options["flight_ids"],
+            date_range=date_range,
+            member=options["member"],
+            concurrency=options["concurrency"],
+            refresh=options["refresh"],
+        )
+
+        self.stdout.write(f"Fetched {len(flights)} flights in {time.perf_counter() - start:.2f} s")
+
+        if options["verbosity"] > 1:
+            for endpoint, metrics in sorted(DEFAULT_METRICS.endpoints.items()):
+                self.stdout.write(f"  {endpoint}: {metrics}")
+
+        count = import_flights(flights)
+        self.stdout.write(self.style.SUCCESS(f"Successfully imported {count} flights!"))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from vereinsflieger.vereinsflieger import get_flight_cache
+
+
+class Command(BaseCommand):
+    help = "Removes expired and least recently used flights from the Vereinsflieger cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            dest="clear",
+            default=False,
+            help="Remove all cached flights",
+        )
+
+    def handle(self, *args, **options):
+        cache = get_flight_cache(settings)
+        if options["clear"]:
+            cache.max_size = 0
+
+        result = cache.prune()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Removed {result.expired} expired and {result.evicted} least recently used flights, "
+                f"{result.remaining} flights ({result.size} bytes) remain in {cache.directory}!"
+            )
+        )
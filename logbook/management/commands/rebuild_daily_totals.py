@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from logbook.models.daily_totals import DailyTotals
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily totals rollup of log entries from scratch"
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING("Rebuilding daily totals..."))
+        DailyTotals.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Successfully rebuilt {DailyTotals.objects.count()} daily totals!"))
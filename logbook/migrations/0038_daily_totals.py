@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+
+
+def populate_daily_totals(apps, schema_editor):
+    LogEntry = apps.get_model("logbook", "LogEntry")
+    DailyTotals = apps.get_model("logbook", "DailyTotals")
+
+    rows = (
+        LogEntry.objects.annotate(
+            day=TruncDate("departure_time"),
+            duration=ExpressionWrapper(F("arrival_time") - F("departure_time"), output_field=DurationField()),
+        )
+        .order_by()
+        .values("day", "aircraft", "time_function", "cross_country", "night")
+        .annotate(total_duration=Sum("duration"), total_landings=Sum("landings"), total_entries=Count("id"))
+    )
+
+    DailyTotals.objects.bulk_create(
+        DailyTotals(
+            day=row["day"],
+            aircraft_id=row["aircraft"],
+            time_function=row["time_function"],
+            cross_country=row["cross_country"],
+            night=row["night"],
+            duration=row["total_duration"],
+            landings=row["total_landings"],
+            entries=row["total_entries"],
+        )
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logbook", "0037_alter_aircraft_v_s1"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyTotals",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                (
+                    "time_function",
+                    models.CharField(
+                        blank=True,
+                        choices=[("PIC", "Pilot-in-Command"), ("DUAL", "Dual instruction time")],
+                        max_length=5,
+                    ),
+                ),
+                ("cross_country", models.BooleanField()),
+                ("night", models.BooleanField()),
+                ("duration", models.DurationField()),
+                ("landings", models.PositiveIntegerField()),
+                ("entries", models.PositiveIntegerField()),
+                ("aircraft", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="logbook.aircraft")),
+            ],
+            options={
+                "verbose_name_plural": "daily totals",
+                "ordering": ("day",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "aircraft", "time_function", "cross_country", "night"),
+                        name="daily_totals_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_daily_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:13
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logbook", "0038_daily_totals"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="logentry",
+            name="duration",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("arrival_time"), "-", models.F("departure_time")
+                ),
+                output_field=models.DurationField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["aircraft", "departure_time"], name="logentry_aircraft_departure"),
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["time_function", "departure_time"], name="logentry_function_departure"),
+        ),
+        migrations.AddIndex(
+            model_name="logentry",
+            index=models.Index(fields=["night", "departure_time"], name="logentry_night_departure"),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logbook", "0039_logentry_duration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AerodromeAlmanac",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("timezone", models.CharField(max_length=64)),
+                ("morning_twilight", models.DateTimeField(help_text="Start of morning civil twilight")),
+                ("sunrise", models.DateTimeField()),
+                ("sunset", models.DateTimeField()),
+                ("evening_twilight", models.DateTimeField(help_text="End of evening civil twilight")),
+                ("aerodrome", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="logbook.aerodrome")),
+            ],
+            options={
+                "verbose_name_plural": "aerodrome almanac",
+                "ordering": ("aerodrome", "date"),
+                "constraints": [models.UniqueConstraint(fields=("aerodrome", "date"), name="aerodrome_almanac_unique")],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logbook", "0041_importjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AerodromeDistance",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("distance", models.FloatField()),
+                (
+                    "from_aerodrome",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="logbook.aerodrome"
+                    ),
+                ),
+                (
+                    "to_aerodrome",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="logbook.aerodrome"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("from_aerodrome", "to_aerodrome"), name="aerodrome_distance_unique"
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("from_aerodrome__lte", models.F("to_aerodrome"))),
+                        name="aerodrome_distance_ordered",
+                    ),
+                ],
+            },
+        ),
+    ]
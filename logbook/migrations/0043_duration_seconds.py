@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:05
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+import logbook.models.log_entry
+
+
+def rebuild_daily_totals(apps, schema_editor):
+    LogEntry = apps.get_model("logbook", "LogEntry")
+    DailyTotals = apps.get_model("logbook", "DailyTotals")
+
+    rows = (
+        LogEntry.objects.annotate(day=TruncDate("departure_time"))
+        .order_by()
+        .values("day", "aircraft", "time_function", "cross_country", "night")
+        .annotate(total_duration=Sum("duration"), total_landings=Sum("landings"), total_entries=Count("id"))
+    )
+
+    DailyTotals.objects.all().delete()
+    DailyTotals.objects.bulk_create(
+        DailyTotals(
+            day=row["day"],
+            aircraft_id=row["aircraft"],
+            time_function=row["time_function"],
+            cross_country=row["cross_country"],
+            night=row["night"],
+            duration=row["total_duration"],
+            landings=row["total_landings"],
+            entries=row["total_entries"],
+        )
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logbook", "0042_aerodromedistance"),
+    ]
+
+    operations = [
+        # Generated fields can't be altered, so the column is created anew
+        migrations.RemoveField(
+            model_name="logentry",
+            name="duration",
+        ),
+        migrations.AddField(
+            model_name="logentry",
+            name="duration",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=logbook.models.log_entry.SecondsBetween("departure_time", "arrival_time"),
+                help_text="Duration in seconds.",
+                output_field=models.PositiveIntegerField(),
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dailytotals",
+            name="duration",
+            field=models.PositiveIntegerField(help_text="Duration in seconds, like `LogEntry.duration`."),
+        ),
+        # The stored durations were intervals, so the rollup is computed again in seconds
+        migrations.RunPython(rebuild_daily_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("logbook", "0043_duration_seconds"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="runner",
+            field=models.CharField(blank=True, help_text="Runner process that claimed the job.", max_length=255),
+        ),
+    ]
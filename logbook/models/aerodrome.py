@@ -17,3 +17,52 @@ class Aerodrome(models.Model):
 
     def __str__(self):
         return f"{self.icao_code} ({self.name})"
+
+
+class AerodromeAlmanac(models.Model):
+    """
+    Precomputed sun events for an aerodrome and local date, see `manage.py compute_almanac`
+    """
+
+    aerodrome = models.ForeignKey(Aerodrome, on_delete=models.CASCADE)
+    date = models.DateField()
+    timezone = models.CharField(max_length=64)
+    morning_twilight = models.DateTimeField(help_text="Start of morning civil twilight")
+    sunrise = models.DateTimeField()
+    sunset = models.DateTimeField()
+    evening_twilight = models.DateTimeField(help_text="End of evening civil twilight")
+
+    class Meta:
+        constraints = (models.UniqueConstraint(fields=["aerodrome", "date"], name="aerodrome_almanac_unique"),)
+        ordering = ("aerodrome", "date")
+        verbose_name_plural = "aerodrome almanac"
+
+    def __str__(self):
+        return f"{self.aerodrome.icao_code} {self.date}"
+
+
+class AerodromeDistance(models.Model):
+    """
+    Great-circle distance between two aerodromes in NM, stored once per pair with the lower ID first
+
+    Rows are created lazily for the pairs that occur in log entries, see `logbook.statistics.routes`.
+    """
+
+    from_aerodrome = models.ForeignKey(Aerodrome, on_delete=models.CASCADE, related_name="+")
+    to_aerodrome = models.ForeignKey(Aerodrome, on_delete=models.CASCADE, related_name="+")
+    distance = models.FloatField()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(fields=["from_aerodrome", "to_aerodrome"], name="aerodrome_distance_unique"),
+            models.CheckConstraint(
+                condition=models.Q(from_aerodrome__lte=models.F("to_aerodrome")), name="aerodrome_distance_ordered"
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.from_aerodrome_id} - {self.to_aerodrome_id} ({self.distance:.1f} NM)"
+
+    @staticmethod
+    def key(a: int, b: int) -> tuple[int, int]:
+        return (a, b) if a <= b else (b, a)
@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING, Optional
 
 from colorfield.fields import ColorField
 from django.db import models
-from django.utils.functional import classproperty
+from django.utils.functional import cached_property, classproperty
 
 if TYPE_CHECKING:
     from ..statistics.currency import RollingCurrency
@@ -103,7 +103,7 @@ class Aircraft(models.Model):
     def __str__(self):
         return f"{self.registration} ({self.maker} {self.model})"
 
-    @property
+    @cached_property
     def currency_status(self) -> Optional["RollingCurrency"]:
         from ..statistics.currency import get_rolling_currency
 
@@ -0,0 +1,87 @@
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from django.db import models, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from .aircraft import Aircraft
+from .log_entry import FunctionType, LogEntry
+
+
+class DailyTotalsQuerySet(models.QuerySet):
+    pass
+
+
+class DailyTotals(models.Model):
+    """
+    Rollup of log entries per day of departure, aircraft, function and flags
+
+    It is kept current by the `LogEntry` signal handlers, which refresh the affected days on every save and delete,
+    but bulk operations bypass signals, so they have to call `DailyTotals.rebuild()` themselves.
+    """
+
+    objects = DailyTotalsQuerySet.as_manager()
+
+    day = models.DateField()
+    aircraft = models.ForeignKey(Aircraft, on_delete=models.CASCADE)
+    time_function = models.CharField(max_length=5, blank=True, choices=FunctionType.choices)
+    cross_country = models.BooleanField()
+    night = models.BooleanField()
+
+    duration = models.PositiveIntegerField(help_text="Duration in seconds, like `LogEntry.duration`.")
+    landings = models.PositiveIntegerField()
+    entries = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["day", "aircraft", "time_function", "cross_country", "night"],
+                name="daily_totals_unique",
+            ),
+        )
+        ordering = ("day",)
+        verbose_name_plural = "daily totals"
+
+    def __str__(self):
+        return (
+            f"{self.day} {self.aircraft_id} {self.time_function} "
+            f"{'[XC] ' if self.cross_country else ''}{'[N] ' if self.night else ''}"
+            f"({self.entries} entries, {self.landings} landings, {timedelta(seconds=self.duration)})"
+        )
+
+    @classmethod
+    def rebuild(cls, days: Iterable[date] | None = None):
+        """
+        Recomputes the rollup for the given days of departure, or from scratch if no days are given
+        """
+        entries = LogEntry.objects.all()
+        rollups = cls.objects.all()
+
+        if days is not None:
+            days = set(days)
+            entries = entries.filter(departure_time__date__in=days)
+            rollups = rollups.filter(day__in=days)
+
+        rows = (
+            entries.annotate(day=TruncDate("departure_time"))
+            .order_by()
+            .values("day", "aircraft", "time_function", "cross_country", "night")
+            .annotate(total_duration=Sum("duration"), total_landings=Sum("landings"), total_entries=Count("id"))
+        )
+
+        with transaction.atomic():
+            rollups.delete()
+            cls.objects.bulk_create(
+                cls(
+                    day=row["day"],
+                    aircraft_id=row["aircraft"],
+                    time_function=row["time_function"],
+                    cross_country=row["cross_country"],
+                    night=row["night"],
+                    duration=row["total_duration"],
+                    landings=row["total_landings"],
+                    entries=row["total_entries"],
+                )
+                for row in rows
+            )
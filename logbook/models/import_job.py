@@ -0,0 +1,48 @@
+from django.db import models
+
+from .log_entry import LogEntry
+
+
+class ImportJobStatus(models.TextChoices):
+    QUEUED = "QUEUED", "Queued"
+    RUNNING = "RUNNING", "Running"
+    SUCCEEDED = "SUCCEEDED", "Succeeded"
+    FAILED = "FAILED", "Failed"
+
+
+class ImportJob(models.Model):
+    """
+    Import of a flight from Vereinsflieger, run in the background by `logbook.jobs`
+    """
+
+    flight_id = models.PositiveIntegerField()
+    status = models.CharField(max_length=9, choices=ImportJobStatus.choices, default=ImportJobStatus.QUEUED)
+    log_entry = models.ForeignKey(LogEntry, on_delete=models.SET_NULL, blank=True, null=True)
+    error = models.TextField(blank=True)
+    runner = models.CharField(max_length=255, blank=True, help_text="Runner process that claimed the job.")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = (models.Index(fields=["status", "created_at"], name="importjob_status_created"),)
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"#{self.pk} flight {self.flight_id} ({self.status})"
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (ImportJobStatus.SUCCEEDED, ImportJobStatus.FAILED)
+
+    def to_json(self) -> dict:
+        return {
+            "id": self.pk,
+            "flight_id": self.flight_id,
+            "status": self.status,
+            "status_display": self.get_status_display(),
+            "finished": self.finished,
+            "log_entry_id": self.log_entry_id,
+            "error": self.error,
+        }
@@ -1,6 +1,6 @@
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import CheckConstraint, DurationField, ExpressionWrapper, F, Q
+from django.db.models import CheckConstraint, F, Func, PositiveIntegerField, Q
 
 from .aerodrome import Aerodrome
 from .aircraft import Aircraft, AircraftType
@@ -19,9 +19,38 @@ class LaunchType(models.TextChoices):
 
 
 class LogEntryQuerySet(models.QuerySet):
-    def with_durations(self):
-        return self.annotate(
-            duration=ExpressionWrapper(F("arrival_time") - F("departure_time"), output_field=DurationField())
+    pass
+
+
+class SecondsBetween(Func):
+    """
+    Whole seconds from the first to the second datetime, compiled to native SQL of each backend
+
+    Django compiles datetime subtraction on SQLite to a function that only exists on its own connections, which would
+    make the table unwritable for any other tool if used in a generated column.
+    """
+
+    arity = 2
+    output_field = PositiveIntegerField()
+    template = "CAST(EXTRACT(EPOCH FROM (%(expressions)s)) AS integer)"
+    arg_joiner = " - "
+
+    def __init__(self, start, end, **extra):
+        # The arguments are swapped, so that the expressions are joined as `end - start`
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            template="CAST(ROUND((julianday(%(expressions)s)) * 86400) AS integer)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="TIMESTAMPDIFF(SECOND, %(expressions)s)", arg_joiner=", ", **extra_context
         )
 
 
@@ -52,6 +81,13 @@ class LogEntry(models.Model):
 
     slots = models.PositiveSmallIntegerField(default=1, help_text="Number of logbook slots for this entry.")
 
+    duration = models.GeneratedField(
+        expression=SecondsBetween("departure_time", "arrival_time"),
+        output_field=PositiveIntegerField(),
+        db_persist=True,
+        help_text="Duration in seconds.",
+    )
+
     class Meta:
         constraints = (
             CheckConstraint(condition=Q(arrival_time__gt=F("departure_time")), name="arrival_after_departure"),
@@ -64,6 +100,11 @@ class LogEntry(models.Model):
                 name="no_pic_no_xc",
             ),
         )
+        indexes = (
+            models.Index(fields=["aircraft", "departure_time"], name="logentry_aircraft_departure"),
+            models.Index(fields=["time_function", "departure_time"], name="logentry_function_departure"),
+            models.Index(fields=["night", "departure_time"], name="logentry_night_departure"),
+        )
         ordering = ("-arrival_time",)
         verbose_name_plural = "Log entries"
 
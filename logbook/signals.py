@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils.timezone import localdate
+
+from .autocomplete import invalidate_aerodrome_prefix_index
+from .choices import invalidate_filter_choices
+from .geo import invalidate_aerodrome_index
+from .models.aerodrome import Aerodrome, AerodromeDistance
+from .models.aircraft import Aircraft
+from .models.daily_totals import DailyTotals
+from .models.log_entry import LogEntry
+
+
+@receiver(pre_save, sender=LogEntry)
+def remember_previous_departure_day(sender, instance: LogEntry, **kwargs):
+    previous_departure_time = (
+        LogEntry.objects.filter(pk=instance.pk).values_list("departure_time", flat=True).first()
+        if instance.pk is not None
+        else None
+    )
+    instance._previous_departure_day = localdate(previous_departure_time) if previous_departure_time else None
+
+
+@receiver(post_save, sender=LogEntry)
+def refresh_daily_totals_on_save(sender, instance: LogEntry, **kwargs):
+    days = {localdate(instance.departure_time), getattr(instance, "_previous_departure_day", None)}
+    DailyTotals.rebuild(day for day in days if day is not None)
+
+
+@receiver(post_delete, sender=LogEntry)
+def refresh_daily_totals_on_delete(sender, instance: LogEntry, **kwargs):
+    DailyTotals.rebuild([localdate(instance.departure_time)])
+
+
+@receiver(post_save, sender=Aerodrome)
+@receiver(post_delete, sender=Aerodrome)
+def invalidate_aerodrome_indexes_on_change(sender, instance: Aerodrome, **kwargs):
+    # Only once committed, otherwise another thread could rebuild the indexes from the previous data and keep them
+    transaction.on_commit(invalidate_aerodrome_index)
+    transaction.on_commit(invalidate_aerodrome_prefix_index)
+
+
+@receiver(post_save, sender=Aerodrome)
+def delete_aerodrome_distances_on_save(sender, instance: Aerodrome, created: bool, **kwargs):
+    # The coordinates may have changed, the distances are computed again on demand
+    if not created:
+        AerodromeDistance.objects.filter(Q(from_aerodrome=instance) | Q(to_aerodrome=instance)).delete()
+
+
+@receiver(post_save, sender=Aircraft)
+@receiver(post_delete, sender=Aircraft)
+@receiver(post_save, sender=Aerodrome)
+@receiver(post_delete, sender=Aerodrome)
+@receiver(post_save, sender=LogEntry)
+@receiver(post_delete, sender=LogEntry)
+def invalidate_filter_choices_on_change(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_filter_choices)
@@ -1,10 +1,16 @@
+import enum
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import NamedTuple
 
 from dateutil.relativedelta import relativedelta
 from django.db import models
 from django.db.models import OuterRef, QuerySet, Subquery, Sum, Value
 
+from ..models.aircraft import Aircraft
 from ..models.log_entry import FunctionType, LogEntry
 
 
@@ -27,6 +33,17 @@ class RollingCurrency:
         return datetime.now(tz=UTC).date() + self.expires_in
 
 
+class CurrencyEngine(enum.StrEnum):
+    SUBQUERY = "subquery"
+    SWEEP = "sweep"
+
+
+class CurrencyReference(NamedTuple):
+    departure_time: datetime
+    eligible_landings: int
+    eligible_time: timedelta
+
+
 CURRENCY_TIME_RANGE_NINETY = relativedelta(days=90)
 CURRENCY_TIME_RANGE_LAPL = relativedelta(years=2)
 
@@ -43,7 +60,10 @@ CURRENCY_TIME_RANGE_SEP = relativedelta(months=12)
 CURRENCY_REQUIRED_TIME_REFRESHER_SEP = CURRENCY_REQUIRED_TIME_REFRESHER_LAPL
 
 
-def get_time_to_expiry(currency_time_range: relativedelta, reference_entry: LogEntry) -> timedelta:
+def get_time_to_expiry(
+    currency_time_range: relativedelta,
+    reference_entry: LogEntry | CurrencyReference | None,
+) -> timedelta:
     return (
         reference_entry.departure_time - (datetime.now(tz=UTC) - currency_time_range)
         if reference_entry is not None
@@ -51,7 +71,10 @@ def get_time_to_expiry(currency_time_range: relativedelta, reference_entry: LogE
     )
 
 
-def get_currency_status(expires_in: timedelta, reference_entry: LogEntry) -> CurrencyStatus:
+def get_currency_status(
+    expires_in: timedelta,
+    reference_entry: LogEntry | CurrencyReference | None,
+) -> CurrencyStatus:
     return (
         CurrencyStatus.NOT_CURRENT
         if reference_entry is None
@@ -66,9 +89,36 @@ def get_rolling_currency(
     required_landings: int,
     required_time: timedelta | None = None,
     currency_time_range: relativedelta = CURRENCY_TIME_RANGE_NINETY,
+    engine: CurrencyEngine = CurrencyEngine.SWEEP,
 ) -> RollingCurrency:
     eligible_entries = queryset.filter(departure_time__gte=datetime.now(tz=UTC) - currency_time_range)
 
+    match engine:
+        case CurrencyEngine.SUBQUERY:
+            first_current_entry, first_expired_entry = find_subquery_references(
+                eligible_entries, required_landings, required_time
+            )
+        case CurrencyEngine.SWEEP:
+            first_current_entry, first_expired_entry = find_sweep_references(
+                eligible_entries.order_by("-departure_time")
+                .values_list("departure_time", "landings", "duration")
+                .iterator(),
+                required_landings,
+                required_time,
+            )
+        case _:
+            raise ValueError(f"unknown currency engine: {engine}")
+
+    return make_rolling_currency(
+        first_current_entry, first_expired_entry, required_landings, required_time, currency_time_range
+    )
+
+
+def find_subquery_references(
+    eligible_entries: QuerySet["LogEntry"],
+    required_landings: int,
+    required_time: timedelta | None,
+) -> tuple[LogEntry | None, LogEntry | None]:
     annotated_entries = eligible_entries.annotate(
         eligible_landings=Subquery(
             eligible_entries.filter(departure_time__gte=OuterRef("departure_time"))
@@ -79,7 +129,6 @@ def get_rolling_currency(
         ),
         eligible_time=Subquery(
             eligible_entries.filter(departure_time__gte=OuterRef("departure_time"))
-            .with_durations()
             .annotate(remove_group_by=Value(None))
             .values("remove_group_by")
             .annotate(total_time_until=Sum("duration"))
@@ -90,7 +139,9 @@ def get_rolling_currency(
     current_entries = annotated_entries.filter(eligible_landings__gte=required_landings).order_by("eligible_landings")
 
     if required_time is not None:
-        current_entries = current_entries.filter(eligible_time__gte=required_time).order_by("eligible_time")
+        current_entries = current_entries.filter(eligible_time__gte=required_time.total_seconds()).order_by(
+            "eligible_time"
+        )
 
     first_current_entry = current_entries.first()
 
@@ -105,12 +156,63 @@ def get_rolling_currency(
 
     expired_entries = annotated_entries.filter(
         **{"eligible_landings__lt": required_landings}
-        | ({"eligible_time__lt": required_time} if required_time is not None else {})
+        | ({"eligible_time__lt": required_time.total_seconds()} if required_time is not None else {})
         | departure_date_filter,
     ).order_by("-eligible_landings", "-eligible_time")
-
     first_expired_entry = expired_entries.first()
 
+    # The durations are summed up in seconds
+    for entry in (first_current_entry, first_expired_entry):
+        if entry is not None:
+            entry.eligible_time = timedelta(seconds=entry.eligible_time or 0)
+
+    return first_current_entry, first_expired_entry
+
+
+def find_sweep_references(
+    entries: Iterable[tuple[datetime, int, int]],  # departure time, landings and duration in seconds
+    required_landings: int,
+    required_time: timedelta | None,
+) -> tuple[CurrencyReference | None, CurrencyReference | None]:
+    """
+    Finds the first current and the first expired entries in a single pass over eligible entries sorted by descending
+    departure time, accumulating landings and time from the most recent entry backwards
+
+    The running sums only ever grow, so the first entry to satisfy the requirements is the first current entry, and the
+    expired entries form a prefix of the sweep that ends before it.
+    """
+    eligible_landings, eligible_time = 0, timedelta()
+    expired_candidates = []
+
+    for departure_time, landings, duration in entries:
+        eligible_landings += landings
+        eligible_time += timedelta(seconds=duration)
+        reference = CurrencyReference(
+            departure_time=departure_time,
+            eligible_landings=eligible_landings,
+            eligible_time=eligible_time,
+        )
+
+        if eligible_landings >= required_landings and (required_time is None or eligible_time >= required_time):
+            # See `find_subquery_references` for why expired entries on the first day of currency are not considered
+            expired_candidates = [
+                candidate for candidate in expired_candidates if candidate.departure_time.date() > departure_time.date()
+            ]
+            return reference, expired_candidates[-1] if expired_candidates else None
+
+        if eligible_landings < required_landings and (required_time is None or eligible_time < required_time):
+            expired_candidates.append(reference)
+
+    return None, expired_candidates[-1] if expired_candidates else None
+
+
+def make_rolling_currency(
+    first_current_entry: LogEntry | CurrencyReference | None,
+    first_expired_entry: LogEntry | CurrencyReference | None,
+    required_landings: int,
+    required_time: timedelta | None,
+    currency_time_range: relativedelta,
+) -> RollingCurrency:
     expires_in = get_time_to_expiry(currency_time_range, first_current_entry)
 
     landings_to_renew = required_landings - (
@@ -131,6 +233,42 @@ def get_rolling_currency(
     )
 
 
+def with_currency_status(aircraft: Iterable[Aircraft]) -> list[Aircraft]:
+    """
+    Computes the currency status of all given aircraft that require it from a single ordered fetch of their entries,
+    and caches it on the instances, so that accessing `Aircraft.currency_status` no longer triggers any queries
+    """
+    aircraft = list(aircraft)
+
+    entries = (
+        LogEntry.objects.filter(
+            aircraft__in=[item for item in aircraft if item.currency_required],
+            departure_time__gte=datetime.now(tz=UTC) - CURRENCY_TIME_RANGE_NINETY,
+        )
+        .order_by("aircraft_id", "-departure_time")
+        .values_list("aircraft_id", "departure_time", "landings", "duration")
+    )
+
+    entries_per_aircraft = {
+        aircraft_id: [entry[1:] for entry in aircraft_entries]
+        for aircraft_id, aircraft_entries in groupby(entries, key=itemgetter(0))
+    }
+
+    for item in aircraft:
+        item.currency_status = (
+            make_rolling_currency(
+                *find_sweep_references(entries_per_aircraft.get(item.pk, ()), item.CURRENCY_REQUIRED_LANDINGS, None),
+                item.CURRENCY_REQUIRED_LANDINGS,
+                None,
+                CURRENCY_TIME_RANGE_NINETY,
+            )
+            if item.currency_required
+            else None
+        )
+
+    return aircraft
+
+
 def get_passenger_currency(entries: QuerySet["LogEntry"]) -> (RollingCurrency, RollingCurrency):
     day_currency = get_rolling_currency(entries, CURRENCY_REQUIRED_LANDINGS_PASSENGER)
 
@@ -150,11 +288,9 @@ def get_lapl_currency(entries: QuerySet["LogEntry"]) -> RollingCurrency:
         currency_time_range=CURRENCY_TIME_RANGE_LAPL,
     )
 
-    refresher_training = (
-        entries.with_durations()
-        .filter(time_function=FunctionType.DUAL, duration__gte=CURRENCY_REQUIRED_TIME_REFRESHER_LAPL)
-        .first()
-    )
+    refresher_training = entries.filter(
+        time_function=FunctionType.DUAL, duration__gte=CURRENCY_REQUIRED_TIME_REFRESHER_LAPL.total_seconds()
+    ).first()
 
     refresher_training_expires_in = get_time_to_expiry(CURRENCY_TIME_RANGE_LAPL, refresher_training)
     refresher_training_currency_status = get_currency_status(refresher_training_expires_in, refresher_training)
@@ -5,6 +5,7 @@ from datetime import timedelta
 from django.db.models import Sum
 
 from ..models.aircraft import AircraftType
+from ..models.daily_totals import DailyTotalsQuerySet
 from ..models.log_entry import LogEntryQuerySet
 
 
@@ -13,6 +14,9 @@ class TotalsRecord:
     time: timedelta
     landings: int
 
+    def __add__(self, other: "TotalsRecord") -> "TotalsRecord":
+        return TotalsRecord(time=self.time + other.time, landings=self.landings + other.landings)
+
     def __sub__(self, other: "TotalsRecord") -> "TotalsRecord":
         return TotalsRecord(time=self.time - other.time, landings=self.landings - other.landings)
 
@@ -49,17 +53,21 @@ class ExperienceRequirements:
     details: str | None = None
 
 
-def total_time(entries: LogEntryQuerySet) -> timedelta:
-    duration_sum = entries.with_durations().aggregate(Sum("duration"))["duration__sum"]
-    return duration_sum if duration_sum is not None else timedelta()
+def total_time(entries: LogEntryQuerySet | DailyTotalsQuerySet) -> timedelta:
+    return timedelta(seconds=entries.aggregate(Sum("duration"))["duration__sum"] or 0)
 
 
-def total_landings(entries: LogEntryQuerySet, full_stop: bool) -> int:
-    landings = entries.aggregate(Sum("landings"))["landings__sum"] if not full_stop else entries.count()
+def total_landings(entries: LogEntryQuerySet | DailyTotalsQuerySet, full_stop: bool) -> int:
+    if not full_stop:
+        landings = entries.aggregate(Sum("landings"))["landings__sum"]
+    elif isinstance(entries, DailyTotalsQuerySet):
+        landings = entries.aggregate(Sum("entries"))["entries__sum"]
+    else:
+        landings = entries.count()
     return landings if landings is not None else 0
 
 
-def compute_totals(entries: LogEntryQuerySet, full_stop=False) -> TotalsRecord:
+def compute_totals(entries: LogEntryQuerySet | DailyTotalsQuerySet, full_stop=False) -> TotalsRecord:
     return TotalsRecord(time=total_time(entries), landings=total_landings(entries, full_stop))
 
 
@@ -67,7 +75,9 @@ MAX_GLIDER_CPL_ENTRY_CREDIT = timedelta(hours=10)
 MAX_GLIDER_CPL_ISSUE_CREDIT = timedelta(hours=30)
 
 
-def cpl_total_hours_requirements(entries: LogEntryQuerySet, glider_credit: timedelta) -> TotalsRecord:
+def cpl_total_hours_requirements(
+    entries: LogEntryQuerySet | DailyTotalsQuerySet, glider_credit: timedelta
+) -> TotalsRecord:
     glider_time = total_time(entries.filter(aircraft__type__in=AircraftType.gliders))
     if glider_time > glider_credit:
         glider_time = glider_credit
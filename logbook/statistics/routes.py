@@ -0,0 +1,130 @@
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+from django.db.models import Count
+
+from ..geo import haversine
+from ..models.aerodrome import Aerodrome, AerodromeDistance
+from ..models.aircraft import Aircraft
+from ..models.log_entry import LogEntryQuerySet
+
+TOP_ROUTES = 10
+
+
+@dataclass(frozen=True, kw_only=True)
+class Route:
+    aerodromes: tuple[Aerodrome, Aerodrome]
+    distance: float
+    flights: int
+
+    @property
+    def total_distance(self) -> float:
+        return self.distance * self.flights
+
+
+@dataclass(frozen=True, kw_only=True)
+class AircraftDistance:
+    aircraft: Aircraft
+    distance: float
+    flights: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class RouteStatistics:
+    distance: float
+    flights: int
+    per_aircraft: list[AircraftDistance]
+    most_frequent: list[Route]
+    farthest: list[Route]
+
+
+def get_pair_distances(pairs: Iterable[tuple[int, int]]) -> dict[tuple[int, int], float]:
+    """
+    Looks up the distances of aerodrome pairs (by `AerodromeDistance.key`), computing and storing the missing ones
+
+    The missing distances are computed from the coordinates in the database rather than from the aerodrome index of the
+    process, which may be stale, so that no outdated distance is stored.
+    """
+    keys = {AerodromeDistance.key(a, b) for a, b in pairs}
+    if not keys:
+        return {}
+
+    ids = {pk for key in keys for pk in key}
+    distances = {
+        (a, b): distance
+        for a, b, distance in AerodromeDistance.objects.filter(
+            from_aerodrome__in=ids, to_aerodrome__in=ids
+        ).values_list("from_aerodrome", "to_aerodrome", "distance")
+        if (a, b) in keys
+    }
+
+    if missing := [key for key in keys if key not in distances]:
+        coordinates = {
+            pk: (latitude, longitude)
+            for pk, latitude, longitude in Aerodrome.objects.filter(
+                pk__in={pk for key in missing for pk in key}
+            ).values_list("pk", "latitude", "longitude")
+        }
+        points = np.array([(*coordinates[a], *coordinates[b]) for a, b in missing], dtype=float)
+        computed = dict(zip(missing, map(float, haversine(*points.T))))
+        AerodromeDistance.objects.bulk_create(
+            (AerodromeDistance(from_aerodrome_id=a, to_aerodrome_id=b, distance=d) for (a, b), d in computed.items()),
+            ignore_conflicts=True,
+        )
+        distances |= computed
+
+    return distances
+
+
+def compute_route_statistics(entries: LogEntryQuerySet, top: int = TOP_ROUTES) -> RouteStatistics:
+    """
+    Computes the distance flown in total and per aircraft, and the most frequent and farthest aerodrome pairs
+
+    Entries are counted per pair and aircraft by one grouped query, and the pair distances come from the distance table,
+    so no distance is computed per entry. Pairs are undirected, i.e. A -> B and B -> A are the same route.
+    """
+    rows = list(
+        entries.order_by()
+        .values("from_aerodrome", "to_aerodrome", "aircraft")
+        .annotate(flights=Count("id"))
+        .values_list("from_aerodrome", "to_aerodrome", "aircraft", "flights")
+    )
+    distances = get_pair_distances((a, b) for a, b, _, _ in rows)
+
+    pair_flights: Counter[tuple[int, int]] = Counter()
+    aircraft_flights: Counter[int] = Counter()
+    aircraft_distance: dict[int, float] = defaultdict(float)
+
+    for a, b, aircraft, flights in rows:
+        key = AerodromeDistance.key(a, b)
+        pair_flights[key] += flights
+        aircraft_flights[aircraft] += flights
+        aircraft_distance[aircraft] += distances[key] * flights
+
+    most_frequent = pair_flights.most_common(top)
+    farthest = sorted(pair_flights.items(), key=lambda item: (-distances[item[0]], -item[1]))[:top]
+
+    aerodromes = Aerodrome.objects.in_bulk({pk for key, _ in most_frequent + farthest for pk in key})
+    aircraft = Aircraft.objects.in_bulk(aircraft_flights.keys())
+
+    def routes(items: list[tuple[tuple[int, int], int]]) -> list[Route]:
+        return [
+            Route(aerodromes=(aerodromes[a], aerodromes[b]), distance=distances[(a, b)], flights=flights)
+            for (a, b), flights in items
+        ]
+
+    return RouteStatistics(
+        distance=sum(aircraft_distance.values()),
+        flights=sum(aircraft_flights.values()),
+        per_aircraft=sorted(
+            (
+                AircraftDistance(aircraft=aircraft[pk], distance=aircraft_distance[pk], flights=flights)
+                for pk, flights in aircraft_flights.items()
+            ),
+            key=lambda item: -item.distance,
+        ),
+        most_frequent=routes(most_frequent),
+        farthest=routes(farthest),
+    )
@@ -0,0 +1,162 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.db.models import Q, Sum
+
+from ..models.aircraft import Aircraft, AircraftType
+from ..models.log_entry import FunctionType, LogEntryQuerySet
+from .experience import TotalsRecord
+
+EMPTY_TOTALS = TotalsRecord(time=timedelta(), landings=0)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PeriodTotals:
+    grand: TotalsRecord
+    per_function: dict[FunctionType, TotalsRecord]
+
+
+@dataclass(frozen=True, kw_only=True)
+class AircraftTotals(PeriodTotals):
+    aircraft: Aircraft
+    per_period: list[PeriodTotals]
+
+
+@dataclass(frozen=True, kw_only=True)
+class TypeTotals(PeriodTotals):
+    per_aircraft: list[AircraftTotals]
+    per_period: list[PeriodTotals]
+
+
+@dataclass(frozen=True, kw_only=True)
+class FleetTotals:
+    per_type: dict[AircraftType, TypeTotals]
+    grand: TotalsRecord
+
+
+@dataclass(frozen=True, kw_only=True)
+class CarryForwardTotals:
+    time: dict[tuple[AircraftType | None, FunctionType | None], timedelta]
+    landings: int
+
+
+def _aggregate_name(kind: str, period: int | None, function: FunctionType | None) -> str:
+    return f"{kind}_{'all' if period is None else period}_{'any' if function is None else function}"
+
+
+def _sum_totals(records: Iterable[TotalsRecord]) -> TotalsRecord:
+    return sum(records, start=EMPTY_TOTALS)
+
+
+def _sum_period_totals(records: list[PeriodTotals]) -> PeriodTotals:
+    return PeriodTotals(
+        grand=_sum_totals(record.grand for record in records),
+        per_function={
+            function: _sum_totals(record.per_function[function] for record in records) for function in FunctionType
+        },
+    )
+
+
+def compute_fleet_totals(entries: LogEntryQuerySet, periods: Iterable[timedelta], now: datetime) -> FleetTotals:
+    """
+    Computes totals per aircraft type, aircraft, function and period with a single grouped query
+
+    Every combination of period and function is a conditional aggregate over the entries of each aircraft, and the
+    totals per type and the grand total are then obtained by summing up the per-aircraft records.
+    """
+    period_filters = {None: Q()} | {
+        index: Q(departure_time__gt=now - period_delta) for index, period_delta in enumerate(periods)
+    }
+
+    aggregates = {}
+    for period, period_filter in period_filters.items():
+        for function in (None, *FunctionType):
+            condition = period_filter & (Q(time_function=function) if function is not None else Q())
+            aggregates[_aggregate_name("time", period, function)] = Sum("duration", filter=condition or None)
+            aggregates[_aggregate_name("landings", period, function)] = Sum("landings", filter=condition or None)
+
+    rows = {row["aircraft"]: row for row in entries.order_by().values("aircraft").annotate(**aggregates)}
+
+    def totals(row: dict | None, period: int | None, function: FunctionType | None) -> TotalsRecord:
+        if row is None:
+            return EMPTY_TOTALS
+        return TotalsRecord(
+            time=timedelta(seconds=row[_aggregate_name("time", period, function)] or 0),
+            landings=row[_aggregate_name("landings", period, function)] or 0,
+        )
+
+    def period_totals(row: dict | None, period: int | None) -> PeriodTotals:
+        return PeriodTotals(
+            grand=totals(row, period, None),
+            per_function={function: totals(row, period, function) for function in FunctionType},
+        )
+
+    period_indices = [period for period in period_filters if period is not None]
+
+    per_aircraft = []
+    for aircraft in Aircraft.objects.all():
+        overall = period_totals(rows.get(aircraft.pk), None)
+        per_aircraft.append(
+            AircraftTotals(
+                aircraft=aircraft,
+                grand=overall.grand,
+                per_function=overall.per_function,
+                per_period=[period_totals(rows.get(aircraft.pk), period) for period in period_indices],
+            )
+        )
+
+    per_type = {}
+    for aircraft_type in reversed(AircraftType):
+        type_aircraft = [item for item in per_aircraft if item.aircraft.type == aircraft_type]
+        overall = _sum_period_totals(type_aircraft)
+        per_type[aircraft_type] = TypeTotals(
+            grand=overall.grand,
+            per_function=overall.per_function,
+            per_aircraft=type_aircraft,
+            per_period=[
+                _sum_period_totals([item.per_period[period] for item in type_aircraft]) for period in period_indices
+            ],
+        )
+
+    return FleetTotals(
+        per_type=per_type,
+        grand=_sum_totals(totals(row, None, None) for row in rows.values()),
+    )
+
+
+def compute_carry_forward_totals(
+    entries: LogEntryQuerySet,
+    reference_times: dict[str, datetime],
+) -> dict[str, CarryForwardTotals]:
+    """
+    Computes the totals of entries arrived until each of the reference times with a single conditional aggregate query,
+    both overall and per aircraft type and / or function
+    """
+    combinations = [
+        (aircraft_type, function) for aircraft_type in (None, *AircraftType) for function in (None, *FunctionType)
+    ]
+
+    aggregates = {}
+    for key, reference_time in reference_times.items():
+        for aircraft_type, function in combinations:
+            condition = (
+                Q(arrival_time__lte=reference_time)
+                & (Q(aircraft__type=aircraft_type) if aircraft_type is not None else Q())
+                & (Q(time_function=function) if function is not None else Q())
+            )
+            aggregates[f"time_{key}_{aircraft_type}_{function}"] = Sum("duration", filter=condition)
+        aggregates[f"landings_{key}"] = Sum("landings", filter=Q(arrival_time__lte=reference_time))
+
+    totals = entries.aggregate(**aggregates)
+
+    return {
+        key: CarryForwardTotals(
+            time={
+                (aircraft_type, function): timedelta(seconds=totals[f"time_{key}_{aircraft_type}_{function}"] or 0)
+                for aircraft_type, function in combinations
+            },
+            landings=totals[f"landings_{key}"] or 0,
+        )
+        for key in reference_times
+    }
@@ -9,8 +9,7 @@ from django_filters import FilterSet
 from ..models.aircraft import AircraftType, SpeedUnit
 from ..models.log_entry import FunctionType, LogEntry
 from ..statistics.experience import ExperienceRecord, TotalsRecord
-from ..statistics.experience import total_landings as statistics_total_landings
-from ..statistics.experience import total_time as statistics_total_time
+from ..statistics.totals import CarryForwardTotals
 
 register = template.Library()
 
@@ -95,28 +94,13 @@ def get_filtered_entries(entries_filter: FilterSet | None):
 
 @register.simple_tag
 def total_time(
-    reference_time: datetime,
+    totals: CarryForwardTotals,
     time_function: FunctionType | None = None,
     aircraft_type: AircraftType | None = None,
-    entries_filter: FilterSet | None = None,
 ) -> str:
-    return duration(
-        statistics_total_time(
-            get_filtered_entries(entries_filter).filter(
-                **{"arrival_time__lte": reference_time}
-                | ({"time_function": time_function} if time_function is not None else {})
-                | ({"aircraft__type": aircraft_type} if aircraft_type is not None else {})
-            )
-        ),
-        "%h:%M",
-    )
+    return duration(totals.time[aircraft_type, time_function], "%h:%M")
 
 
 @register.simple_tag
-def total_landings(reference_time: datetime, entries_filter: FilterSet | None = None) -> str:
-    return str(
-        statistics_total_landings(
-            get_filtered_entries(entries_filter).filter(arrival_time__lte=reference_time),
-            full_stop=False,
-        )
-    )
+def total_landings(totals: CarryForwardTotals) -> str:
+    return str(totals.landings)
@@ -1,12 +1,14 @@
 from django.urls import path
 
 from .apps import LogbookConfig
+from .views.aerodromes import AerodromeAutocompleteView
 from .views.aircraft import AircraftIndexView
 from .views.astro import AstroIndexView
 from .views.certificates import CertificateIndexView
 from .views.dashboard import DashboardView
-from .views.entries import EntryIndexView
+from .views.entries import EntryIndexView, ImportJobStatusView
 from .views.experience import ExperienceIndexView
+from .views.routes import RoutesIndexView
 
 app_name = LogbookConfig.name
 
@@ -14,8 +16,11 @@ app_name = LogbookConfig.name
 urlpatterns = [
     path("", DashboardView.as_view(), name="dashboard"),
     path("entries/", EntryIndexView.as_view(), name="entries"),
+    path("entries/jobs/", ImportJobStatusView.as_view(), name="import-jobs"),
     path("certificates/", CertificateIndexView.as_view(), name="certificates"),
     path("experience/", ExperienceIndexView.as_view(), name="experience"),
     path("aircraft/", AircraftIndexView.as_view(), name="aircraft"),
+    path("aerodromes/autocomplete/", AerodromeAutocompleteView.as_view(), name="aerodrome-autocomplete"),
+    path("routes/", RoutesIndexView.as_view(), name="routes"),
     path("astro/", AstroIndexView.as_view(), name="astro"),
 ]
@@ -0,0 +1,17 @@
+import time
+
+from django.core.cache import cache
+
+
+def get_version(key: str) -> int:
+    """
+    Returns the version of a process-wide cache, kept in the cache framework so that all processes share it
+
+    A version that isn't set yet or was evicted starts anew from the clock, so it can't match an earlier one.
+    """
+    return cache.get_or_set(key, time.time_ns, timeout=None)
+
+
+def bump_version(key: str):
+    # Any new value invalidates, so a plain write does, unlike an `incr` that is read-modify-write for some backends
+    cache.set(key, time.time_ns(), timeout=None)
@@ -0,0 +1,57 @@
+from django import forms
+from django.http import JsonResponse
+from django.urls import reverse_lazy
+from django.utils.text import format_lazy
+from django.views.generic import View
+
+from ..autocomplete import DEFAULT_LIMIT, get_aerodrome_prefix_index
+from ..choices import get_filter_choices
+from ..models.aerodrome import Aerodrome
+from .utils import AuthenticatedView
+
+MAX_LIMIT = 50
+
+
+class AerodromeAutocompleteSelect(forms.Select):
+    """
+    Select that only renders the selected aerodrome, the others are fetched by select2 from the autocomplete endpoint
+
+    With `logbook_only`, only the aerodromes that occur in the logbook are suggested.
+    """
+
+    def __init__(self, attrs=None, logbook_only: bool = False):
+        url = reverse_lazy("logbook:aerodrome-autocomplete")
+        super().__init__(
+            {
+                "data-ajax--url": format_lazy("{}?logbook=1", url) if logbook_only else url,
+                "data-minimum-input-length": 2,
+                "data-allow-clear": "true",
+                "data-placeholder": "---------",
+            }
+            | (attrs or {})
+        )
+
+    def optgroups(self, name, value, attrs=None):
+        selected = Aerodrome.objects.filter(pk__in=[pk for pk in value if str(pk).isdigit()])
+        options = [self.create_option(name, "", "", False, 0)]
+        options += [
+            self.create_option(name, aerodrome.pk, str(aerodrome), True, index)
+            for index, aerodrome in enumerate(selected, start=1)
+        ]
+        return [(None, options, 0)]
+
+
+class AerodromeAutocompleteView(AuthenticatedView, View):
+    """
+    Aerodromes matching the query (`?q=merz`) by ICAO code, name or city, in the select2 results format
+
+    With `?logbook=1`, only the aerodromes that occur in the logbook are suggested.
+    """
+
+    def get(self, request, *args, **kwargs):
+        limit = request.GET.get("limit", "")
+        limit = min(int(limit), MAX_LIMIT) if limit.isdigit() else DEFAULT_LIMIT
+        ids = get_filter_choices().aerodromes if request.GET.get("logbook") else None
+
+        suggestions = get_aerodrome_prefix_index().search(request.GET.get("q", ""), limit=limit, ids=ids)
+        return JsonResponse({"results": [suggestion.to_json() for suggestion in suggestions]})
@@ -1,4 +1,5 @@
 from ..models.aircraft import Aircraft, FuelType
+from ..statistics.currency import with_currency_status
 from .utils import AuthenticatedListView
 
 
@@ -6,7 +7,12 @@ class AircraftIndexView(AuthenticatedListView):
     model = Aircraft
 
     def get_context_data(self, *, object_list=None, **kwargs):
-        return super().get_context_data(**kwargs) | {
+        context = super().get_context_data(**kwargs)
+
+        # Evaluates the queryset, so that the template iterates over the very instances with cached currency status
+        with_currency_status(context["object_list"])
+
+        return context | {
             "aircraft_fields": {field.name: field for field in Aircraft._meta.get_fields()},
             "fuel_types": FuelType.objects.all(),
         }
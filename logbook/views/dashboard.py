@@ -1,9 +1,9 @@
 from datetime import UTC, datetime, timedelta
 
-from ..models.aircraft import Aircraft, AircraftType
-from ..models.log_entry import FunctionType, LogEntry, LogEntryQuerySet
-from ..statistics.currency import get_lapl_currency, get_passenger_currency
-from ..statistics.experience import compute_totals
+from ..models.aircraft import AircraftType
+from ..models.log_entry import LogEntry
+from ..statistics.currency import get_lapl_currency, get_passenger_currency, with_currency_status
+from ..statistics.totals import compute_fleet_totals
 from .utils import (
     AuthenticatedTemplateView,
     check_certificates_expiry,
@@ -18,9 +18,6 @@ class DashboardView(AuthenticatedTemplateView):
         return super().get(request, *args, **kwargs)
 
     def get_context_data(self, *args, **kwargs):
-        def totals_per_function(log_entries: LogEntryQuerySet):
-            return {function: compute_totals(log_entries.filter(time_function=function)) for function in FunctionType}
-
         now = datetime.now(tz=UTC)
         periods = {
             "1M": timedelta(days=30),
@@ -43,6 +40,13 @@ class DashboardView(AuthenticatedTemplateView):
 
         lapl_a_currency = get_lapl_currency(all_entries.filter(aircraft__type__in=AircraftType.powered))
 
+        fleet_totals = compute_fleet_totals(all_entries, periods.values(), now)
+        with_currency_status(
+            aircraft_totals.aircraft
+            for type_totals in fleet_totals.per_type.values()
+            for aircraft_totals in type_totals.per_aircraft
+        )
+
         return super().get_context_data(*args, **kwargs) | {
             "lapl_a_currency": lapl_a_currency,
             "passenger_currency": {
@@ -57,16 +61,12 @@ class DashboardView(AuthenticatedTemplateView):
             },
             "totals_per_type": {
                 aircraft_type: {
-                    "grand": compute_totals(all_entries.filter(aircraft__type=aircraft_type)),
-                    "per_function": totals_per_function(all_entries.filter(aircraft__type=aircraft_type)),
+                    "grand": type_totals.grand,
+                    "per_function": type_totals.per_function,
                     "per_aircraft": sorted(
                         (
-                            (
-                                aircraft,
-                                totals_per_function(all_entries.filter(aircraft=aircraft)),
-                                compute_totals(all_entries.filter(aircraft=aircraft)),
-                            )
-                            for aircraft in Aircraft.objects.filter(type=aircraft_type)
+                            (aircraft_totals.aircraft, aircraft_totals.per_function, aircraft_totals.grand)
+                            for aircraft_totals in type_totals.per_aircraft
                         ),
                         key=lambda item: (
                             (-item[2].landings, -item[2].time)
@@ -77,20 +77,10 @@ class DashboardView(AuthenticatedTemplateView):
                             else 0
                         ),
                     ),
-                    "per_period": [
-                        {
-                            "per_function": totals_per_function(
-                                all_entries.filter(aircraft__type=aircraft_type, departure_time__gt=now - period_delta),
-                            ),
-                            "grand": compute_totals(
-                                all_entries.filter(aircraft__type=aircraft_type, departure_time__gt=now - period_delta),
-                            ),
-                        }
-                        for period_delta in periods.values()
-                    ],
+                    "per_period": type_totals.per_period,
                 }
-                for aircraft_type in reversed(AircraftType)
+                for aircraft_type, type_totals in fleet_totals.per_type.items()
             },
-            "grand_total": compute_totals(all_entries),
+            "grand_total": fleet_totals.grand,
             "period_labels": list(periods.keys()),
         }
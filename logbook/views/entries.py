@@ -1,21 +1,26 @@
+from collections.abc import Sequence
+from functools import cached_property
 from itertools import chain
 
 import django_filters
 from django import forms
-from django.conf import settings
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import F, Q, QuerySet, Sum, Window
+from django.http import JsonResponse
 from django.urls import reverse_lazy
-from django.views.generic import FormView
+from django.views.generic import FormView, View
 from django_filters.views import FilterView
 
-from vereinsflieger.vereinsflieger import import_from_vereinsflieger
-
-from ..models.aerodrome import Aerodrome
-from ..models.aircraft import Aircraft
+from ..choices import logbook_aerodromes, registration_choices
+from ..jobs import enqueue_import, get_import_job_runner
+from ..models.import_job import ImportJob
 from ..models.log_entry import LogEntry
-from ..models.pilot import Pilot
-from .utils import AuthenticatedListView
+from ..statistics.totals import compute_carry_forward_totals
+from ..templatetags.logbook_utils import get_filtered_entries
+from .aerodromes import AerodromeAutocompleteSelect
+from .utils import AuthenticatedListView, AuthenticatedView
+
+RECENT_IMPORT_JOBS = 5
 
 
 class VereinsfliegerForm(forms.Form):
@@ -30,38 +35,65 @@ class VereinsfliegerForm(forms.Form):
         ),
     )
 
-    def import_flight(self) -> (int, LogEntry):
-        flight_id = self.cleaned_data["flight_id"]
-        flight = import_from_vereinsflieger(settings, flight_id)
+    def enqueue_import(self) -> ImportJob:
+        return enqueue_import(self.cleaned_data["flight_id"])
 
-        aircraft = Aircraft.objects.get(registration=flight.registration)
 
-        departure_time = flight.departure_time
-        arrival_time = flight.arrival_time
+class LogEntrySlots(Sequence):
+    """
+    Log entries followed by `None` placeholders for their additional slots, which only fetches the entries of the
+    requested slice from the database, locating them by the running sum of slots
+    """
 
-        from_aerodrome = Aerodrome.objects.get(icao_code=flight.from_aerodrome)
-        to_aerodrome = Aerodrome.objects.get(icao_code=flight.to_aerodrome)
+    def __init__(self, queryset: QuerySet[LogEntry], ordering: str):
+        self.queryset = queryset
+        self.ordering = ordering
 
-        pilot, _ = Pilot.objects.get_or_create(first_name=flight.pilot.first_name, last_name=flight.pilot.last_name)
+    @cached_property
+    def total_slots(self) -> int:
+        return self.queryset.aggregate(Sum("slots"))["slots__sum"] or 0
 
-        copilot, _ = (
-            Pilot.objects.get_or_create(first_name=flight.copilot.first_name, last_name=flight.copilot.last_name)
-            if flight.copilot is not None
-            else (None, None)
-        )
+    def __len__(self) -> int:
+        return self.total_slots
+
+    def __getitem__(self, index: int | slice) -> LogEntry | list[LogEntry | None] | None:
+        if not isinstance(index, slice):
+            if not -len(self) <= index < len(self):
+                raise IndexError("log entry slot index out of range")
+            index %= len(self)
+            return self[index : index + 1][0]
+
+        start, stop, step = index.indices(len(self))
+        if start >= stop:
+            return []
 
-        return flight_id, LogEntry.objects.create(
-            aircraft=aircraft,
-            from_aerodrome=from_aerodrome,
-            to_aerodrome=to_aerodrome,
-            departure_time=departure_time,
-            arrival_time=arrival_time,
-            landings=flight.landings,
-            time_function=flight.function,
-            pilot=pilot,
-            copilot=copilot,
-            remarks=flight.remarks,
-            cross_country="XC" in flight.remarks or "Nav." in flight.remarks,
+        # An entry occupies the slots from `slots_until - slots` to `slots_until` (exclusive)
+        entries = list(
+            self.queryset.select_related("aircraft", "from_aerodrome", "to_aerodrome", "pilot", "copilot")
+            .order_by(self.ordering)
+            .annotate(slots_until=Window(Sum("slots"), order_by=self.ordering))
+            .filter(slots_until__gt=start, slots_until__lt=stop + F("slots"))
+        )
+        if not entries:
+            return []
+
+        offset = entries[0].slots_until - entries[0].slots
+        slots = list(chain.from_iterable([entry] + [None] * (entry.slots - 1) for entry in entries))
+
+        return slots[start - offset : stop - offset : step]
+
+    def occupant(self, index: int) -> LogEntry:
+        """
+        Returns the entry occupying the slot, i.e. the entry itself or the one that the placeholder belongs to
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("log entry slot index out of range")
+
+        return (
+            self.queryset.order_by(self.ordering)
+            .annotate(slots_until=Window(Sum("slots"), order_by=self.ordering))
+            .filter(slots_until__gt=index)
+            .first()
         )
 
 
@@ -70,9 +102,15 @@ class LogEntriesFilter(django_filters.FilterSet):
     def filter_by_aerodrome(queryset, _, value):
         return queryset.filter(Q(from_aerodrome=value) | Q(to_aerodrome=value))
 
-    registration = django_filters.AllValuesFilter(field_name="aircraft__registration")
+    # The choices are cached, see `logbook.choices`
+    registration = django_filters.ChoiceFilter(
+        label="Registration", field_name="aircraft__registration", choices=registration_choices
+    )
     aerodrome = django_filters.ModelChoiceFilter(
-        label="Aerodrome", method="filter_by_aerodrome", queryset=Aerodrome.objects.all()
+        label="Aerodrome",
+        method="filter_by_aerodrome",
+        queryset=logbook_aerodromes,
+        widget=AerodromeAutocompleteSelect(logbook_only=True),
     )
 
     class Meta:
@@ -101,32 +139,60 @@ class EntryIndexView(FilterView, AuthenticatedListView, FormView):
         context = super().get_context_data(*args, **kwargs)
 
         # Due to slots, `object_list|last` in the template can possibly be None, so provide the last "real" entry
-        context["last_entry"] = (
-            [entry for entry in context["object_list"] if entry is not None][-1]
-            if len(context["object_list"])
-            else None
-        )
+        entries = [entry for entry in context["object_list"] if entry is not None]
+        context["last_entry"] = entries[-1] if entries else None
+
+        if entries:
+            brought_forward, carried_forward = entries[0].departure_time, entries[-1].arrival_time
+        elif context["object_list"]:
+            # The page only holds placeholders of an entry from a previous page, which is brought and carried forward
+            occupant = context["paginator"].object_list.occupant(context["page_obj"].start_index() - 1)
+            brought_forward = carried_forward = occupant.arrival_time
+
+        if context["object_list"]:
+            context |= compute_carry_forward_totals(
+                get_filtered_entries(self.filterset),
+                {"brought_forward": brought_forward, "carried_forward": carried_forward},
+            )
 
-        return context | {"form": self.get_form()}
+        return context | {
+            "form": self.get_form(),
+            "import_jobs": ImportJob.objects.select_related("log_entry")[:RECENT_IMPORT_JOBS],
+        }
 
     def paginate_queryset(self, queryset, page_size):
-        # Create empty entries for slots, but only if filtering is NOT active
-        entries = tuple(
-            chain.from_iterable(
-                [entry] + ([None] * (entry.slots - 1) if not self.filtering_is_active() else []) for entry in queryset
-            )
-        )
-
         # Set last page as a default to mimic paper logbook
         if not self.request.GET.get(self.page_kwarg):
             self.kwargs[self.page_kwarg] = "last"
 
-        return super().paginate_queryset(entries, page_size)
+        # Pagination is only active if filtering is NOT, so create empty entries for slots
+        return super().paginate_queryset(LogEntrySlots(queryset, self.get_ordering()), page_size)
 
     def form_valid(self, form):
-        flight_id, log_entry = form.import_flight()
-        messages.success(self.request, f"Flight #{flight_id} imported successfully as #{log_entry.id}!")
+        job = form.enqueue_import()
+        messages.info(self.request, f"Flight #{job.flight_id} queued for import as job #{job.id}.")
         return super().form_valid(form)
 
     def form_invalid(self, form):
         return super().get(self.request, *self.args, **self.kwargs)
+
+
+class ImportJobStatusView(AuthenticatedView, View):
+    """
+    Status of the requested import jobs (`?id=1&id=2`) or of the most recent ones, polled by the entries page
+
+    The entries page polls while jobs are pending, so the runner is started here to resume the jobs left behind by a
+    restart, rather than only once a new import is submitted.
+    """
+
+    def get(self, request, *args, **kwargs):
+        get_import_job_runner()
+
+        jobs = ImportJob.objects.all()
+
+        if ids := request.GET.getlist("id"):
+            jobs = jobs.filter(pk__in=[int(pk) for pk in ids if pk.isdigit()])
+        else:
+            jobs = jobs[:RECENT_IMPORT_JOBS]
+
+        return JsonResponse({"jobs": [job.to_json() for job in jobs]})
@@ -5,6 +5,7 @@ from django.utils.safestring import mark_safe
 from django.utils.timezone import make_aware
 
 from ..models.aircraft import AircraftType
+from ..models.daily_totals import DailyTotals, DailyTotalsQuerySet
 from ..models.log_entry import FunctionType, LogEntry, LogEntryQuerySet
 from ..statistics.currency import CURRENCY_REQUIRED_TIME_REFRESHER_SEP, CURRENCY_TIME_RANGE_SEP
 from ..statistics.experience import (
@@ -27,6 +28,8 @@ class ExperienceIndexView(AuthenticatedTemplateView):
 
     def get_context_data(self, **kwargs):
         log_entries = LogEntry.objects.all()
+        # Requirements without date or duration filters can be answered from the daily rollup instead of all entries
+        daily_totals = DailyTotals.objects.all()
         return super().get_context_data(**kwargs) | {
             "total": get_total_experience(log_entries),
             "sep_revalidation": get_sep_revalidation_experience(
@@ -37,10 +40,10 @@ class ExperienceIndexView(AuthenticatedTemplateView):
                     departure_time__gte=settings.PPL_START_DATE, departure_time__lt=settings.PPL_END_DATE
                 )
             ),
-            "night": get_night_experience(log_entries.filter(night=True)),
-            "ir": get_ir_experience(log_entries),
-            "cpl": get_cpl_experience(log_entries),
-            "cri": get_cri_experience(log_entries),
+            "night": get_night_experience(daily_totals.filter(night=True)),
+            "ir": get_ir_experience(daily_totals),
+            "cpl": get_cpl_experience(daily_totals),
+            "cri": get_cri_experience(daily_totals),
         }
 
 
@@ -83,9 +86,10 @@ def get_sep_revalidation_experience(log_entries: LogEntryQuerySet) -> Experience
             "Refresher training with FI or CRI": ExperienceRecord(
                 required=TotalsRecord(time=timedelta(hours=1), landings=0),
                 accrued=compute_totals(
-                    eligible_entries.filter(time_function=FunctionType.DUAL)
-                    .with_durations()
-                    .filter(duration__gte=CURRENCY_REQUIRED_TIME_REFRESHER_SEP)
+                    eligible_entries.filter(
+                        time_function=FunctionType.DUAL,
+                        duration__gte=CURRENCY_REQUIRED_TIME_REFRESHER_SEP.total_seconds(),
+                    )
                 ),
             ),
         },
@@ -123,7 +127,7 @@ def get_ppl_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirements:
     )
 
 
-def get_night_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirements:
+def get_night_experience(log_entries: LogEntryQuerySet | DailyTotalsQuerySet) -> ExperienceRequirements:
     return ExperienceRequirements(
         experience={
             "Solo full-stop landings": ExperienceRecord(
@@ -146,7 +150,7 @@ def get_night_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirement
     )
 
 
-def get_ir_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirements:
+def get_ir_experience(log_entries: LogEntryQuerySet | DailyTotalsQuerySet) -> ExperienceRequirements:
     return ExperienceRequirements(
         experience={
             "Entry: Cross-country PIC hours (powered)": ExperienceRecord(
@@ -177,7 +181,7 @@ def get_ir_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirements:
     )
 
 
-def get_cpl_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirements:
+def get_cpl_experience(log_entries: LogEntryQuerySet | DailyTotalsQuerySet) -> ExperienceRequirements:
     return ExperienceRequirements(
         experience={
             "Entry: PIC hours": ExperienceRecord(
@@ -237,7 +241,7 @@ def get_cpl_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirements:
     )
 
 
-def get_cri_experience(log_entries: LogEntryQuerySet) -> ExperienceRequirements:
+def get_cri_experience(log_entries: LogEntryQuerySet | DailyTotalsQuerySet) -> ExperienceRequirements:
     return ExperienceRequirements(
         experience={
             mark_safe(
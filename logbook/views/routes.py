@@ -0,0 +1,10 @@
+from ..models.log_entry import LogEntry
+from ..statistics.routes import compute_route_statistics
+from .utils import AuthenticatedTemplateView
+
+
+class RoutesIndexView(AuthenticatedTemplateView):
+    template_name = "logbook/routes.html"
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(**kwargs) | {"routes": compute_route_statistics(LogEntry.objects.all())}
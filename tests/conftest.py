@@ -1,7 +1,11 @@
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from django.conf import settings
 
+from logbook.autocomplete import invalidate_aerodrome_prefix_index
+from logbook.choices import invalidate_filter_choices
+from logbook.geo import invalidate_aerodrome_index
 from logbook.models.aerodrome import Aerodrome
 from logbook.models.aircraft import Aircraft, AircraftType
 from logbook.models.log_entry import LogEntry, LogEntryQuerySet
@@ -13,6 +17,32 @@ EXTRA_LANDINGS = 2
 DAYS_IN_THE_PAST = 110
 
 
+def pytest_configure(config):
+    # Keeps the tests out of the file-based cache of the project, before the test databases are set up
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture(autouse=True)
+def process_caches():
+    # The process-wide caches outlive the database of the previous test
+    invalidate_aerodrome_index()
+    invalidate_aerodrome_prefix_index()
+    invalidate_filter_choices()
+
+
+def create_aerodrome(icao_code: str, longitude: float) -> Aerodrome:
+    return Aerodrome.objects.create(
+        name=icao_code,
+        city=icao_code,
+        country="DE",
+        icao_code=icao_code,
+        latitude=0,
+        longitude=longitude,
+        elevation=0,
+        priority=0,
+    )
+
+
 @pytest.fixture
 def log_entries() -> LogEntryQuerySet:
     aircraft = Aircraft.objects.create(
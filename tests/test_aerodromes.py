@@ -0,0 +1,88 @@
+import csv
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from logbook.autocomplete import get_aerodrome_prefix_index
+from logbook.models.aerodrome import Aerodrome
+
+NUMBER_OF_AERODROMES = 546  # Unique ICAO codes
+
+OURAIRPORTS_FIELDS = (
+    "ident",
+    "type",
+    "name",
+    "latitude_deg",
+    "longitude_deg",
+    "elevation_ft",
+    "iso_country",
+    "municipality",
+)
+
+
+def import_aerodromes(*args) -> str:
+    stdout = StringIO()
+    call_command("import_aerodromes", *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_aerodromes(django_assert_max_num_queries):
+    with django_assert_max_num_queries(10):  # SQLite splits the inserts by its variable limit
+        output = import_aerodromes()
+
+    assert f"{NUMBER_OF_AERODROMES} created, 0 updated, 0 unchanged" in output
+
+    aerodrome = Aerodrome.objects.get(icao_code="EDKA")
+    assert aerodrome.country == "DE"
+    assert aerodrome.latitude == Decimal("50.823055")
+
+    Aerodrome.objects.filter(icao_code="EDKA").update(name="Changed")
+
+    assert f"0 created, 1 updated, {NUMBER_OF_AERODROMES - 1} unchanged" in import_aerodromes()
+    assert Aerodrome.objects.get(icao_code="EDKA").name == aerodrome.name
+
+
+@pytest.mark.django_db
+def test_import_aerodromes_invalidates_on_commit(django_capture_on_commit_callbacks):
+    index = get_aerodrome_prefix_index()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        import_aerodromes()
+        assert get_aerodrome_prefix_index() is index  # not invalidated before the import is committed
+
+    assert len(get_aerodrome_prefix_index()) == NUMBER_OF_AERODROMES
+
+
+@pytest.mark.django_db
+def test_import_ourairports(tmp_path):
+    import_aerodromes()
+
+    path = tmp_path / "airports.csv"
+    with path.open("w", newline="") as fp:
+        writer = csv.DictWriter(fp, fieldnames=OURAIRPORTS_FIELDS)
+        writer.writeheader()
+        writer.writerows(
+            [
+                dict(zip(OURAIRPORTS_FIELDS, row))
+                for row in (
+                    ("EDKA", "small_airport", "Aachen Merzbrück", "50.8230555556", "6.1863889", "623", "DE", "Aachen"),
+                    ("KJFK", "large_airport", "John F Kennedy", "40.639447", "-73.779317", "13", "US", "New York"),
+                    ("EDXX", "closed", "Closed", "50", "6", "", "DE", "Nowhere"),
+                    ("DE-0001", "small_airport", "Private", "50", "6", "", "DE", "Somewhere"),
+                )
+            ]
+        )
+
+    assert f"Found suspicious codes: {NUMBER_OF_AERODROMES - 1}" in import_aerodromes("--check-codes", str(path))
+    assert "1 created, 1 updated, 0 unchanged" in import_aerodromes(str(path))
+
+    edka = Aerodrome.objects.get(icao_code="EDKA")
+    assert edka.name == "Aachen Merzbrück"
+    assert edka.latitude == Decimal("50.823056")
+    assert edka.priority == 0
+
+    assert Aerodrome.objects.get(icao_code="KJFK").country == "US"
+    assert not Aerodrome.objects.filter(icao_code="EDXX").exists()
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from logbook import astro
+from logbook.models.aerodrome import Aerodrome, AerodromeAlmanac
+from logbook.views.astro import AerodromeForm, AstroIndexView
+
+ALMANAC_DAYS = 5
+
+
+def test_load_once_shared_across_threads():
+    calls = []
+
+    @astro.load_once
+    def loader():
+        calls.append(None)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: loader(), range(32)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+    loader.reset()
+    assert loader() is not results[0]
+    assert len(calls) == 2
+
+
+def test_timescale_loaded_once():
+    assert astro.get_timescale() is astro.get_timescale()
+
+
+requires_ephemeris = pytest.mark.skipif(not astro.EPHEMERIS_PATH.exists(), reason="Ephemeris file not available")
+
+
+@pytest.fixture
+def aerodrome() -> Aerodrome:
+    return Aerodrome.objects.create(
+        name="Aachen-Merzbrück",
+        city="Aachen",
+        country="DE",
+        icao_code="EDKA",
+        latitude=50.823056,
+        longitude=6.186111,
+        elevation=189,
+        priority=0,
+    )
+
+
+@requires_ephemeris
+@pytest.mark.django_db
+def test_compute_almanac_matches_location_data(aerodrome):
+    start = date(2024, 3, 29)  # Spans the switch to daylight saving time
+    almanac = list(astro.compute_almanac(aerodrome, start, ALMANAC_DAYS))
+
+    assert [day for day, _ in almanac] == [start + timedelta(days=offset) for offset in range(ALMANAC_DAYS)]
+
+    for day, location_data in almanac:
+        assert location_data == astro.compute_location_data(aerodrome, day)
+
+
+@requires_ephemeris
+@pytest.mark.django_db
+def test_compute_almanac_command(aerodrome):
+    call_command("compute_almanac", "edka", "--start=2024-03-29", f"--days={ALMANAC_DAYS}", stdout=StringIO())
+    call_command("compute_almanac", "--start=2024-03-29", f"--days={ALMANAC_DAYS}", stdout=StringIO())
+
+    assert AerodromeAlmanac.objects.filter(aerodrome=aerodrome).count() == ALMANAC_DAYS
+
+    row = AerodromeAlmanac.objects.get(aerodrome=aerodrome, date=date(2024, 3, 31))
+    assert astro.LocationData.from_almanac(row) == astro.compute_location_data(aerodrome, row.date)
+
+
+@pytest.mark.django_db
+def test_astro_view_serves_almanac(aerodrome):
+    midnight = datetime(2024, 6, 21, tzinfo=UTC)
+    row = AerodromeAlmanac.objects.create(
+        aerodrome=aerodrome,
+        date=midnight.date(),
+        timezone="Europe/Berlin",
+        morning_twilight=midnight + timedelta(hours=2),
+        sunrise=midnight + timedelta(hours=3),
+        sunset=midnight + timedelta(hours=19),
+        evening_twilight=midnight + timedelta(hours=20),
+    )
+
+    data = {"date": row.date, "aerodrome": aerodrome.icao_code}
+    view = AstroIndexView()
+    view.setup(RequestFactory().post("/astro/", data))
+
+    form = AerodromeForm(data)
+    assert form.is_valid(), form.errors
+
+    response = view.form_valid(form)
+    assert response.context_data["location_data"] == astro.LocationData.from_almanac(row)
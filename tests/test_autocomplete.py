@@ -0,0 +1,100 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from logbook.autocomplete import (
+    VERSION_CACHE_KEY,
+    AerodromePrefixIndex,
+    AerodromeSuggestion,
+    get_aerodrome_prefix_index,
+)
+from logbook.models.aerodrome import Aerodrome
+
+from .test_aerodromes import import_aerodromes
+
+
+@pytest.fixture
+def aerodromes():
+    import_aerodromes()
+
+
+def search(query: str, **kwargs) -> list[str]:
+    return [suggestion.icao_code for suggestion in get_aerodrome_prefix_index().search(query, **kwargs)]
+
+
+def test_prefix_index_ranking():
+    index = AerodromePrefixIndex(
+        [
+            AerodromeSuggestion(id=1, icao_code="EDKB", name="Bonn-Hangelar", city="Sankt Augustin", priority=20),
+            AerodromeSuggestion(id=2, icao_code="EDKA", name="Edkaville", city="Aachen", priority=30),
+            AerodromeSuggestion(id=3, icao_code="EDLE", name="Essen/Mülheim", city="Essen", priority=10),
+        ]
+    )
+
+    # ICAO code matches come first, then the priority decides
+    assert [suggestion.id for suggestion in index.search("edk")] == [1, 2]
+    assert [suggestion.id for suggestion in index.search("e")] == [3, 1, 2]
+    assert [suggestion.id for suggestion in index.search("MULH")] == [3]
+    assert [suggestion.id for suggestion in index.search("e", limit=1)] == [3]
+    assert index.search(" - ") == []
+
+
+@pytest.mark.django_db
+def test_aerodrome_prefix_index(aerodromes):
+    assert len(get_aerodrome_prefix_index()) == Aerodrome.objects.count()
+
+    assert search("EDKA") == ["EDKA"]
+    assert search("merzbruck") == ["EDKA"]
+    assert search("aachen") == ["EDKA", "EHBK"]
+    assert search("aach maas") == ["EHBK"]
+    assert search("edk", limit=3) == ["EDKA", "EDKV", "EDKL"]
+    assert search("xyzzy") == []
+
+
+@pytest.mark.django_db
+def test_aerodrome_prefix_index_invalidated(aerodromes, django_capture_on_commit_callbacks):
+    assert search("hangelar") == []
+
+    Aerodrome.objects.filter(icao_code="EDKA").update(name="Aachen-Hangelar")  # bypasses the signals
+    assert search("hangelar") == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Aerodrome.objects.get(icao_code="EDKA").save()
+        assert search("hangelar") == []  # not committed yet
+    assert search("hangelar") == ["EDKA"]
+
+
+@pytest.mark.django_db
+def test_aerodrome_prefix_index_invalidated_by_other_process(aerodromes):
+    assert search("hangelar") == []
+
+    Aerodrome.objects.filter(icao_code="EDKA").update(name="Aachen-Hangelar")  # e.g. saved by another process
+    cache.set(VERSION_CACHE_KEY, cache.get(VERSION_CACHE_KEY) + 1, timeout=None)
+
+    assert search("hangelar") == ["EDKA"]
+
+
+@pytest.mark.django_db
+def test_aerodrome_autocomplete_view(aerodromes, admin_client):
+    url = reverse("logbook:aerodrome-autocomplete")
+
+    response = admin_client.get(url, {"q": "aachen", "limit": "1"}, secure=True)
+
+    assert response.status_code == 200
+    (result,) = response.json()["results"]
+    assert result["icao_code"] == "EDKA"
+    assert result["text"] == str(Aerodrome.objects.get(pk=result["id"]))
+
+    assert admin_client.get(url, secure=True).json() == {"results": []}
+
+
+@pytest.mark.django_db
+def test_entries_filter_renders_selected_aerodrome_only(aerodromes, log_entries, admin_client):
+    aerodrome = log_entries.first().from_aerodrome
+
+    response = admin_client.get(reverse("logbook:entries"), {"aerodrome": aerodrome.pk}, secure=True)
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert f'<option value="{aerodrome.pk}" selected>{aerodrome}</option>' in content
+    assert "EDKA" not in content
@@ -0,0 +1,100 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from logbook.choices import VERSION_CACHE_KEY, FilterChoices, get_filter_choices, invalidate_filter_choices
+from logbook.models.aircraft import Aircraft, AircraftType
+
+from .conftest import NUMBER_OF_LOG_ENTRIES, create_aerodrome
+from .test_aerodromes import import_aerodromes
+
+
+@pytest.mark.django_db
+def test_filter_choices(log_entries, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        choices = get_filter_choices()
+
+    assert choices.registrations == [("TEST", "TEST")]
+    assert choices.aerodromes == {log_entries.first().from_aerodrome_id}
+
+    with django_assert_num_queries(0):
+        assert get_filter_choices() is choices
+
+
+@pytest.mark.django_db
+def test_filter_choices_invalidated(log_entries, django_capture_on_commit_callbacks):
+    aerodrome = create_aerodrome("OTHR", longitude=1)
+    glider = Aircraft.objects.create(
+        type=AircraftType.GLD, maker="Test", model="Test", icao_designator="GLID", registration="D-1234"
+    )
+    get_filter_choices()
+
+    log_entries.filter(pk=1).update(to_aerodrome=aerodrome, aircraft=glider)  # bypasses the signals
+    assert aerodrome.pk not in get_filter_choices().aerodromes
+
+    entry = log_entries.get(pk=1)
+    with django_capture_on_commit_callbacks(execute=True):
+        entry.save()
+        assert aerodrome.pk not in get_filter_choices().aerodromes  # not committed yet
+    assert aerodrome.pk in get_filter_choices().aerodromes
+    assert get_filter_choices().registrations == [("D-1234", "D-1234"), ("TEST", "TEST")]
+
+    glider.registration = "D-4321"
+    with django_capture_on_commit_callbacks(execute=True):
+        glider.save()
+    assert get_filter_choices().registrations == [("D-4321", "D-4321"), ("TEST", "TEST")]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        entry.delete()
+    assert aerodrome.pk not in get_filter_choices().aerodromes
+
+
+@pytest.mark.django_db
+def test_filter_choices_stale_computation_discarded(log_entries, monkeypatch):
+    compute = FilterChoices.from_database
+
+    def compute_and_invalidate():
+        computed = compute()
+        invalidate_filter_choices()  # e.g. a write in another thread
+        return computed
+
+    monkeypatch.setattr(FilterChoices, "from_database", compute_and_invalidate)
+    stale = get_filter_choices()
+
+    monkeypatch.setattr(FilterChoices, "from_database", compute)
+    assert get_filter_choices() is not stale
+
+
+@pytest.mark.django_db
+def test_filter_choices_version_shared(log_entries):
+    choices = get_filter_choices()
+
+    cache.set(VERSION_CACHE_KEY, cache.get(VERSION_CACHE_KEY) + 1, timeout=None)  # e.g. a write in another process
+    assert get_filter_choices() is not choices
+
+    choices = get_filter_choices()
+    cache.delete(VERSION_CACHE_KEY)
+    assert get_filter_choices() is not choices
+
+
+@pytest.mark.django_db
+def test_entries_filtered_by_registration(log_entries, admin_client):
+    response = admin_client.get(reverse("logbook:entries"), {"registration": "TEST"}, secure=True)
+
+    assert response.status_code == 200
+    assert len(response.context["object_list"]) == NUMBER_OF_LOG_ENTRIES
+
+    response = admin_client.get(reverse("logbook:entries"), {"registration": "D-1234"}, secure=True)
+    assert response.context["filter"].errors
+
+
+@pytest.mark.django_db
+def test_autocomplete_logbook_aerodromes_only(log_entries, admin_client):
+    import_aerodromes()
+    url = reverse("logbook:aerodrome-autocomplete")
+
+    assert admin_client.get(url, {"q": "aachen"}, secure=True).json()["results"]
+    assert admin_client.get(url, {"q": "aachen", "logbook": "1"}, secure=True).json()["results"] == []
+
+    (result,) = admin_client.get(url, {"q": "test", "logbook": "1"}, secure=True).json()["results"]
+    assert result["icao_code"] == "TEST"
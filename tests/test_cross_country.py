@@ -0,0 +1,88 @@
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from logbook.classifiers.cross_country import apply_cross_country_classification, classify_cross_country
+from logbook.models.daily_totals import DailyTotals
+from logbook.models.log_entry import FunctionType, LogEntry
+
+from .conftest import create_aerodrome
+
+
+@pytest.fixture
+def cross_country_log_entries(log_entries):
+    far = create_aerodrome("FARR", longitude=1)  # 60 NM east of the test aerodrome
+    near = create_aerodrome("NEAR", longitude=0.2)  # 12 NM east of the test aerodrome
+
+    for pk, to_aerodrome, time_function, cross_country in (
+        (1, far, FunctionType.PIC, False),
+        (2, near, FunctionType.PIC, False),
+        (3, far, FunctionType.DUAL, False),
+        (4, near, FunctionType.PIC, True),
+    ):
+        log_entries.filter(pk=pk).update(
+            to_aerodrome=to_aerodrome, time_function=time_function, cross_country=cross_country
+        )
+
+    DailyTotals.rebuild()
+    return LogEntry.objects.filter(pk__in=[1, 2, 3, 4]).order_by("pk")
+
+
+@pytest.mark.django_db
+def test_classify_cross_country(cross_country_log_entries):
+    classifications = classify_cross_country(cross_country_log_entries)
+
+    assert [round(classification.distance) for classification in classifications] == [60, 12, 60, 12]
+    assert [classification.cross_country for classification in classifications] == [True, False, False, False]
+    assert [classification.changed for classification in classifications] == [True, False, False, False]
+
+    classifications = classify_cross_country(cross_country_log_entries, threshold=10)
+    assert [classification.changed for classification in classifications] == [True, True, False, False]
+
+
+@pytest.mark.django_db
+def test_apply_cross_country_classification(cross_country_log_entries):
+    updated = apply_cross_country_classification(classify_cross_country(cross_country_log_entries))
+
+    assert [entry.pk for entry in updated] == [1]
+    assert list(cross_country_log_entries.values_list("cross_country", flat=True)) == [True, False, False, True]
+
+    rollup = DailyTotals.objects.filter(cross_country=True).values_list("entries", flat=True)
+    assert sum(rollup) == LogEntry.objects.filter(cross_country=True).count()
+
+
+@pytest.mark.django_db
+def test_apply_cross_country_classification_local_days(cross_country_log_entries):
+    def rollup_rows() -> list[tuple]:
+        return list(DailyTotals.objects.order_by("day", "cross_country").values_list("day", "cross_country", "entries"))
+
+    # Departing at 12:00 UTC, entry 1 is promoted on the next day on Kiritimati (UTC+14)
+    departure_time = datetime(2024, 1, 10, 12, tzinfo=UTC)
+    cross_country_log_entries.filter(pk=1).update(
+        departure_time=departure_time, arrival_time=departure_time + timedelta(hours=1)
+    )
+
+    with timezone.override("Pacific/Kiritimati"):
+        DailyTotals.rebuild()
+        apply_cross_country_classification(classify_cross_country(cross_country_log_entries))
+        rows = rollup_rows()
+
+        DailyTotals.rebuild()
+        assert rollup_rows() == rows
+
+
+@pytest.mark.django_db
+def test_classify_cross_country_command(cross_country_log_entries):
+    stdout = StringIO()
+    call_command("classify_cross_country", "--distance=10", "--dry-run", stdout=stdout)
+
+    assert "(12.0 NM)" in stdout.getvalue()
+    assert "2 of 30 entries would change" in stdout.getvalue()
+    assert list(cross_country_log_entries.values_list("cross_country", flat=True)) == [False, False, False, True]
+
+    call_command("classify_cross_country", stdout=StringIO())
+
+    assert list(cross_country_log_entries.values_list("cross_country", flat=True)) == [True, False, False, True]
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+
+from logbook.models.daily_totals import DailyTotals
+from logbook.models.log_entry import FunctionType, LogEntry
+from logbook.statistics.experience import compute_totals
+
+from .conftest import NUMBER_OF_LOG_ENTRIES
+
+
+def assert_rollup_matches_entries():
+    entries = LogEntry.objects.all()
+    rollup = DailyTotals.objects.all()
+
+    assert compute_totals(rollup) == compute_totals(entries)
+    assert compute_totals(rollup, full_stop=True) == compute_totals(entries, full_stop=True)
+
+    for function in FunctionType:
+        assert compute_totals(rollup.filter(time_function=function)) == compute_totals(
+            entries.filter(time_function=function)
+        )
+
+    assert compute_totals(rollup.filter(night=True)) == compute_totals(entries.filter(night=True))
+
+
+@pytest.mark.django_db
+def test_daily_totals_created(log_entries):
+    assert DailyTotals.objects.count() == NUMBER_OF_LOG_ENTRIES
+    assert_rollup_matches_entries()
+
+
+@pytest.mark.django_db
+def test_daily_totals_updated(log_entries):
+    entry = log_entries.get(pk=2)
+    entry.time_function = FunctionType.PIC
+    entry.night = True
+    entry.save()
+
+    moved_entry = log_entries.get(pk=4)
+    moved_entry.departure_time -= timedelta(days=1)
+    moved_entry.arrival_time -= timedelta(days=1)
+    moved_entry.save()
+
+    assert DailyTotals.objects.count() == NUMBER_OF_LOG_ENTRIES - 1
+    assert_rollup_matches_entries()
+
+
+@pytest.mark.django_db
+def test_daily_totals_deleted(log_entries):
+    log_entries.get(pk=1).delete()
+
+    assert DailyTotals.objects.count() == NUMBER_OF_LOG_ENTRIES - 1
+    assert_rollup_matches_entries()
+
+
+@pytest.mark.django_db
+def test_rebuild_daily_totals_command(log_entries):
+    log_entries.update(time_function=FunctionType.DUAL)  # bypasses signals
+    assert compute_totals(DailyTotals.objects.filter(time_function=FunctionType.DUAL)).landings == 0
+
+    call_command("rebuild_daily_totals", stdout=None)
+
+    assert DailyTotals.objects.count() == NUMBER_OF_LOG_ENTRIES
+    assert_rollup_matches_entries()
@@ -0,0 +1,88 @@
+from itertools import chain
+
+import pytest
+from django.core.paginator import Paginator
+from django.urls import reverse
+
+from logbook.models.log_entry import LogEntry
+from logbook.views.entries import LogEntrySlots
+
+PAGE_SIZE = 7
+
+
+@pytest.fixture
+def slotted_log_entries(log_entries):
+    log_entries.filter(pk__in=[3, 9]).update(slots=3)
+    log_entries.filter(pk=14).update(slots=9)
+    return LogEntry.objects.order_by("arrival_time")
+
+
+@pytest.mark.django_db
+def test_log_entry_slots_pages(slotted_log_entries):
+    expected_slots = tuple(
+        chain.from_iterable([entry] + [None] * (entry.slots - 1) for entry in slotted_log_entries),
+    )
+    expected_paginator = Paginator(expected_slots, PAGE_SIZE)
+    paginator = Paginator(LogEntrySlots(slotted_log_entries, "arrival_time"), PAGE_SIZE)
+
+    assert paginator.count == len(expected_slots)
+    assert paginator.num_pages == expected_paginator.num_pages
+
+    for number in paginator.page_range:
+        assert list(paginator.page(number).object_list) == list(expected_paginator.page(number).object_list)
+
+
+@pytest.mark.django_db
+def test_log_entry_slots_indexing(slotted_log_entries):
+    slots = LogEntrySlots(slotted_log_entries, "arrival_time")
+
+    assert slots[0] == slotted_log_entries.first()
+    assert slots[-1] == slotted_log_entries.last()
+    assert slots[3] is None
+
+    with pytest.raises(IndexError):
+        slots[len(slots)]
+
+
+@pytest.mark.django_db
+def test_log_entry_slots_query_count(slotted_log_entries, django_assert_num_queries):
+    paginator = Paginator(LogEntrySlots(slotted_log_entries, "arrival_time"), PAGE_SIZE)
+
+    with django_assert_num_queries(2):
+        page = paginator.page(paginator.num_pages)
+        assert all(entry.aircraft.registration for entry in page.object_list if entry is not None)
+
+
+@pytest.mark.django_db
+def test_log_entry_slots_empty():
+    paginator = Paginator(LogEntrySlots(LogEntry.objects.all(), "arrival_time"), PAGE_SIZE)
+
+    assert paginator.num_pages == 1
+    assert list(paginator.page(1).object_list) == []
+
+
+@pytest.mark.django_db
+def test_log_entry_slots_occupant(slotted_log_entries):
+    slots = LogEntrySlots(slotted_log_entries, "arrival_time")
+
+    assert slots.occupant(0) == slotted_log_entries.first()
+    assert slots.occupant(3) == slots.occupant(4) == slotted_log_entries.get(pk=3)
+
+    with pytest.raises(IndexError):
+        slots.occupant(len(slots))
+
+
+@pytest.mark.django_db
+def test_entries_page_of_placeholders(slotted_log_entries, admin_client):
+    # Entry 14 starts in slot 17, so the fourth page (slots 21 to 27) only holds its placeholders
+    slotted_log_entries.filter(pk=14).update(slots=16)
+    response = admin_client.get(reverse("logbook:entries"), {"page": 4}, secure=True)
+
+    assert response.status_code == 200
+    assert not any(response.context["object_list"])
+
+    entry = slotted_log_entries.get(pk=14)
+    assert response.context["brought_forward"] == response.context["carried_forward"]
+    assert response.context["carried_forward"].landings == sum(
+        slotted_log_entries.filter(arrival_time__lte=entry.arrival_time).values_list("landings", flat=True)
+    )
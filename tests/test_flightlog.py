@@ -0,0 +1,231 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from logbook.importers.flightlog import Fields
+from logbook.models.aerodrome import Aerodrome
+from logbook.models.aircraft import Aircraft, AircraftType
+from logbook.models.daily_totals import DailyTotals
+from logbook.models.import_job import ImportJob
+from logbook.models.log_entry import FunctionType, LaunchType, LogEntry
+from logbook.models.pilot import Pilot
+
+NUMBER_OF_ROWS = 20
+
+
+def make_row(day: int, registration: str = "D-EFGH", pic: bool = True, note: str = "", **kwargs) -> dict[str, str]:
+    return {
+        Fields.DATE: f"{day:02}/03/2024",
+        Fields.REGISTRATION: registration,
+        Fields.FROM: "EDKA",
+        Fields.TO: "EDKB",
+        Fields.TOTAL_TIME: "1:00",
+        Fields.TIME_PIC: "60:00" if pic else "0:00",
+        Fields.TIME_DUAL: "0:00" if pic else "60:00",
+        Fields.LANDINGS: "1",
+        Fields.COPILOT: "Copilot",
+        Fields.DEPARTURE_TIME: "10:00",
+        Fields.ARRIVAL_TIME: "11:00",
+        Fields.NOTE: note,
+    } | kwargs
+
+
+def write_csv(path, rows):
+    with path.open("w", newline="") as fp:
+        writer = csv.DictWriter(fp, fieldnames=list(Fields))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+@pytest.fixture
+def flightlog_setup():
+    Aircraft.objects.create(type=AircraftType.SEP, maker="M", model="M", icao_designator="M", registration="D-EFGH")
+    Aircraft.objects.create(type=AircraftType.GLD, maker="G", model="G", icao_designator="G", registration="D-1234")
+
+    for icao_code in ("EDKA", "EDKB"):
+        Aerodrome.objects.create(
+            name=icao_code,
+            city=icao_code,
+            country="DE",
+            icao_code=icao_code,
+            latitude=50,
+            longitude=6,
+            elevation=0,
+            priority=0,
+        )
+
+    Pilot.objects.create(first_name="Yury", last_name="Zaytsev")
+    Pilot.objects.create(first_name="Test", last_name="Copilot")
+
+
+@pytest.fixture
+def flightlog_csv(tmp_path, flightlog_setup):
+    rows = [make_row(day, pic=day % 2 == 0) for day in range(1, NUMBER_OF_ROWS)]
+    rows.append(make_row(NUMBER_OF_ROWS, registration="D-1234", note="Winch"))
+    return write_csv(tmp_path / "flightlog.csv", rows)
+
+
+def import_flightlog(path, *args) -> str:
+    stdout = StringIO()
+    call_command("import_flightlog", str(path), *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+def entry_values():
+    return list(
+        LogEntry.objects.order_by("departure_time").values(*(field.name for field in LogEntry._meta.fields[1:]))
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_import_matches_row_import(flightlog_csv):
+    import_flightlog(flightlog_csv)
+    expected = entry_values()
+    LogEntry.objects.all().delete()
+
+    assert "rows/s" in import_flightlog(flightlog_csv, "--bulk", "--batch-size=7")
+    assert entry_values() == expected
+
+    glider_entry = LogEntry.objects.get(aircraft__registration="D-1234")
+    assert glider_entry.launch_type == LaunchType.WINCH
+    assert glider_entry.remarks == ""
+
+    dual_entry = LogEntry.objects.filter(time_function=FunctionType.DUAL).first()
+    assert dual_entry.pilot.last_name == "Copilot"
+
+    assert sum(DailyTotals.objects.values_list("entries", flat=True)) == NUMBER_OF_ROWS
+
+
+@pytest.mark.django_db
+def test_bulk_import_daily_totals_local_days(flightlog_csv):
+    # The entries depart at 10:00 UTC, which is already the next day on Kiritimati (UTC+14)
+    with timezone.override("Pacific/Kiritimati"):
+        import_flightlog(flightlog_csv, "--bulk")
+        rows = list(DailyTotals.objects.order_by("day").values_list("day", "entries"))
+
+        DailyTotals.rebuild()
+        assert list(DailyTotals.objects.order_by("day").values_list("day", "entries")) == rows
+
+
+@pytest.mark.django_db
+def test_bulk_import_updates_existing_entries(flightlog_csv, tmp_path):
+    import_flightlog(flightlog_csv, "--bulk")
+
+    updated_csv = write_csv(tmp_path / "updated.csv", [make_row(1, Landings="3")])
+    import_flightlog(updated_csv, "--bulk")
+
+    assert LogEntry.objects.count() == NUMBER_OF_ROWS
+    assert LogEntry.objects.get(departure_time__day=1).landings == 3
+
+
+@pytest.mark.django_db
+def test_bulk_import_init(flightlog_csv, django_assert_max_num_queries):
+    import_flightlog(flightlog_csv, "--bulk")
+    job = ImportJob.objects.create(flight_id=1, log_entry=LogEntry.objects.first())
+
+    # The entries are deleted at once, not one by one with their signals
+    with django_assert_max_num_queries(NUMBER_OF_ROWS):
+        import_flightlog(flightlog_csv, "--bulk", "--init")
+
+    assert LogEntry.objects.count() == NUMBER_OF_ROWS
+    assert sum(DailyTotals.objects.values_list("entries", flat=True)) == NUMBER_OF_ROWS
+    job.refresh_from_db()
+    assert job.log_entry is None
+
+
+@pytest.mark.django_db
+def test_bulk_import_invalid_rows(flightlog_setup, tmp_path):
+    rows = [make_row(1), make_row(2, registration="D-XXXX"), make_row(3, **{Fields.ARRIVAL_TIME: "10:30"})]
+    invalid_csv = write_csv(tmp_path / "invalid.csv", rows)
+
+    stderr = StringIO()
+    with pytest.raises(CommandError, match="2 invalid rows"):
+        call_command("import_flightlog", str(invalid_csv), "--bulk", stdout=StringIO(), stderr=stderr)
+
+    assert "Row 2: Aircraft 'D-XXXX' not found" in stderr.getvalue()
+    assert not LogEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_incremental_import(flightlog_csv, tmp_path, django_assert_max_num_queries):
+    import_flightlog(flightlog_csv, "--bulk")
+    LogEntry.objects.filter(departure_time__day=NUMBER_OF_ROWS - 1).delete()
+
+    rows = [make_row(day, pic=day % 2 == 0) for day in range(2, NUMBER_OF_ROWS)]
+    rows[0] = make_row(2, pic=True, Landings="2")
+    rows.append(make_row(NUMBER_OF_ROWS + 1))
+    updated_csv = write_csv(tmp_path / "updated.csv", rows)
+
+    output = import_flightlog(updated_csv, "--incremental", "--dry-run")
+    assert "2 new, 1 changed, 16 unchanged, 2 missing from CSV" in output
+    assert output.count("\n+ ") == 2
+    assert output.count("\n~ ") == 1
+    assert output.count("\n- ") == 2
+    assert LogEntry.objects.count() == NUMBER_OF_ROWS - 1
+
+    import_flightlog(updated_csv, "--incremental")
+    assert LogEntry.objects.count() == NUMBER_OF_ROWS + 1
+    assert LogEntry.objects.get(departure_time__day=2).landings == 2
+
+    with django_assert_max_num_queries(10):
+        assert "0 new, 0 changed, 19 unchanged, 2 missing from CSV" in import_flightlog(updated_csv, "--incremental")
+
+
+@pytest.mark.django_db
+def test_incremental_import_changed_aerodrome(flightlog_csv, tmp_path):
+    import_flightlog(flightlog_csv, "--bulk")
+
+    rows = [make_row(day, pic=day % 2 == 0) for day in range(1, NUMBER_OF_ROWS)]
+    rows.append(make_row(NUMBER_OF_ROWS, registration="D-1234", note="Winch", From="EDKB"))
+    updated_csv = write_csv(tmp_path / "updated.csv", rows)
+
+    # The entry is updated in place, as the dry run reports
+    assert "0 new, 1 changed, 19 unchanged, 0 missing from CSV" in import_flightlog(
+        updated_csv, "--incremental", "--dry-run"
+    )
+
+    import_flightlog(updated_csv, "--incremental")
+    assert LogEntry.objects.count() == NUMBER_OF_ROWS
+    assert LogEntry.objects.filter(from_aerodrome__icao_code="EDKB").count() == 1
+
+
+@pytest.mark.django_db
+def test_dry_run_requires_incremental(flightlog_csv):
+    with pytest.raises(CommandError):
+        import_flightlog(flightlog_csv, "--dry-run")
+
+
+@pytest.mark.django_db
+def test_stream_import_matches_bulk_import(flightlog_csv):
+    import_flightlog(flightlog_csv, "--bulk")
+    expected = entry_values()
+    LogEntry.objects.all().delete()
+
+    assert "rows/s" in import_flightlog(flightlog_csv, "--stream", "--batch-size=3")
+    assert entry_values() == expected
+    assert not flightlog_csv.with_name(flightlog_csv.name + ".checkpoint").exists()
+
+
+@pytest.mark.django_db
+def test_stream_import_resume(flightlog_setup, tmp_path):
+    rows = [make_row(day, note="Multi-line\nremark" if day == 3 else "") for day in range(1, NUMBER_OF_ROWS + 1)]
+    rows[11] = make_row(12, registration="D-XXXX")
+    path = write_csv(tmp_path / "flightlog.csv", rows)
+
+    with pytest.raises(CommandError, match="Row 12: Aircraft 'D-XXXX' not found, rows up to 10 were imported"):
+        import_flightlog(path, "--stream", "--batch-size=5")
+
+    assert LogEntry.objects.count() == 10
+    assert LogEntry.objects.get(departure_time__day=3).remarks == "Multi-line\nremark"
+
+    rows[11] = make_row(12, registration="D-EFGH")
+    write_csv(path, rows)
+
+    assert "Resuming after row 10" in import_flightlog(path, "--stream", "--resume", "--batch-size=5")
+    assert sorted(LogEntry.objects.values_list("departure_time__day", flat=True)) == list(range(1, NUMBER_OF_ROWS + 1))
+    assert sum(DailyTotals.objects.values_list("entries", flat=True)) == NUMBER_OF_ROWS
@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from logbook.geo import (
+    EARTH_RADIUS_NM,
+    VERSION_CACHE_KEY,
+    KDTree,
+    chord_to_distance,
+    distance_to_chord,
+    get_aerodrome_index,
+    haversine,
+    unit_vectors,
+)
+from logbook.models.aerodrome import Aerodrome
+
+
+@pytest.fixture
+def aerodromes():
+    call_command("import_aerodromes", stdout=None)
+
+
+@pytest.fixture
+def sphere_points() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, 5000)))
+    longitudes = rng.uniform(-180, 180, 5000)
+    return unit_vectors(latitudes, longitudes)
+
+
+def test_haversine():
+    assert haversine(0, 0, 0, 1) == pytest.approx(2 * math.pi * EARTH_RADIUS_NM / 360)
+    assert haversine(50, 6, 50, 6) == 0
+
+    half_circumference = math.pi * EARTH_RADIUS_NM
+    distances = haversine([0, 0, 90], [0, 0, 0], [0, 0, -90], [1, 180, 0])
+    assert list(distances) == pytest.approx([half_circumference / 180, half_circumference, half_circumference])
+
+
+def test_chord_distance_round_trip():
+    assert chord_to_distance(distance_to_chord(27)) == pytest.approx(27)
+
+
+def test_kd_tree_nearest(sphere_points):
+    tree = KDTree(sphere_points)
+
+    for point in sphere_points[:50] + 0.01:
+        distances = np.sqrt(((sphere_points - point) ** 2).sum(axis=1))
+        indices, tree_distances = tree.nearest(point, k=7)
+
+        assert list(indices) == list(np.argsort(distances)[:7])
+        assert tree_distances == pytest.approx(np.sort(distances)[:7])
+
+
+def test_kd_tree_within(sphere_points):
+    tree = KDTree(sphere_points)
+    radius = distance_to_chord(300)
+
+    for point in sphere_points[:50]:
+        distances = np.sqrt(((sphere_points - point) ** 2).sum(axis=1))
+        indices, _ = tree.within(point, radius)
+
+        assert sorted(indices) == sorted(np.nonzero(distances <= radius)[0])
+
+
+def test_kd_tree_empty():
+    tree = KDTree(np.empty((0, 3)))
+
+    assert len(tree.nearest(np.array([1.0, 0, 0]), k=3)[0]) == 0
+    assert len(tree.within(np.array([1.0, 0, 0]), 1)[0]) == 0
+
+
+@pytest.mark.django_db
+def test_aerodrome_index(aerodromes):
+    index = get_aerodrome_index()
+    edka = Aerodrome.objects.get(icao_code="EDKA")
+
+    nearest = index.nearest(float(edka.latitude), float(edka.longitude), k=3)
+    assert nearest[0].icao_code == "EDKA"
+    assert nearest[0].distance == pytest.approx(0, abs=1e-6)
+    assert nearest[1].distance <= nearest[2].distance
+
+    within = index.within(float(edka.latitude), float(edka.longitude), radius=30)
+    assert [neighbour.icao_code for neighbour in within[:3]] == [neighbour.icao_code for neighbour in nearest]
+    assert all(neighbour.distance <= 30 for neighbour in within)
+
+    edln = Aerodrome.objects.get(icao_code="EDLN")
+    expected = haversine(edka.latitude, edka.longitude, edln.latitude, edln.longitude)
+    assert index.distance(edka.pk, edln.pk) == pytest.approx(expected)
+    assert list(index.distances([(edka.pk, edln.pk), (edln.pk, edln.pk)])) == pytest.approx([expected, 0])
+
+
+@pytest.mark.django_db
+def test_aerodrome_index_invalidated(aerodromes, django_capture_on_commit_callbacks):
+    index = get_aerodrome_index()
+    assert get_aerodrome_index() is index
+
+    edka = Aerodrome.objects.get(icao_code="EDKA")
+    edka.latitude, edka.longitude = -45, 170
+    with django_capture_on_commit_callbacks(execute=True):
+        edka.save()
+        assert get_aerodrome_index() is index  # not committed yet
+
+    assert get_aerodrome_index() is not index
+    assert get_aerodrome_index().nearest(-45, 170)[0].icao_code == "EDKA"
+
+
+@pytest.mark.django_db
+def test_aerodrome_index_invalidated_by_other_process(aerodromes):
+    index = get_aerodrome_index()
+
+    Aerodrome.objects.filter(icao_code="EDKA").update(latitude=-45, longitude=170)  # e.g. saved by another process
+    cache.set(VERSION_CACHE_KEY, cache.get(VERSION_CACHE_KEY) + 1, timeout=None)
+
+    assert get_aerodrome_index() is not index
+    assert get_aerodrome_index().nearest(-45, 170)[0].icao_code == "EDKA"
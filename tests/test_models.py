@@ -1,7 +1,9 @@
 from datetime import UTC, datetime, timedelta
 
 import pytest
+from django.db import connection
 
+from logbook.models.log_entry import LogEntry
 from logbook.models.pilot import Certificate
 
 
@@ -23,3 +25,18 @@ def test_certificate_valid():
 
     certificate_new.valid_until = (datetime.now(tz=UTC) - timedelta(days=1)).date()
     assert not certificate_new.valid
+
+
+@pytest.mark.django_db
+def test_log_entry_duration(log_entries):
+    entry = log_entries.get(pk=1)
+    assert LogEntry.objects.values_list("duration", flat=True).get(pk=entry.pk) == 60
+
+    # The generated column only uses native SQL, so the table stays writable without Django's connection functions
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = %s", [LogEntry._meta.db_table])
+        (schema,) = cursor.fetchone()
+    assert "django_" not in schema
+
+    LogEntry.objects.filter(pk=entry.pk).update(arrival_time=entry.departure_time + timedelta(hours=1, seconds=1))
+    assert LogEntry.objects.values_list("duration", flat=True).get(pk=entry.pk) == 3601
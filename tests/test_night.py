@@ -0,0 +1,95 @@
+from datetime import UTC, date, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from logbook import astro
+from logbook.classifiers.night import apply_night_classification, classify_night
+from logbook.models.aerodrome import AerodromeAlmanac
+from logbook.models.daily_totals import DailyTotals
+from logbook.models.log_entry import LogEntry
+
+pytestmark = pytest.mark.skipif(not astro.EPHEMERIS_PATH.exists(), reason="Ephemeris file not available")
+
+DAY = date(2024, 1, 10)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return datetime(DAY.year, DAY.month, DAY.day, hour, minute, tzinfo=UTC)
+
+
+@pytest.fixture
+def night_log_entries(log_entries):
+    # The test aerodrome is on the equator at the prime meridian, so the night is roughly from 18:30 to 05:45 UTC
+    for pk, departure_time, arrival_time, night in (
+        (1, at(20), at(21), False),
+        (2, at(12), at(13), True),
+        (3, at(5, 30), at(6, 30), False),
+        (4, at(23, 30), at(23, 30) + timedelta(hours=8), False),
+    ):
+        log_entries.filter(pk=pk).update(departure_time=departure_time, arrival_time=arrival_time, night=night)
+
+    DailyTotals.rebuild()
+    return LogEntry.objects.filter(pk__in=[1, 2, 3, 4]).order_by("pk")
+
+
+@pytest.mark.django_db
+def test_classify_night(night_log_entries):
+    aerodrome = night_log_entries.first().from_aerodrome
+    dawn = astro.compute_location_data(aerodrome, DAY).morning_twilight
+    next_dawn = astro.compute_location_data(aerodrome, DAY + timedelta(days=1)).morning_twilight
+
+    classifications = {classification.entry.pk: classification for classification in classify_night(night_log_entries)}
+
+    assert classifications[1].night_time == timedelta(hours=1)
+    assert classifications[2].night_time == timedelta()
+    assert classifications[3].night_time == dawn - at(5, 30)
+    assert classifications[4].night_time == next_dawn - at(23, 30)
+
+    assert [classifications[pk].night for pk in (1, 2, 3, 4)] == [True, False, True, True]
+    assert all(classification.changed for classification in classifications.values())
+
+    assert AerodromeAlmanac.objects.filter(aerodrome=aerodrome).exists()
+
+
+@pytest.mark.django_db
+def test_apply_night_classification(night_log_entries):
+    updated = apply_night_classification(classify_night(night_log_entries))
+
+    assert len(updated) == 4
+    assert list(night_log_entries.values_list("night", flat=True)) == [True, False, True, True]
+
+    rollup = DailyTotals.objects.filter(night=True).values_list("entries", flat=True)
+    assert sum(rollup) == LogEntry.objects.filter(night=True).count()
+
+
+def rollup_rows() -> list[tuple]:
+    return list(DailyTotals.objects.order_by("day", "night").values_list("day", "night", "entries"))
+
+
+@pytest.mark.django_db
+def test_apply_night_classification_local_days(night_log_entries):
+    # Entry 4 departs at 23:30 UTC, which is already the next day in New Zealand
+    with timezone.override("Pacific/Auckland"):
+        DailyTotals.rebuild()
+        apply_night_classification(classify_night(night_log_entries))
+        rows = rollup_rows()
+
+        DailyTotals.rebuild()
+        assert rollup_rows() == rows
+
+
+@pytest.mark.django_db
+def test_classify_night_command(night_log_entries):
+    stdout = StringIO()
+    call_command("classify_night", "--since=2024-01-01", "--until=2024-02-01", "--dry-run", stdout=stdout)
+
+    assert "4 of 4 entries would change" in stdout.getvalue()
+    assert list(night_log_entries.values_list("night", flat=True)) == [False, True, False, False]
+    assert not AerodromeAlmanac.objects.exists()
+
+    call_command("classify_night", "--since=2024-01-01", "--until=2024-02-01", stdout=StringIO())
+
+    assert list(night_log_entries.values_list("night", flat=True)) == [True, False, True, True]
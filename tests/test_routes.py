@@ -0,0 +1,85 @@
+import pytest
+from django.urls import reverse
+
+from logbook.geo import get_aerodrome_index
+from logbook.models.aerodrome import Aerodrome, AerodromeDistance
+from logbook.models.aircraft import Aircraft, AircraftType
+from logbook.models.log_entry import LogEntry
+from logbook.statistics.routes import compute_route_statistics
+
+from .conftest import NUMBER_OF_LOG_ENTRIES, create_aerodrome
+
+
+@pytest.fixture
+def route_log_entries(log_entries):
+    home = log_entries.first().from_aerodrome
+    far = create_aerodrome("FARR", longitude=1)  # 60 NM east
+    near = create_aerodrome("NEAR", longitude=0.5)  # 30 NM east
+    glider = Aircraft.objects.create(
+        type=AircraftType.GLD, maker="Test", model="Test", icao_designator="GLID", registration="D-1234"
+    )
+
+    log_entries.filter(pk__in=[1, 2]).update(to_aerodrome=far)
+    log_entries.filter(pk=3).update(from_aerodrome=far)  # the same route in the other direction
+    log_entries.filter(pk=4).update(from_aerodrome=near, to_aerodrome=far, aircraft=glider)
+
+    return {"home": home, "far": far, "near": near, "glider": glider}
+
+
+@pytest.mark.django_db
+def test_compute_route_statistics(route_log_entries):
+    statistics = compute_route_statistics(LogEntry.objects.all())
+
+    assert statistics.flights == NUMBER_OF_LOG_ENTRIES
+    assert statistics.distance == pytest.approx(3 * 60 + 30, rel=0.01)
+
+    assert [(item.aircraft.registration, item.flights) for item in statistics.per_aircraft] == [
+        ("TEST", NUMBER_OF_LOG_ENTRIES - 1),
+        ("D-1234", 1),
+    ]
+    assert [round(item.distance) for item in statistics.per_aircraft] == [180, 30]
+
+    home, far, near = (route_log_entries[key] for key in ("home", "far", "near"))
+    assert [(route.aerodromes, route.flights) for route in statistics.most_frequent] == [
+        ((home, home), NUMBER_OF_LOG_ENTRIES - 4),
+        ((home, far), 3),
+        ((far, near), 1),
+    ]
+    assert [route.aerodromes for route in statistics.farthest] == [(home, far), (far, near), (home, home)]
+    assert statistics.farthest[0].total_distance == pytest.approx(3 * statistics.farthest[0].distance)
+
+
+@pytest.mark.django_db
+def test_route_distances_stored(route_log_entries, django_assert_num_queries):
+    compute_route_statistics(LogEntry.objects.all())
+    assert AerodromeDistance.objects.count() == 3
+
+    # The grouped entries, the stored distances, and the aerodromes and aircraft of the result
+    with django_assert_num_queries(4):
+        compute_route_statistics(LogEntry.objects.all())
+
+    far = route_log_entries["far"]
+    far.longitude = 2
+    far.save()
+
+    assert AerodromeDistance.objects.count() == 1
+    assert compute_route_statistics(LogEntry.objects.all()).distance == pytest.approx(3 * 120 + 90, rel=0.01)
+
+
+@pytest.mark.django_db
+def test_route_distances_computed_from_database(route_log_entries):
+    get_aerodrome_index()
+
+    # Saved by another process, whose signals removed the stored distances, but not the index of this process
+    Aerodrome.objects.filter(pk=route_log_entries["far"].pk).update(longitude=2)
+    AerodromeDistance.objects.all().delete()
+
+    assert compute_route_statistics(LogEntry.objects.all()).distance == pytest.approx(3 * 120 + 90, rel=0.01)
+
+
+@pytest.mark.django_db
+def test_routes_view(route_log_entries, admin_client):
+    response = admin_client.get(reverse("logbook:routes"), secure=True)
+
+    assert response.status_code == 200
+    assert "FARR" in response.content.decode()
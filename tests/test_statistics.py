@@ -2,8 +2,9 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 
+from logbook.models.aircraft import Aircraft
 from logbook.models.log_entry import LogEntry
-from logbook.statistics.currency import CurrencyStatus, get_rolling_currency
+from logbook.statistics.currency import CurrencyEngine, CurrencyStatus, get_rolling_currency, with_currency_status
 from logbook.statistics.experience import compute_totals
 
 from .conftest import EXTRA_LANDINGS, NUMBER_OF_LOG_ENTRIES
@@ -30,8 +31,9 @@ def test_compute_totals_time(log_entries):
 
 
 @pytest.mark.django_db
-def test_not_current():  # no fixture!
-    currency = get_rolling_currency(LogEntry.objects.all(), 5)
+@pytest.mark.parametrize("engine", CurrencyEngine)
+def test_not_current(engine):  # no fixture!
+    currency = get_rolling_currency(LogEntry.objects.all(), 5, engine=engine)
 
     assert currency.expires_in == timedelta(days=0)
     assert currency.expires_on == datetime.now(tz=UTC).date()
@@ -40,8 +42,9 @@ def test_not_current():  # no fixture!
 
 
 @pytest.mark.django_db
-def test_current_linear(log_entries):
-    currency = get_rolling_currency(log_entries, 5)
+@pytest.mark.parametrize("engine", CurrencyEngine)
+def test_current_linear(log_entries, engine):
+    currency = get_rolling_currency(log_entries, 5, engine=engine)
 
     assert currency.expires_in.total_seconds() == pytest.approx(timedelta(days=5).total_seconds(), abs=0.1)
     assert currency.expires_on == (datetime.now(tz=UTC) + timedelta(days=5 - 1)).date()
@@ -50,7 +53,8 @@ def test_current_linear(log_entries):
 
 
 @pytest.mark.django_db
-def test_current_first_current_and_expired_on_same_day(log_entries):
+@pytest.mark.parametrize("engine", CurrencyEngine)
+def test_current_first_current_and_expired_on_same_day(log_entries, engine):
     first_current_entry = LogEntry.objects.get(pk=NUMBER_OF_LOG_ENTRIES)
     first_current_entry.pk = None
     first_current_entry.landings = 7
@@ -58,7 +62,7 @@ def test_current_first_current_and_expired_on_same_day(log_entries):
     first_current_entry.arrival_time -= timedelta(hours=1)
     first_current_entry.save()
 
-    currency = get_rolling_currency(log_entries, 5)
+    currency = get_rolling_currency(log_entries, 5, engine=engine)
 
     assert currency.expires_in.total_seconds() == pytest.approx(timedelta(days=8, hours=23).total_seconds(), abs=0.1)
     assert currency.expires_on == (datetime.now(tz=UTC) + timedelta(days=8)).date()
@@ -66,6 +70,54 @@ def test_current_first_current_and_expired_on_same_day(log_entries):
     assert currency.landings_to_renew == 5
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("required_landings", "required_time"),
+    [
+        (1, None),
+        (5, timedelta(minutes=3)),
+        (5, timedelta(minutes=10)),
+        (50, timedelta(minutes=3)),
+        (50, timedelta(hours=1)),
+    ],
+)
+def test_currency_engines_parity(log_entries, required_landings, required_time):
+    subquery_currency, sweep_currency = (
+        get_rolling_currency(log_entries, required_landings, required_time, engine=engine)
+        for engine in (CurrencyEngine.SUBQUERY, CurrencyEngine.SWEEP)
+    )
+
+    assert sweep_currency.status == subquery_currency.status
+    assert sweep_currency.landings_to_renew == subquery_currency.landings_to_renew
+    assert sweep_currency.time_to_renew == subquery_currency.time_to_renew
+    assert sweep_currency.expires_in.total_seconds() == pytest.approx(
+        subquery_currency.expires_in.total_seconds(), abs=0.1
+    )
+
+
+@pytest.mark.django_db
+def test_with_currency_status(log_entries, django_assert_num_queries):
+    aircraft = log_entries.first().aircraft
+    Aircraft.objects.filter(pk=aircraft.pk).update(currency_required=True)
+    Aircraft.objects.create(maker="Test", model="Test", icao_designator="TEST", registration="TEST-2")
+    Aircraft.objects.create(
+        maker="Test", model="Test", icao_designator="TEST", registration="TEST-3", currency_required=True
+    )
+
+    with django_assert_num_queries(2):
+        fleet = with_currency_status(Aircraft.objects.all())
+        statuses = {item.registration: item.currency_status for item in fleet}
+
+    expected_currency = get_rolling_currency(log_entries, Aircraft.CURRENCY_REQUIRED_LANDINGS)
+    assert statuses["TEST"].status == expected_currency.status
+    assert statuses["TEST"].landings_to_renew == expected_currency.landings_to_renew
+    assert statuses["TEST"].expires_in.total_seconds() == pytest.approx(
+        expected_currency.expires_in.total_seconds(), abs=0.1
+    )
+    assert statuses["TEST-2"] is None
+    assert statuses["TEST-3"].status == CurrencyStatus.NOT_CURRENT
+
+
 def test_lowest_currency_status():
     assert min(CurrencyStatus.CURRENT, CurrencyStatus.CURRENT) == CurrencyStatus.CURRENT
     assert min(CurrencyStatus.CURRENT, CurrencyStatus.EXPIRING) == CurrencyStatus.EXPIRING
@@ -5,8 +5,9 @@ from django.template import TemplateSyntaxError
 from django.utils.safestring import SafeString
 
 from logbook.models.aircraft import AircraftType, SpeedUnit
-from logbook.models.log_entry import FunctionType
+from logbook.models.log_entry import FunctionType, LogEntry
 from logbook.statistics.experience import ExperienceRecord, TotalsRecord
+from logbook.statistics.totals import CarryForwardTotals, compute_carry_forward_totals
 from logbook.templatetags.logbook_utils import duration, replace, represent, subtract, to_kt, total_landings, total_time
 
 from .conftest import DAYS_IN_THE_PAST, EXTRA_LANDINGS, NUMBER_OF_LOG_ENTRIES
@@ -65,22 +66,25 @@ def test_duration():
     assert duration(timedelta(days=1, hours=2, minutes=3, seconds=4), "%d:%h:%s") == "1:2:184"
 
 
+def carry_forward_totals(reference: datetime) -> CarryForwardTotals:
+    return compute_carry_forward_totals(LogEntry.objects.all(), {"reference": reference})["reference"]
+
+
 @pytest.mark.django_db
 def test_total_time(log_entries):
-    time = total_time(datetime.now(tz=UTC))
-    assert time == "0:30"
-
-    time = total_time(datetime.now(tz=UTC), time_function=FunctionType.DUAL)
-    assert time == "0:00"
+    totals = carry_forward_totals(datetime.now(tz=UTC))
 
-    time = total_time(datetime.now(tz=UTC), aircraft_type=AircraftType.GLD)
-    assert time == "0:00"
+    assert total_time(totals) == "0:30"
+    assert total_time(totals, time_function=FunctionType.DUAL) == "0:00"
+    assert total_time(totals, aircraft_type=AircraftType.GLD) == "0:00"
 
 
 @pytest.mark.django_db
 def test_total_landings(log_entries):
-    landings = total_landings(datetime.now(tz=UTC))
+    landings = total_landings(carry_forward_totals(datetime.now(tz=UTC)))
     assert landings == str(NUMBER_OF_LOG_ENTRIES + EXTRA_LANDINGS)
 
-    landings = total_landings(datetime.now(tz=UTC) - timedelta(days=DAYS_IN_THE_PAST - NUMBER_OF_LOG_ENTRIES / 2))
+    landings = total_landings(
+        carry_forward_totals(datetime.now(tz=UTC) - timedelta(days=DAYS_IN_THE_PAST - NUMBER_OF_LOG_ENTRIES / 2))
+    )
     assert landings == str(NUMBER_OF_LOG_ENTRIES // 2 + EXTRA_LANDINGS)
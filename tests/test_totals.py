@@ -0,0 +1,110 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from logbook.models.aircraft import Aircraft, AircraftType
+from logbook.models.log_entry import FunctionType, LogEntry
+from logbook.statistics.experience import compute_totals
+from logbook.statistics.totals import compute_carry_forward_totals, compute_fleet_totals
+
+PERIODS = (timedelta(days=30), timedelta(days=90), timedelta(days=365))
+
+
+@pytest.fixture
+def mixed_log_entries(log_entries):
+    first_entry = log_entries.last()
+    tmg = Aircraft.objects.create(
+        type=AircraftType.TMG,
+        maker="Test",
+        model="Test",
+        icao_designator="TEST",
+        registration="TEST-TMG",
+    )
+    Aircraft.objects.create(
+        type=AircraftType.GLD,
+        maker="Test",
+        model="Test",
+        icao_designator="TEST",
+        registration="TEST-GLD",
+    )
+
+    for i, function in enumerate((FunctionType.PIC, FunctionType.DUAL, FunctionType.PIC)):
+        LogEntry.objects.create(
+            aircraft=tmg,
+            from_aerodrome=first_entry.from_aerodrome,
+            to_aerodrome=first_entry.to_aerodrome,
+            departure_time=datetime.now(tz=UTC) - timedelta(days=20 + 100 * i),
+            arrival_time=datetime.now(tz=UTC) - timedelta(days=20 + 100 * i) + timedelta(minutes=30 + i),
+            landings=i + 1,
+            time_function=function,
+            pilot=first_entry.pilot,
+        )
+
+    log_entries.filter(pk__in=[1, 2, 3]).update(time_function=FunctionType.DUAL)
+    log_entries.filter(pk__in=[4, 5]).update(time_function=FunctionType.PIC)
+
+    return LogEntry.objects.all()
+
+
+@pytest.mark.django_db
+def test_fleet_totals_parity(mixed_log_entries):
+    now = datetime.now(tz=UTC)
+    fleet_totals = compute_fleet_totals(mixed_log_entries, PERIODS, now)
+
+    def per_function(entries):
+        return {function: compute_totals(entries.filter(time_function=function)) for function in FunctionType}
+
+    assert fleet_totals.grand == compute_totals(mixed_log_entries)
+    assert list(fleet_totals.per_type) == list(reversed(AircraftType))
+
+    for aircraft_type, type_totals in fleet_totals.per_type.items():
+        type_entries = mixed_log_entries.filter(aircraft__type=aircraft_type)
+        assert type_totals.grand == compute_totals(type_entries)
+        assert type_totals.per_function == per_function(type_entries)
+
+        assert [item.aircraft for item in type_totals.per_aircraft] == list(Aircraft.objects.filter(type=aircraft_type))
+        for aircraft_totals in type_totals.per_aircraft:
+            aircraft_entries = mixed_log_entries.filter(aircraft=aircraft_totals.aircraft)
+            assert aircraft_totals.grand == compute_totals(aircraft_entries)
+            assert aircraft_totals.per_function == per_function(aircraft_entries)
+
+        for period_totals, period_delta in zip(type_totals.per_period, PERIODS, strict=True):
+            period_entries = type_entries.filter(departure_time__gt=now - period_delta)
+            assert period_totals.grand == compute_totals(period_entries)
+            assert period_totals.per_function == per_function(period_entries)
+
+
+@pytest.mark.django_db
+def test_fleet_totals_query_count(mixed_log_entries, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        compute_fleet_totals(mixed_log_entries, PERIODS, datetime.now(tz=UTC))
+
+
+@pytest.mark.django_db
+def test_fleet_totals_empty():
+    fleet_totals = compute_fleet_totals(LogEntry.objects.all(), PERIODS, datetime.now(tz=UTC))
+
+    assert fleet_totals.grand == compute_totals(LogEntry.objects.all())
+    assert all(not type_totals.per_aircraft for type_totals in fleet_totals.per_type.values())
+
+
+@pytest.mark.django_db
+def test_carry_forward_totals_parity(mixed_log_entries, django_assert_num_queries):
+    reference_times = {
+        "brought_forward": mixed_log_entries.order_by("arrival_time")[10].departure_time,
+        "carried_forward": datetime.now(tz=UTC),
+    }
+
+    with django_assert_num_queries(1):
+        carry_forward_totals = compute_carry_forward_totals(mixed_log_entries, reference_times)
+
+    for key, reference_time in reference_times.items():
+        totals = carry_forward_totals[key]
+        entries = mixed_log_entries.filter(arrival_time__lte=reference_time)
+
+        assert totals.landings == compute_totals(entries).landings
+        assert totals.time[None, None] == compute_totals(entries).time
+        for aircraft_type in AircraftType:
+            assert totals.time[aircraft_type, None] == compute_totals(entries.filter(aircraft__type=aircraft_type)).time
+        for function in FunctionType:
+            assert totals.time[None, function] == compute_totals(entries.filter(time_function=function)).time
@@ -0,0 +1,220 @@
+import json
+import os
+import socket
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from logbook import jobs
+from logbook.jobs import ImportJobRunner, run_import_job
+from logbook.models.aerodrome import Aerodrome
+from logbook.models.aircraft import Aircraft, AircraftType
+from logbook.models.daily_totals import DailyTotals
+from logbook.models.import_job import ImportJob, ImportJobStatus
+from logbook.models.log_entry import FunctionType, LogEntry
+from logbook.models.pilot import Pilot
+from vereinsflieger import vereinsflieger
+
+FIXTURES_PATH = Path(__file__).parent.parent / "vereinsflieger" / "fixtures"
+
+FIXTURES = {
+    12154186: "vf_12154186_dual.json",
+    12240603: "vf_12240603_solo.json",
+    12256298: "vf_12256298_pic.json",
+}
+
+pytestmark = pytest.mark.respx(base_url="https://www.vereinsflieger.de/interface/rest", assert_all_called=False)
+
+
+def load_flight(fid: int, day: int) -> dict:
+    return json.loads((FIXTURES_PATH / FIXTURES[fid]).read_text()) | {
+        "flid": str(fid),
+        "dateofflight": f"2023-09-{day:02}",
+    }
+
+
+@pytest.fixture(autouse=True)
+def close_session_managers(respx_mock: respx.mock):
+    yield
+
+    # Signs out while the API is still mocked, rather than from the atexit hook
+    with vereinsflieger._session_managers_lock:
+        managers = list(vereinsflieger._session_managers.values())
+        vereinsflieger._session_managers.clear()
+    for manager in managers:
+        manager.close()
+
+
+class RecordingImportJobRunner(ImportJobRunner):
+    def __init__(self, max_workers: int = 1):
+        super().__init__(max_workers)
+        self.submitted = []
+
+    def submit(self, job: ImportJob):
+        self.submitted.append(job.pk)
+
+
+@pytest.fixture
+def import_job_runner(monkeypatch):
+    monkeypatch.setattr(jobs, "_runner", None)
+    monkeypatch.setattr(jobs, "ImportJobRunner", RecordingImportJobRunner)
+    yield jobs.get_import_job_runner
+    if jobs._runner is not None:
+        jobs._runner.shutdown()
+
+
+@pytest.fixture
+def vereinsflieger_setup(settings, tmp_path, respx_mock: respx.mock):
+    settings.VEREINSFLIEGER_CACHE_DIR = tmp_path
+    settings.VEREINSFLIEGER_APP_KEY = "app_key"
+    settings.VEREINSFLIEGER_USERNAME = "username"
+    settings.VEREINSFLIEGER_PASSWORD = "password"
+
+    Aircraft.objects.create(type=AircraftType.SEP, maker="M", model="M", icao_designator="C172", registration="D-EABC")
+    for icao_code in ("EDKA", "EDLN"):
+        Aerodrome.objects.create(
+            name=icao_code,
+            city=icao_code,
+            country="DE",
+            icao_code=icao_code,
+            latitude=50,
+            longitude=6,
+            elevation=0,
+            priority=0,
+        )
+
+    flights = {fid: load_flight(fid, day) for day, fid in enumerate(FIXTURES, start=1)}
+
+    respx_mock.post("/auth/accesstoken").respond(json={"accesstoken": "foo"})
+    respx_mock.post("/auth/signin") % httpx.codes.OK
+    respx_mock.delete("/auth/signout/foo") % httpx.codes.OK
+    respx_mock.post("/flight/list/sincedate", params={"dateparam": "2023-09-02"}).respond(
+        json={str(i): flight for i, flight in enumerate(flights.values())} | {"httpstatuscode": 200}
+    )
+    respx_mock.get(url__regex=r"/flight/get/(?P<fid>\d+)", name="get_flight").mock(
+        side_effect=lambda request, fid: httpx.Response(httpx.codes.OK, json=flights[int(fid)])
+    )
+
+    return respx_mock
+
+
+@pytest.mark.django_db
+def test_import_vereinsflieger_date_range(vereinsflieger_setup):
+    call_command("import_vereinsflieger", "--from=2023-09-02", "--to=2023-09-03", stdout=StringIO())
+
+    assert LogEntry.objects.count() == 2
+    assert list(LogEntry.objects.order_by("departure_time").values_list("time_function", flat=True)) == [
+        FunctionType.PIC,
+        FunctionType.PIC,
+    ]
+    assert Pilot.objects.count() == 2
+    assert sum(DailyTotals.objects.values_list("entries", flat=True)) == 2
+
+
+@pytest.mark.django_db
+def test_import_vereinsflieger_flight_ids(vereinsflieger_setup):
+    call_command("import_vereinsflieger", *map(str, FIXTURES), stdout=StringIO())
+
+    stdout = StringIO()
+    call_command("import_vereinsflieger", *map(str, FIXTURES), "--refresh", verbosity=2, stdout=stdout)
+    assert f"GET /interface/rest/flight/get/{{id}}: {len(FIXTURES)} requests, 0 retries" in stdout.getvalue()
+
+    assert LogEntry.objects.count() == len(FIXTURES)
+    assert LogEntry.objects.filter(time_function=FunctionType.DUAL).get().pilot.last_name == "Instructor"
+
+
+@pytest.mark.django_db
+def test_import_vereinsflieger_cache(vereinsflieger_setup):
+    call_command("import_vereinsflieger", *map(str, FIXTURES), stdout=StringIO())
+    route = vereinsflieger_setup.routes["get_flight"]
+    assert route.call_count == len(FIXTURES)
+
+    call_command("import_vereinsflieger", *map(str, FIXTURES), stdout=StringIO())
+    assert route.call_count == len(FIXTURES)
+
+    call_command("import_vereinsflieger", *map(str, FIXTURES), "--refresh", stdout=StringIO())
+    assert route.call_count == 2 * len(FIXTURES)
+
+    stdout = StringIO()
+    call_command("prune_vereinsflieger_cache", "--clear", stdout=stdout)
+    assert f"{len(FIXTURES)} least recently used flights, 0 flights" in stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_run_import_job(vereinsflieger_setup):
+    job = ImportJob.objects.create(flight_id=12256298)
+
+    assert run_import_job(job.pk).status == ImportJobStatus.SUCCEEDED
+    job.refresh_from_db()
+    assert job.log_entry == LogEntry.objects.get()
+    assert job.finished_at >= job.started_at
+
+    assert run_import_job(job.pk) is None  # already claimed
+
+
+@pytest.mark.django_db
+def test_run_import_job_failure(vereinsflieger_setup):
+    job = ImportJob.objects.create(flight_id=1)
+
+    assert run_import_job(job.pk).status == ImportJobStatus.FAILED
+    job.refresh_from_db()
+    assert job.error
+    assert job.log_entry is None
+    assert not LogEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_job_enqueued_and_polled(vereinsflieger_setup, import_job_runner, admin_client):
+    response = admin_client.post(reverse("logbook:entries"), {"flight_id": 12256298}, secure=True)
+    assert response.status_code == 302
+
+    job = ImportJob.objects.get()
+    assert job.status == ImportJobStatus.QUEUED  # the runner only picks up committed jobs
+    assert not LogEntry.objects.exists()
+
+    run_import_job(job.pk)
+
+    response = admin_client.get(reverse("logbook:import-jobs"), {"id": job.pk}, secure=True)
+    assert response.json() == {"jobs": [ImportJob.objects.get().to_json()]}
+    assert response.json()["jobs"][0]["log_entry_id"] == LogEntry.objects.get().pk
+
+
+@pytest.mark.django_db
+def test_import_job_runner_resume(import_job_runner):
+    runner = RecordingImportJobRunner()
+    now = timezone.now()
+    sibling = f"{socket.gethostname()}:{os.getppid()}:abcdef01"  # a live process on this host
+
+    own, gone, other_host, alive, stale = (
+        ImportJob.objects.create(flight_id=flight_id, status=ImportJobStatus.RUNNING, runner=runner_id, started_at=now)
+        for flight_id, runner_id in enumerate(
+            (runner.runner_id, jobs.make_runner_id(), "other:1:abcdef01", sibling, sibling)
+        )
+    )
+    ImportJob.objects.filter(pk=stale.pk).update(started_at=now - jobs.STALE_JOB_TIMEOUT - timedelta(seconds=1))
+    queued = ImportJob.objects.create(flight_id=5)
+
+    runner.resume()
+
+    interrupted = ImportJob.objects.filter(status=ImportJobStatus.FAILED, error="Interrupted")
+    assert set(interrupted.values_list("pk", flat=True)) == {gone.pk, other_host.pk, stale.pk}
+    running = ImportJob.objects.filter(status=ImportJobStatus.RUNNING)
+    assert set(running.values_list("pk", flat=True)) == {own.pk, alive.pk}
+    assert runner.submitted == [queued.pk]
+
+
+@pytest.mark.django_db
+def test_import_job_status_resumes_runner(import_job_runner, admin_client):
+    job = ImportJob.objects.create(flight_id=12256298)  # left behind by a restart
+
+    response = admin_client.get(reverse("logbook:import-jobs"), secure=True)
+
+    assert response.status_code == 200
+    assert import_job_runner().submitted == [job.pk]
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PruneResult:
+    expired: int
+    evicted: int
+    remaining: int
+    size: int
+
+
+class FlightCache:
+    """
+    On-disk cache of raw flight data (API JSON or scraped field maps), one file per source and flight ID
+
+    Files are addressed by the hash of their key. The fetch time is stored in the file for the TTL, while the
+    modification time is bumped on every hit and serves as the access time for the least-recently-used eviction.
+
+    Writes keep a running estimate of the cache size, which is taken from a full sweep on the first write and after
+    every prune, so that the cache is only swept again once the estimate exceeds `max_size`.
+    """
+
+    def __init__(self, directory: Path, ttl: timedelta, max_size: int):
+        self.directory = Path(directory)
+        self.ttl = ttl.total_seconds()
+        self.max_size = max_size
+
+        self._size_lock = threading.Lock()
+        self._size: int | None = None
+
+    def _path(self, source: str, fid: int) -> Path:
+        digest = hashlib.sha256(f"{source}:{fid}".encode()).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def _files(self) -> list[Path]:
+        return list(self.directory.glob("*/*.json"))
+
+    def _is_expired(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at > self.ttl
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def get(self, source: str, fid: int) -> dict | None:
+        path = self._path(source, fid)
+
+        try:
+            entry = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"VF cache entry {path} unreadable: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if self._is_expired(entry["fetched_at"]):
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)
+        return entry["data"]
+
+    def put(self, source: str, fid: int, data: dict):
+        path = self._path(source, fid)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first, so that concurrent readers never see a partial entry
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary_path.write_text(json.dumps({"source": source, "fid": fid, "fetched_at": time.time(), "data": data}))
+        replaced_size = self._file_size(path)
+        temporary_path.replace(path)
+
+        with self._size_lock:
+            if self._size is not None:
+                self._size += self._file_size(path) - replaced_size
+            sweep = self._size is None or self._size > self.max_size
+
+        if sweep:
+            self.prune(expired=False)
+
+    def invalidate(self, source: str, fid: int):
+        path = self._path(source, fid)
+        size = self._file_size(path)
+        path.unlink(missing_ok=True)
+
+        with self._size_lock:
+            if self._size is not None:
+                self._size -= size
+
+    def prune(self, expired: bool = True) -> PruneResult:
+        """
+        Removes the expired entries and then the least recently used ones until the cache fits into `max_size`
+        """
+        files, expired_count = [], 0
+
+        for path in self._files():
+            try:
+                if expired and self._is_expired(json.loads(path.read_text())["fetched_at"]):
+                    path.unlink()
+                    expired_count += 1
+                    continue
+                files.append((path.stat(), path))
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)
+
+        size = sum(stat.st_size for stat, _ in files)
+        evicted = 0
+
+        for stat, path in sorted(files, key=lambda item: item[0].st_mtime):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= stat.st_size
+            evicted += 1
+
+        with self._size_lock:
+            self._size = size
+
+        return PruneResult(expired=expired_count, evicted=evicted, remaining=len(files) - evicted, size=size)
@@ -1,6 +1,7 @@
 import html
 from dataclasses import dataclass
 from datetime import datetime
+from typing import ClassVar
 
 from playwright.async_api import Page
 
@@ -26,6 +27,20 @@ class Flight:
     function: FunctionType
     remarks: str = ""
 
+    SCRAPER_LABELS: ClassVar = (
+        "CallSign",
+        "Startort",
+        "Landeort",
+        "Datum",
+        "Off-Block",
+        "On-Block",
+        "Landungen",
+        "Flugart",
+        "Pilot",
+        "Kommentar",
+    )
+    SCRAPER_OPTIONAL_LABELS: ClassVar = ("Flugauftrag von", "Begleiter / FI")
+
     @classmethod
     def parse_pilot(cls, name: str) -> Person:
         pilot_last_name, pilot_first_name = map(str.strip, name.split(","))
@@ -72,49 +87,57 @@ class Flight:
         )
 
     @classmethod
-    async def from_vereinsflieger_scraper(cls, page: Page) -> "Flight":
-        registration = await page.locator(":text('CallSign') + td").text_content()
+    async def scrape_fields(cls, page: Page) -> dict[str, str | None]:
+        """
+        Reads the labelled cells of a flight page into a field map, `None` for the optional labels that are missing
+        """
+        fields = {}
 
-        from_aerodrome = cls.parse_location(await page.locator(":text('Startort') + td").text_content())
-        to_aerodrome = cls.parse_location(await page.locator(":text('Landeort') + td").text_content())
+        for label in cls.SCRAPER_LABELS:
+            fields[label] = await page.locator(f":text('{label}') + td").text_content()
 
-        flight_date = "-".join(reversed((await page.locator(":text('Datum') + td").text_content()).split(".")))
-        departure_time = cls.parse_datetime(flight_date, await page.locator(":text('Off-Block') + td").text_content())
-        arrival_time = cls.parse_datetime(flight_date, await page.locator(":text('On-Block') + td").text_content())
+        for label in cls.SCRAPER_OPTIONAL_LABELS:
+            element = await page.query_selector(f":text('{label}') + td")
+            fields[label] = await element.text_content() if element is not None else None
 
-        landings = int(await page.locator(":text('Landungen') + td").text_content())
+        return fields
 
-        flight_type = await page.locator(":text('Flugart') + td").text_content()
+    @classmethod
+    def from_vereinsflieger_fields(cls, fields: dict[str, str | None]) -> "Flight":
+        flight_date = "-".join(reversed(fields["Datum"].split(".")))
+        flight_type = fields["Flugart"]
 
         if any(flight_type.startswith(prefix) for prefix in ("S", "T", "Ü")):
-            if (await page.query_selector(":text('Flugauftrag von') + td")) is not None:
+            if fields["Flugauftrag von"] is not None:
                 time_function = FunctionType.PIC
-                pilot = cls.parse_pilot(await page.locator(":text('Pilot') + td").text_content())
-                copilot = cls.parse_pilot(await page.locator(":text('Flugauftrag von') + td").text_content())
-            elif (await page.query_selector(":text('Begleiter / FI') + td")) is not None:
+                pilot = cls.parse_pilot(fields["Pilot"])
+                copilot = cls.parse_pilot(fields["Flugauftrag von"])
+            elif fields["Begleiter / FI"] is not None:
                 time_function = FunctionType.DUAL
-                pilot = cls.parse_pilot(await page.locator(":text('Begleiter / FI') + td").text_content())
-                copilot = cls.parse_pilot(await page.locator(":text('Pilot') + td").text_content())
+                pilot = cls.parse_pilot(fields["Begleiter / FI"])
+                copilot = cls.parse_pilot(fields["Pilot"])
             else:
                 raise NotImplementedError
         elif flight_type.startswith("N"):
             time_function = FunctionType.PIC
-            pilot = cls.parse_pilot(await page.locator(":text('Pilot') + td").text_content())
+            pilot = cls.parse_pilot(fields["Pilot"])
             copilot = None
         else:
             raise NotImplementedError
 
-        remarks = await page.locator(":text('Kommentar') + td").text_content()
-
         return cls(
-            registration=registration,
-            from_aerodrome=from_aerodrome,
-            to_aerodrome=to_aerodrome,
-            departure_time=departure_time,
-            arrival_time=arrival_time,
-            landings=landings,
+            registration=fields["CallSign"],
+            from_aerodrome=cls.parse_location(fields["Startort"]),
+            to_aerodrome=cls.parse_location(fields["Landeort"]),
+            departure_time=cls.parse_datetime(flight_date, fields["Off-Block"]),
+            arrival_time=cls.parse_datetime(flight_date, fields["On-Block"]),
+            landings=int(fields["Landungen"]),
             pilot=pilot,
             copilot=copilot,
             function=time_function,
-            remarks=remarks,
+            remarks=fields["Kommentar"],
         )
+
+    @classmethod
+    async def from_vereinsflieger_scraper(cls, page: Page) -> "Flight":
+        return cls.from_vereinsflieger_fields(await cls.scrape_fields(page))
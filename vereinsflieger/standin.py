@@ -0,0 +1,165 @@
+import threading
+import time
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import parse_qs, urlsplit
+
+SESSION_COOKIE = "PHPSESSID"
+
+FLIGHT_FIELDS = {
+    "CallSign": "D-EABC",
+    "Startort": "Aachen-Merzbrück EDKA",
+    "Landeort": "Mönchengladbach EDLN",
+    "Datum": "01.09.2023",
+    "Off-Block": "10:22",
+    "On-Block": "11:07",
+    "Landungen": "5",
+    "Flugart": "S - Schulflug",
+    "Pilot": "Muster, Max",
+    "Kommentar": "Stand-in flight",
+    "Begleiter / FI": "Lehrer, Lara",
+}
+
+ASSETS = {
+    "/assets/style.css": ("text/css", b"body { font-family: 'Stand-in'; }"),
+    "/assets/font.woff2": ("font/woff2", bytes(32 * 1024)),
+    "/assets/logo.png": ("image/png", bytes(64 * 1024)),
+}
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Vereinsflieger stand-in</title>
+<link rel="stylesheet" href="/assets/style.css">
+<link rel="preload" href="/assets/font.woff2" as="font" crossorigin>
+</head>
+<body>
+<img src="/assets/logo.png" alt="Logo">
+{body}
+</body>
+</html>
+"""
+
+SIGN_IN_BODY = """<form method="post" action="/">
+<input name="user" placeholder="Benutzer oder E-Mail">
+<input name="pwinput" type="password" placeholder="Passwort">
+<button type="submit">Anmelden</button>
+</form>
+"""
+
+OVERVIEW_BODY = """<div id="topnavi"><a href="/signout">Abmelden</a></div>
+<h1>Übersicht</h1>
+"""
+
+FLIGHT_ROW = "<tr><td>{label}</td><td>{value}</td></tr>"
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    Serves the sign-in, overview and flight pages of Vereinsflieger in the same shape the scraper expects
+    """
+
+    server: "StandinServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _session(self) -> str | None:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        session = cookie.get(SESSION_COOKIE)
+        return session.value if session is not None else None
+
+    def _send(self, status: HTTPStatus, content_type: str, body: bytes, headers: dict[str, str] | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_page(self, body: str):
+        self._send(HTTPStatus.OK, "text/html; charset=utf-8", PAGE.format(body=body).encode())
+
+    def _redirect(self, location: str, headers: dict[str, str] | None = None):
+        self._send(HTTPStatus.FOUND, "text/plain", b"", {"Location": location} | (headers or {}))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+
+        if url.path in ASSETS:
+            time.sleep(self.server.asset_delay)
+            self._send(HTTPStatus.OK, *ASSETS[url.path])
+        elif url.path == "/":
+            self._send_page(SIGN_IN_BODY)
+        elif self._session() not in self.server.sessions:
+            self._redirect("/")
+        elif url.path == "/member/overview/overview":
+            self._send_page(OVERVIEW_BODY)
+        elif url.path == "/member/profile/viewflight.php":
+            flid = parse_qs(url.query).get("flid", [""])[0]
+            rows = "\n".join(FLIGHT_ROW.format(label=label, value=value) for label, value in FLIGHT_FIELDS.items())
+            self._send_page(f'<h1>Flug {flid}</h1>\n<table class="flight">\n{rows}\n</table>')
+        elif url.path == "/signout":
+            self.server.sessions.discard(self._session())
+            self._redirect("/")
+        else:
+            self._send(HTTPStatus.NOT_FOUND, "text/plain", b"Not found")
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+
+        if form.get("user") == [self.server.username] and form.get("pwinput") == [self.server.password]:
+            session = self.server.sign_in()
+            self._redirect("/member/overview/overview", {"Set-Cookie": f"{SESSION_COOKIE}={session}; Path=/"})
+        else:
+            self._redirect("/")
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    Local stand-in for Vereinsflieger to measure the scraper without depending on the real site
+
+    Assets are delayed to approximate loading them from a remote server, sessions can be expired to force signing in
+    again.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, username: str, password: str, asset_delay: float = 0.05):
+        super().__init__(("127.0.0.1", 0), StandinHandler)
+        self.username = username
+        self.password = password
+        self.asset_delay = asset_delay
+        self.sessions: set[str] = set()
+        self.sign_ins = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def sign_in(self) -> str:
+        with self._lock:
+            self.sign_ins += 1
+            session = f"standin-{self.sign_ins}"
+            self.sessions.add(session)
+            return session
+
+    def expire_sessions(self):
+        self.sessions.clear()
+
+    def __enter__(self) -> Self:
+        self._thread = threading.Thread(target=self.serve_forever, name="vereinsflieger-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        self._thread.join()
+        self.server_close()
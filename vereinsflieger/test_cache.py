@@ -0,0 +1,81 @@
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+from .cache import FlightCache
+
+FLIGHT_DATA = {"flid": "123", "comment": "Example flight"}
+
+
+@pytest.fixture
+def cache(tmp_path) -> FlightCache:
+    return FlightCache(tmp_path, ttl=timedelta(days=1), max_size=1024 * 1024)
+
+
+def test_get_put(cache: FlightCache):
+    assert cache.get("api", 123) is None
+
+    cache.put("api", 123, FLIGHT_DATA)
+
+    assert cache.get("api", 123) == FLIGHT_DATA
+    assert cache.get("scraper", 123) is None
+
+    cache.invalidate("api", 123)
+    assert cache.get("api", 123) is None
+
+
+def test_expired(cache: FlightCache):
+    cache.put("api", 123, FLIGHT_DATA)
+    cache.ttl = 0
+    time.sleep(0.01)
+
+    assert cache.get("api", 123) is None
+    assert not cache._files()
+
+
+def test_least_recently_used_eviction(cache: FlightCache):
+    for fid in range(3):
+        cache.put("api", fid, FLIGHT_DATA)
+        os.utime(cache._path("api", fid), (fid, fid))
+
+    cache.get("api", 0)  # Marks the oldest entry as most recently used
+
+    # The sizes differ by the digits of the fetch times
+    cache.max_size = sum(cache._path("api", fid).stat().st_size for fid in (0, 2))
+    result = cache.prune()
+
+    assert (result.expired, result.evicted, result.remaining) == (0, 1, 2)
+    assert cache.get("api", 1) is None
+    assert cache.get("api", 0) == FLIGHT_DATA
+    assert cache.get("api", 2) == FLIGHT_DATA
+
+
+def test_unreadable_entry(cache: FlightCache):
+    cache.put("api", 123, FLIGHT_DATA)
+    cache._path("api", 123).write_text("{")
+
+    assert cache.get("api", 123) is None
+
+
+def test_put_sweeps_only_over_max_size(cache: FlightCache, monkeypatch):
+    sweeps = []
+    prune = cache.prune
+    monkeypatch.setattr(cache, "prune", lambda **kwargs: sweeps.append(kwargs) or prune(**kwargs))
+
+    for fid in range(10):
+        cache.put("api", fid, FLIGHT_DATA)
+
+    assert len(sweeps) == 1  # The first write takes the size from a sweep, the others keep a running estimate
+    size = cache._size
+
+    cache.invalidate("api", 0)
+    cache.max_size = size + 16  # The sizes differ by the digits of the fetch times
+    cache.put("api", 10, FLIGHT_DATA)
+    assert len(sweeps) == 1
+
+    cache.put("api", 11, FLIGHT_DATA)
+    assert len(sweeps) == 2
+    assert cache._size <= cache.max_size
+    assert len(cache._files()) == 10
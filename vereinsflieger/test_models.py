@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from logbook.models.log_entry import FunctionType
+
 from .models import Flight, Person
 
 
@@ -13,3 +15,33 @@ def test_parse_location():
 
 def test_parse_datetime():
     assert Flight.parse_datetime("2021-01-01", "12:00") == datetime.fromisoformat("2021-01-01T12:00+00:00")
+
+
+def test_from_vereinsflieger_fields():
+    fields = {
+        "CallSign": "D-EABC",
+        "Startort": "Aachen-Merzbrück EDKA",
+        "Landeort": "Mönchengladbach EDLN",
+        "Datum": "01.09.2023",
+        "Off-Block": "10:22",
+        "On-Block": "11:07",
+        "Landungen": "5",
+        "Flugart": "S - Schulflug",
+        "Pilot": "Pilot, Peter",
+        "Kommentar": "Example Dual flight",
+        "Flugauftrag von": None,
+        "Begleiter / FI": "Instructor, Ian",
+    }
+
+    assert Flight.from_vereinsflieger_fields(fields) == Flight(
+        registration="D-EABC",
+        from_aerodrome="EDKA",
+        to_aerodrome="EDLN",
+        departure_time=datetime.fromisoformat("2023-09-01T10:22:00Z"),
+        arrival_time=datetime.fromisoformat("2023-09-01T11:07:00Z"),
+        landings=5,
+        pilot=Person(first_name="Ian", last_name="Instructor"),
+        copilot=Person(first_name="Peter", last_name="Pilot"),
+        function=FunctionType.DUAL,
+        remarks="Example Dual flight",
+    )
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+from playwright.sync_api import sync_playwright
+
+from .models import Flight
+from .standin import FLIGHT_FIELDS, StandinServer
+from .vereinsflieger_scraper import VereinsfliegerBrowserPool
+
+USERNAME = "user"
+PASSWORD = "password"
+
+
+def firefox_installed() -> bool:
+    with sync_playwright() as playwright:
+        return Path(playwright.firefox.executable_path).exists()
+
+
+requires_firefox = pytest.mark.skipif(not firefox_installed(), reason="Playwright Firefox is not installed")
+
+
+@pytest.fixture
+def server():
+    with StandinServer(USERNAME, PASSWORD, asset_delay=0) as server:
+        yield server
+
+
+@pytest.fixture
+def pool(server):
+    pool = VereinsfliegerBrowserPool(USERNAME, PASSWORD, base_url=server.base_url, max_pages=2)
+    yield pool
+    pool.close()
+
+
+def test_standin_requires_sign_in(server):
+    with httpx.Client(base_url=server.base_url) as client:
+        assert client.get("/member/profile/viewflight.php?flid=1").headers["Location"] == "/"
+
+        response = client.post("/", data={"user": USERNAME, "pwinput": "wrong"})
+        assert response.headers["Location"] == "/"
+
+        response = client.post("/", data={"user": USERNAME, "pwinput": PASSWORD})
+        assert response.headers["Location"] == "/member/overview/overview"
+
+        response = client.get("/member/profile/viewflight.php?flid=1")
+        assert response.status_code == 200
+        assert "<td>Begleiter / FI</td><td>Lehrer, Lara</td>" in response.text
+
+        server.expire_sessions()
+        assert client.get("/member/profile/viewflight.php?flid=1").headers["Location"] == "/"
+
+    assert server.sign_ins == 1
+
+
+@requires_firefox
+def test_browser_pool_reuses_sign_in(server, pool):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        flights = list(executor.map(pool.get_flight, range(8)))
+
+    assert flights == [Flight.from_vereinsflieger_fields(FLIGHT_FIELDS | {"Flugauftrag von": None})] * 8
+    assert server.sign_ins == 1
+
+
+@requires_firefox
+def test_browser_pool_signs_in_again_after_expiry(server, pool):
+    pool.get_flight_fields(1)
+    server.expire_sessions()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fields = list(executor.map(pool.get_flight_fields, range(4)))
+
+    assert all(flight_fields["CallSign"] == FLIGHT_FIELDS["CallSign"] for flight_fields in fields)
+    assert server.sign_ins == 2
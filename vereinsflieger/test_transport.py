@@ -0,0 +1,115 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
+import pytest
+import respx
+
+from .transport import AsyncRetryTransport, RetryPolicy, RetryTransport, TokenBucket, TransportMetrics
+from .vereinsflieger_api import AsyncHttpClient, HttpClient
+
+pytestmark = pytest.mark.respx(base_url=HttpClient.BASE_URL_VEREINSFLIEGER)
+
+NO_BACKOFF = RetryPolicy(backoff=timedelta())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def metrics() -> TransportMetrics:
+    return TransportMetrics()
+
+
+@pytest.fixture
+def client(metrics) -> HttpClient:
+    transport = RetryTransport(rate_limiter=TokenBucket(1000, 1000), retry_policy=NO_BACKOFF, metrics=metrics)
+    with HttpClient(base_url=HttpClient.BASE_URL_VEREINSFLIEGER, transport=transport) as client:
+        yield client
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+
+    clock.now = 5.0  # refills, but not above the capacity
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0.5]
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(backoff=timedelta(seconds=1), max_backoff=timedelta(seconds=5))
+
+    assert all(0 <= policy.delay(attempt) <= min(5, 2**attempt) for attempt in range(6) for _ in range(10))
+    assert policy.delay(0, httpx.Response(httpx.codes.TOO_MANY_REQUESTS, headers={"Retry-After": "3"})) == 3
+    assert policy.delay(0, httpx.Response(httpx.codes.TOO_MANY_REQUESTS, headers={"Retry-After": "60"})) == 5
+
+
+def test_retry_on_server_errors(respx_mock: respx.mock, client: HttpClient, metrics: TransportMetrics):
+    route = respx_mock.get("/flight/get/123")
+    route.side_effect = [
+        httpx.Response(httpx.codes.SERVICE_UNAVAILABLE),
+        httpx.Response(httpx.codes.TOO_MANY_REQUESTS),
+        httpx.Response(httpx.codes.OK, json={"flid": "123"}),
+    ]
+
+    assert client.get("/flight/get/123").json() == {"flid": "123"}
+    assert route.call_count == 3
+
+    endpoint = metrics.endpoints["GET /interface/rest/flight/get/{id}"]
+    assert (endpoint.requests, endpoint.retries, endpoint.failures) == (1, 2, 0)
+
+
+def test_retry_on_transport_errors(respx_mock: respx.mock, client: HttpClient, metrics: TransportMetrics):
+    route = respx_mock.post("/auth/accesstoken")
+    route.side_effect = [httpx.ConnectTimeout("timeout"), httpx.Response(httpx.codes.OK, json={"accesstoken": "foo"})]
+
+    assert client.post("/auth/accesstoken").json() == {"accesstoken": "foo"}
+    assert metrics.endpoints["POST /interface/rest/auth/accesstoken"].retries == 1
+
+
+def test_retries_exhausted(respx_mock: respx.mock, client: HttpClient, metrics: TransportMetrics):
+    route = respx_mock.get("/flight/get/123") % httpx.codes.BAD_GATEWAY
+    missing = respx_mock.get("/flight/get/456") % httpx.codes.NOT_FOUND
+    timeout = respx_mock.get("/flight/get/789").mock(side_effect=httpx.ReadTimeout("timeout"))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get("/flight/get/123")
+    assert route.call_count == NO_BACKOFF.max_retries + 1
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get("/flight/get/456")
+    assert missing.call_count == 1
+
+    with pytest.raises(httpx.ReadTimeout):
+        client.get("/flight/get/789")
+    assert timeout.call_count == NO_BACKOFF.max_retries + 1
+
+    endpoint = metrics.endpoints["GET /interface/rest/flight/get/{id}"]
+    assert (endpoint.requests, endpoint.retries, endpoint.failures) == (3, 2 * NO_BACKOFF.max_retries, 3)
+
+
+def test_async_retry(respx_mock: respx.mock, metrics: TransportMetrics):
+    route = respx_mock.get("/flight/get/123")
+    route.side_effect = [httpx.Response(httpx.codes.INTERNAL_SERVER_ERROR), httpx.Response(httpx.codes.OK, json={})]
+
+    async def get_flight() -> dict:
+        transport = AsyncRetryTransport(
+            httpx.AsyncHTTPTransport(limits=AsyncHttpClient.DEFAULT_LIMITS),
+            rate_limiter=TokenBucket(1000, 1000),
+            retry_policy=NO_BACKOFF,
+            metrics=metrics,
+        )
+        async with AsyncHttpClient(base_url=HttpClient.BASE_URL_VEREINSFLIEGER, transport=transport) as client:
+            return (await client.get("/flight/get/123")).json()
+
+    assert asyncio.run(get_flight()) == {}
+
+    assert route.call_count == 2
+    assert metrics.endpoints["GET /interface/rest/flight/get/{id}"].retries == 1
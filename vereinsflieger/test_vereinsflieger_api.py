@@ -1,4 +1,9 @@
-from datetime import datetime
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import partial
 from pathlib import Path
 
 import httpx
@@ -7,7 +12,13 @@ import respx
 
 from logbook.models.log_entry import FunctionType
 from vereinsflieger.models import Flight, Person
-from vereinsflieger.vereinsflieger_api import HttpClient, VereinsfliegerApiSession, VereinsfliegerError
+from vereinsflieger.vereinsflieger_api import (
+    AsyncVereinsfliegerApiSession,
+    HttpClient,
+    VereinsfliegerApiSession,
+    VereinsfliegerError,
+    VereinsfliegerSessionManager,
+)
 
 pytestmark = pytest.mark.respx(base_url="https://www.vereinsflieger.de")
 
@@ -130,3 +141,149 @@ def test_get_flight_success(
             function=function_type,
             remarks=f"Example {flight_type} flight",
         )
+
+
+def load_fixture(fixture_name: str) -> dict:
+    return json.loads((Path(__file__).parent / Path(f"fixtures/{fixture_name}")).read_text())
+
+
+FIXTURES = {
+    12154186: "vf_12154186_dual.json",
+    12240603: "vf_12240603_solo.json",
+    12256298: "vf_12256298_pic.json",
+}
+
+
+@pytest.fixture
+def respx_mock_async_session(respx_mock_sign_in: respx.mock) -> respx.mock:
+    respx_mock_sign_in.delete(url="/interface/rest/auth/signout/foo", params={"accesstoken": "foo"}) % httpx.codes.OK
+    return respx_mock_sign_in
+
+
+def test_async_get_flights(respx_mock_async_session: respx.mock):
+    in_flight, max_in_flight = 0, 0
+
+    async def get_flight(request: httpx.Request, fid: str) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(httpx.codes.OK, json=load_fixture(FIXTURES[int(fid)]) | {"flid": fid})
+
+    respx_mock_async_session.get(
+        url__regex=r"/interface/rest/flight/get/(?P<fid>\d+)", params={"accesstoken": "foo"}
+    ).mock(side_effect=get_flight)
+
+    async def get_flights() -> list[Flight]:
+        async with AsyncVereinsfliegerApiSession("app_key", "username", "password", concurrency=2) as vs:
+            return await vs.get_flights(list(FIXTURES) * 3)
+
+    flights = asyncio.run(get_flights())
+
+    assert [flight.remarks for flight in flights] == [
+        "Example Dual flight",
+        "Example Solo flight",
+        "Example PIC flight",
+    ] * 3
+    assert max_in_flight == 2
+    assert respx_mock_async_session.calls.call_count == 2 + 9 + 1
+
+
+def test_async_list_flight_ids(respx_mock_async_session: respx.mock):
+    listing = {
+        str(i): load_fixture(fixture_name) | {"flid": str(fid), "dateofflight": f"2023-09-0{i + 1}"}
+        for i, (fid, fixture_name) in enumerate(FIXTURES.items())
+    }
+    respx_mock_async_session.post(
+        url="/interface/rest/flight/list/sincedate", params={"accesstoken": "foo", "dateparam": "2023-09-01"}
+    ).respond(json=listing | {"httpstatuscode": 200})
+
+    async def list_flight_ids(**kwargs) -> list[int]:
+        async with AsyncVereinsfliegerApiSession("app_key", "username", "password") as vs:
+            return await vs.list_flight_ids(date(2023, 9, 1), date(2023, 9, 2), **kwargs)
+
+    assert asyncio.run(list_flight_ids()) == [12154186, 12240603]
+    assert asyncio.run(list_flight_ids(member="Instructor, Ian")) == [12154186]
+
+
+def test_async_raise_if_not_signed_in():
+    with pytest.raises(VereinsfliegerError, match="not signed in"):
+        asyncio.run(AsyncVereinsfliegerApiSession("app_key", "username", "password").get_flight(123))
+
+
+@pytest.fixture
+def session_manager() -> VereinsfliegerSessionManager:
+    return VereinsfliegerSessionManager(partial(VereinsfliegerApiSession, "app_key", "username", "password"))
+
+
+def mock_get_flight(respx_mock: respx.mock, *responses: httpx.Response) -> respx.Route:
+    return respx_mock.get(url="/interface/rest/flight/get/12256298").mock(side_effect=responses)
+
+
+def test_session_manager_reuses_session(respx_mock_sign_in: respx.mock, session_manager: VereinsfliegerSessionManager):
+    flight = load_fixture("vf_12256298_pic.json")
+    mock_get_flight(respx_mock_sign_in, *[httpx.Response(httpx.codes.OK, json=flight)] * 8)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        flights = list(executor.map(session_manager.get_flight, [12256298] * 8))
+
+    assert all(item == flights[0] for item in flights)
+    assert respx_mock_sign_in.calls.call_count == 2 + 8
+
+    respx_mock_sign_in.delete(url="/interface/rest/auth/signout/foo") % httpx.codes.OK
+    session_manager.close()
+    assert respx_mock_sign_in.calls.call_count == 2 + 8 + 1
+
+
+def test_session_manager_reauthenticates(respx_mock_sign_in: respx.mock):
+    sessions = []
+
+    def session_factory() -> VereinsfliegerApiSession:
+        sessions.append(VereinsfliegerApiSession("app_key", "username", "password"))
+        return sessions[-1]
+
+    session_manager = VereinsfliegerSessionManager(session_factory)
+    flight = load_fixture("vf_12256298_pic.json")
+    route = mock_get_flight(
+        respx_mock_sign_in,
+        httpx.Response(httpx.codes.OK, json=flight),
+        httpx.Response(httpx.codes.UNAUTHORIZED),
+        httpx.Response(httpx.codes.OK, json=flight),
+    )
+
+    session_manager.get_flight(12256298)
+    session_manager.get_flight(12256298)
+
+    assert route.call_count == 3
+    assert respx_mock_sign_in.calls.call_count == 2 + 2 + 3
+
+    # The connection pool of the discarded session is closed
+    assert [session._http_client.is_closed for session in sessions] == [True, False]
+
+
+def test_session_manager_expires_idle_session(respx_mock_sign_in: respx.mock):
+    session_manager = VereinsfliegerSessionManager(
+        partial(VereinsfliegerApiSession, "app_key", "username", "password"), max_idle=timedelta(0)
+    )
+    flight = load_fixture("vf_12256298_pic.json")
+    mock_get_flight(respx_mock_sign_in, *[httpx.Response(httpx.codes.OK, json=flight)] * 2)
+    sign_out = respx_mock_sign_in.delete(url="/interface/rest/auth/signout/foo") % httpx.codes.OK
+
+    session_manager.get_flight(12256298)
+    time.sleep(0.001)
+    session_manager.get_flight(12256298)
+
+    assert sign_out.call_count == 1
+    assert respx_mock_sign_in.calls.call_count == 2 + 1 + 1 + 2 + 1
+
+
+def test_session_manager_raises_other_errors(
+    respx_mock_sign_in: respx.mock, session_manager: VereinsfliegerSessionManager
+):
+    mock_get_flight(respx_mock_sign_in, httpx.Response(httpx.codes.NOT_FOUND))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        session_manager.get_flight(12256298)
+
+    assert respx_mock_sign_in.calls.call_count == 2 + 1
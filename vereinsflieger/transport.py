@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class TokenBucket:
+    """
+    Token bucket allowing bursts of `capacity` requests and `rate` requests per second on average
+
+    Tokens are reserved under a lock and may go into debt, so concurrent callers are spaced out by `rate` instead of
+    racing for the next token; the returned delay is for the caller to sleep, synchronously or not.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        if delay := self.reserve():
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        if delay := self.reserve():
+            await asyncio.sleep(delay)
+
+
+@dataclass(frozen=True, kw_only=True)
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter on rate limiting, server errors and transport errors (including timeouts)
+
+    Vereinsflieger reads data with POST requests too, so all methods are retried.
+    """
+
+    max_retries: int = 3
+    backoff: timedelta = timedelta(seconds=0.5)
+    max_backoff: timedelta = timedelta(seconds=30)
+    retry_statuses: frozenset[int] = frozenset(
+        {
+            httpx.codes.TOO_MANY_REQUESTS,
+            httpx.codes.INTERNAL_SERVER_ERROR,
+            httpx.codes.BAD_GATEWAY,
+            httpx.codes.SERVICE_UNAVAILABLE,
+            httpx.codes.GATEWAY_TIMEOUT,
+        }
+    )
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        max_backoff = self.max_backoff.total_seconds()
+
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), max_backoff)
+
+        return random.uniform(0, min(max_backoff, self.backoff.total_seconds() * 2**attempt))
+
+    def should_retry(self, attempt: int, response: httpx.Response) -> bool:
+        return attempt < self.max_retries and response.status_code in self.retry_statuses
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    latency: timedelta = timedelta()
+    max_latency: timedelta = timedelta()
+
+    @property
+    def mean_latency(self) -> timedelta:
+        return self.latency / self.requests if self.requests else timedelta()
+
+    def __str__(self):
+        return (
+            f"{self.requests} requests, {self.retries} retries, {self.failures} failures, "
+            f"mean {self.mean_latency.total_seconds() * 1000:.0f} ms, "
+            f"max {self.max_latency.total_seconds() * 1000:.0f} ms"
+        )
+
+
+@dataclass
+class TransportMetrics:
+    """
+    Latency (including retries and rate limiting) and retry counts per endpoint, e.g. `GET /flight/get/{id}`
+    """
+
+    endpoints: dict[str, EndpointMetrics] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @staticmethod
+    def endpoint(request: httpx.Request) -> str:
+        return f"{request.method} {ID_SEGMENT.sub('/{id}', request.url.path)}"
+
+    def record(self, request: httpx.Request, latency: float, retries: int, failed: bool):
+        latency = timedelta(seconds=latency)
+        with self._lock:
+            metrics = self.endpoints.setdefault(self.endpoint(request), EndpointMetrics())
+            metrics.requests += 1
+            metrics.retries += retries
+            metrics.failures += failed
+            metrics.latency += latency
+            metrics.max_latency = max(metrics.max_latency, latency)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+
+
+# Shared by all transports of the process unless they are given their own metrics
+DEFAULT_METRICS = TransportMetrics()
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    Transport throttling requests with a token bucket and retrying them according to a retry policy
+    """
+
+    DEFAULT_RATE = 5.0
+    DEFAULT_CAPACITY = 10
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport | None = None,
+        rate_limiter: TokenBucket | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: TransportMetrics | None = None,
+    ):
+        self._transport = transport if transport is not None else httpx.HTTPTransport()
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else TokenBucket(self.DEFAULT_RATE, self.DEFAULT_CAPACITY)
+        )
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.metrics = metrics if metrics is not None else DEFAULT_METRICS
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start, attempt = time.perf_counter(), 0
+        try:
+            while True:
+                self.rate_limiter.acquire()
+                try:
+                    response = self._transport.handle_request(request)
+                except httpx.TransportError as e:
+                    if attempt >= self.retry_policy.max_retries:
+                        raise
+                    delay = self.retry_policy.delay(attempt)
+                    logger.warning(f"VF API {request.method} {request.url.path} failed ({e!r}), retry in {delay:.1f} s")
+                else:
+                    if not self.retry_policy.should_retry(attempt, response):
+                        self.metrics.record(request, time.perf_counter() - start, attempt, response.is_error)
+                        return response
+                    delay = self.retry_policy.delay(attempt, response)
+                    response.close()
+                    logger.warning(
+                        f"VF API {request.method} {request.url.path} {response.status_code}, retry in {delay:.1f} s"
+                    )
+
+                time.sleep(delay)
+                attempt += 1
+        except httpx.TransportError:
+            self.metrics.record(request, time.perf_counter() - start, attempt, True)
+            raise
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """
+    Asynchronous counterpart of `RetryTransport`
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport | None = None,
+        rate_limiter: TokenBucket | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: TransportMetrics | None = None,
+    ):
+        self._transport = transport if transport is not None else httpx.AsyncHTTPTransport()
+        self.rate_limiter = (
+            rate_limiter
+            if rate_limiter is not None
+            else TokenBucket(RetryTransport.DEFAULT_RATE, RetryTransport.DEFAULT_CAPACITY)
+        )
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.metrics = metrics if metrics is not None else DEFAULT_METRICS
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start, attempt = time.perf_counter(), 0
+        try:
+            while True:
+                await self.rate_limiter.acquire_async()
+                try:
+                    response = await self._transport.handle_async_request(request)
+                except httpx.TransportError as e:
+                    if attempt >= self.retry_policy.max_retries:
+                        raise
+                    delay = self.retry_policy.delay(attempt)
+                    logger.warning(f"VF API {request.method} {request.url.path} failed ({e!r}), retry in {delay:.1f} s")
+                else:
+                    if not self.retry_policy.should_retry(attempt, response):
+                        self.metrics.record(request, time.perf_counter() - start, attempt, response.is_error)
+                        return response
+                    delay = self.retry_policy.delay(attempt, response)
+                    await response.aclose()
+                    logger.warning(
+                        f"VF API {request.method} {request.url.path} {response.status_code}, retry in {delay:.1f} s"
+                    )
+
+                await asyncio.sleep(delay)
+                attempt += 1
+        except httpx.TransportError:
+            self.metrics.record(request, time.perf_counter() - start, attempt, True)
+            raise
+
+    async def aclose(self):
+        await self._transport.aclose()
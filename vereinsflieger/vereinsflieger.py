@@ -1,33 +1,145 @@
+import atexit
+import threading
+from collections.abc import Iterable
+from datetime import date, timedelta
+from functools import partial
+
 from asgiref.sync import async_to_sync
 from django.conf import LazySettings
 
+from .cache import FlightCache
 from .models import Flight
-from .vereinsflieger_api import VereinsfliegerApiSession
-from .vereinsflieger_scraper import VereinsfliegerScraperSession
+from .vereinsflieger_api import AsyncVereinsfliegerApiSession, VereinsfliegerApiSession, VereinsfliegerSessionManager
+from .vereinsflieger_scraper import VereinsfliegerBrowserPool
+
+API_SOURCE = "api"
+SCRAPER_SOURCE = "scraper"
+
+_session_managers_lock = threading.Lock()
+_session_managers: dict[tuple[str, str, str], VereinsfliegerSessionManager] = {}
+
+
+def get_session_manager(settings: LazySettings) -> VereinsfliegerSessionManager:
+    """
+    Returns the session manager of the process for the configured credentials, which signs out on shutdown
+    """
+    credentials = (settings.VEREINSFLIEGER_APP_KEY, settings.VEREINSFLIEGER_USERNAME, settings.VEREINSFLIEGER_PASSWORD)
+
+    with _session_managers_lock:
+        if credentials not in _session_managers:
+            app_key, username, password = credentials
+            manager = VereinsfliegerSessionManager(
+                partial(VereinsfliegerApiSession, app_key=app_key, username=username, password=password)
+            )
+            atexit.register(manager.close)
+            _session_managers[credentials] = manager
+
+        return _session_managers[credentials]
+
+
+_browser_pools_lock = threading.Lock()
+_browser_pools: dict[tuple[str, str], VereinsfliegerBrowserPool] = {}
+
+
+def get_browser_pool(settings: LazySettings) -> VereinsfliegerBrowserPool:
+    """
+    Returns the browser pool of the process for the configured credentials, which closes the browser on shutdown
+    """
+    credentials = (settings.VEREINSFLIEGER_USERNAME, settings.VEREINSFLIEGER_PASSWORD)
+
+    with _browser_pools_lock:
+        if credentials not in _browser_pools:
+            username, password = credentials
+            pool = VereinsfliegerBrowserPool(username=username, password=password)
+            atexit.register(pool.close)
+            _browser_pools[credentials] = pool
+
+        return _browser_pools[credentials]
+
+
+_flight_caches_lock = threading.Lock()
+_flight_caches: dict[tuple[str, timedelta, int], FlightCache] = {}
+
+
+def get_flight_cache(settings: LazySettings) -> FlightCache:
+    """
+    Returns the flight cache of the process for the configured directory, which keeps the size estimate across imports
+    """
+    key = (
+        str(settings.VEREINSFLIEGER_CACHE_DIR),
+        settings.VEREINSFLIEGER_CACHE_TTL,
+        settings.VEREINSFLIEGER_CACHE_MAX_SIZE,
+    )
+
+    with _flight_caches_lock:
+        if key not in _flight_caches:
+            directory, ttl, max_size = key
+            _flight_caches[key] = FlightCache(directory, ttl=ttl, max_size=max_size)
+
+        return _flight_caches[key]
+
+
+def fetch_from_vereinsflieger_api(settings: LazySettings, flight_id: int) -> dict:
+    return get_session_manager(settings).get_flight_data(flight_id)
+
+
+def fetch_from_vereinsflieger_scraper(settings: LazySettings, flight_id: int) -> dict[str, str | None]:
+    return get_browser_pool(settings).get_flight_fields(flight_id)
 
 
 def import_from_vereinsflieger_api(settings: LazySettings, flight_id: int) -> Flight:
-    with VereinsfliegerApiSession(
-        app_key=settings.VEREINSFLIEGER_APP_KEY,
-        username=settings.VEREINSFLIEGER_USERNAME,
-        password=settings.VEREINSFLIEGER_PASSWORD,
-    ) as vs:
-        return vs.get_flight(flight_id)
+    return Flight.from_vereinsflieger_api(fetch_from_vereinsflieger_api(settings, flight_id))
+
+
+def import_from_vereinsflieger_scraper(settings: LazySettings, flight_id: int) -> Flight:
+    return Flight.from_vereinsflieger_fields(fetch_from_vereinsflieger_scraper(settings, flight_id))
+
+
+def import_from_vereinsflieger(settings: LazySettings, flight_id: int, refresh: bool = False) -> Flight:
+    """
+    Imports a flight from the cache, or from the API or the scraper if it's not cached or a refresh is requested
+    """
+    if settings.VEREINSFLIEGER_APP_KEY is None:
+        source, fetch, parse = SCRAPER_SOURCE, fetch_from_vereinsflieger_scraper, Flight.from_vereinsflieger_fields
+    else:
+        source, fetch, parse = API_SOURCE, fetch_from_vereinsflieger_api, Flight.from_vereinsflieger_api
+
+    cache = get_flight_cache(settings)
+
+    data = None if refresh else cache.get(source, flight_id)
+    if data is None:
+        data = fetch(settings, flight_id)
+        cache.put(source, flight_id, data)
+
+    return parse(data)
 
 
 @async_to_sync
-async def import_from_vereinsflieger_scraper(settings: LazySettings, flight_id: int) -> Flight:
-    async with VereinsfliegerScraperSession(
+async def batch_import_from_vereinsflieger_api(
+    settings: LazySettings,
+    flight_ids: Iterable[int] = (),
+    date_range: tuple[date, date] | None = None,
+    member: str | None = None,
+    concurrency: int = AsyncVereinsfliegerApiSession.DEFAULT_CONCURRENCY,
+    refresh: bool = False,
+) -> list[Flight]:
+    cache = get_flight_cache(settings)
+
+    async with AsyncVereinsfliegerApiSession(
+        app_key=settings.VEREINSFLIEGER_APP_KEY,
         username=settings.VEREINSFLIEGER_USERNAME,
         password=settings.VEREINSFLIEGER_PASSWORD,
-        debug=settings.DEBUG,
+        concurrency=concurrency,
     ) as vs:
-        return await vs.get_flight(flight_id)
+        flight_ids = list(flight_ids)
+        if date_range is not None:
+            flight_ids += await vs.list_flight_ids(*date_range, member=member)
 
+        data = {fid: None if refresh else cache.get(API_SOURCE, fid) for fid in dict.fromkeys(flight_ids)}
+        missing = [fid for fid, flight_data in data.items() if flight_data is None]
 
-def import_from_vereinsflieger(settings: LazySettings, flight_id: int) -> Flight:
-    return (
-        import_from_vereinsflieger_scraper(settings, flight_id)
-        if settings.VEREINSFLIEGER_APP_KEY is None
-        else import_from_vereinsflieger_api(settings, flight_id)
-    )
+        for fid, flight_data in zip(missing, await vs.get_flights_data(missing)):
+            cache.put(API_SOURCE, fid, flight_data)
+            data[fid] = flight_data
+
+    return [Flight.from_vereinsflieger_api(flight_data) for flight_data in data.values()]
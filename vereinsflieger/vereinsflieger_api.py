@@ -1,11 +1,19 @@
+import asyncio
 import hashlib
 import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date, timedelta
 from functools import partial
 from typing import Self
 
 import httpx
 
 from .models import Flight
+from .transport import DEFAULT_TIMEOUT, AsyncRetryTransport, RetryTransport
 
 logger = logging.getLogger(__name__)
 
@@ -36,16 +44,52 @@ class HttpClient(httpx.Client):
     def raise_if_not_signed_in(request: httpx.Request):
         raise VereinsfliegerError("not signed in")
 
-    def __init__(self, **kwargs):
+    def __init__(self, transport: httpx.BaseTransport | None = None, **kwargs):
         super().__init__(
             event_hooks={
                 "request": [HttpClient.log_vereinsflieger_request],
                 "response": [HttpClient.log_vereinsflieger_response, httpx.Response.raise_for_status],
             },
-            **kwargs,
+            transport=transport if transport is not None else RetryTransport(),
+            **{"timeout": DEFAULT_TIMEOUT} | kwargs,
         )
 
 
+class AsyncHttpClient(httpx.AsyncClient):
+    DEFAULT_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+
+    @staticmethod
+    async def log_vereinsflieger_request(request: httpx.Request):
+        HttpClient.log_vereinsflieger_request(request)
+
+    @staticmethod
+    async def log_vereinsflieger_response(response: httpx.Response):
+        await response.aread()
+        HttpClient.log_vereinsflieger_response(response)
+
+    @staticmethod
+    async def raise_for_status(response: httpx.Response):
+        response.raise_for_status()
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None, **kwargs):
+        # Limits only apply to the default transport, the retry transport wraps it
+        limits = kwargs.pop("limits", AsyncHttpClient.DEFAULT_LIMITS)
+        super().__init__(
+            event_hooks={
+                "request": [AsyncHttpClient.log_vereinsflieger_request],
+                "response": [AsyncHttpClient.log_vereinsflieger_response, AsyncHttpClient.raise_for_status],
+            },
+            transport=(
+                transport if transport is not None else AsyncRetryTransport(httpx.AsyncHTTPTransport(limits=limits))
+            ),
+            **{"timeout": DEFAULT_TIMEOUT} | kwargs,
+        )
+
+
+def hash_password(password: str) -> str:
+    return hashlib.md5(password.encode("iso-8859-1")).hexdigest()
+
+
 class VereinsfliegerApiSession:
     def __init__(
         self,
@@ -60,6 +104,7 @@ class VereinsfliegerApiSession:
         self._password = password
         self._cid = cid
 
+        self._owns_http_client = http_client is None
         self._http_client = (
             http_client if http_client is not None else HttpClient(base_url=HttpClient.BASE_URL_VEREINSFLIEGER)
         )
@@ -72,7 +117,17 @@ class VereinsfliegerApiSession:
         return self
 
     def __exit__(self, type, value, traceback):
-        self.sign_out()
+        try:
+            self.sign_out()
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Closes the connection pool of the HTTP client, unless it was passed in
+        """
+        if self._owns_http_client:
+            self._http_client.close()
 
     def _add_sign_in_guard_hook(self):
         if HttpClient.raise_if_not_signed_in not in self._http_client.event_hooks["request"]:
@@ -101,7 +156,7 @@ class VereinsfliegerApiSession:
                     "/auth/signin",
                     params={
                         "username": self._username,
-                        "password": hashlib.md5(self._password.encode("iso-8859-1")).hexdigest(),
+                        "password": hash_password(self._password),
                         "cid": self._cid,
                         "appkey": self._app_key,
                         "auth_secret": "",
@@ -124,6 +179,205 @@ class VereinsfliegerApiSession:
         self._add_sign_in_guard_hook()
         self._remove_access_token_hook()
 
+    def get_flight_data(self, fid: int) -> dict:
+        return self._http_client.get(f"/flight/get/{fid}").json()
+
+    def get_flight(self, fid: int) -> Flight:
+        return Flight.from_vereinsflieger_api(self.get_flight_data(fid))
+
+
+class VereinsfliegerSessionManager:
+    """
+    Keeps one signed-in session alive across imports, so that the access token is reused
+
+    Sign-in is serialized under a lock. A session idle for longer than `max_idle` is replaced before use, and a request
+    rejected as unauthorized is retried once with a new session, as the access token may have expired on the server.
+    Replaced sessions are closed as soon as no request uses them anymore.
+    """
+
+    DEFAULT_MAX_IDLE = timedelta(minutes=15)
+    AUTH_FAILURE_STATUS_CODES = (httpx.codes.UNAUTHORIZED, httpx.codes.FORBIDDEN)
+
+    def __init__(self, session_factory: Callable[[], VereinsfliegerApiSession], max_idle: timedelta = DEFAULT_MAX_IDLE):
+        self._session_factory = session_factory
+        self._max_idle = max_idle.total_seconds()
+
+        self._lock = threading.Lock()
+        self._session = None
+        self._last_used = 0.0
+        self._users: Counter[VereinsfliegerApiSession] = Counter()
+
+    @contextmanager
+    def _acquire(self) -> Iterator[VereinsfliegerApiSession]:
+        with self._lock:
+            if self._session is not None and time.monotonic() - self._last_used > self._max_idle:
+                self._sign_out()
+
+            if self._session is None:
+                session = self._session_factory()
+                try:
+                    session.sign_in()
+                except:
+                    session.close()
+                    raise
+                self._session = session
+
+            self._last_used = time.monotonic()
+            session = self._session
+            self._users[session] += 1
+
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._users[session] -= 1
+                self._close_if_replaced(session)
+
+    def _close_if_replaced(self, session: VereinsfliegerApiSession):
+        if session is not self._session and self._users[session] <= 0:
+            del self._users[session]
+            session.close()
+
+    def _discard(self, session: VereinsfliegerApiSession):
+        with self._lock:
+            # The token is no longer valid, so there is nothing to sign out; another thread may have replaced it already
+            if self._session is session:
+                self._session = None
+
+    def _sign_out(self):
+        session, self._session = self._session, None
+        try:
+            session.sign_out()
+        except httpx.HTTPError as e:
+            logger.warning(f"VF API sign out failed: {e}")
+        finally:
+            self._close_if_replaced(session)
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._sign_out()
+
+    def get_flight_data(self, fid: int) -> dict:
+        with self._acquire() as session:
+            try:
+                return session.get_flight_data(fid)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in self.AUTH_FAILURE_STATUS_CODES:
+                    raise
+
+            self._discard(session)
+
+        with self._acquire() as session:
+            return session.get_flight_data(fid)
+
     def get_flight(self, fid: int) -> Flight:
-        response = self._http_client.get(f"/flight/get/{fid}")
-        return Flight.from_vereinsflieger_api(response.json())
+        return Flight.from_vereinsflieger_api(self.get_flight_data(fid))
+
+
+class AsyncVereinsfliegerApiSession:
+    """
+    Signed-in session on one pooled asynchronous client, fetching flights concurrently up to a concurrency limit
+    """
+
+    DEFAULT_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        app_key: str,
+        username: str,
+        password: str,
+        cid: int = 0,
+        http_client: httpx.AsyncClient | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        self._app_key = app_key
+        self._username = username
+        self._password = password
+        self._cid = cid
+
+        self._owns_http_client = http_client is None
+        self._http_client = (
+            http_client if http_client is not None else AsyncHttpClient(base_url=HttpClient.BASE_URL_VEREINSFLIEGER)
+        )
+
+        self._access_token = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> Self:
+        try:
+            await self.sign_in()
+        except:
+            await self._close()
+            raise
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        try:
+            await self.sign_out()
+        finally:
+            await self._close()
+
+    async def _close(self):
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._access_token is None:
+            raise VereinsfliegerError("not signed in")
+
+        kwargs["params"] = kwargs.get("params", {}) | {"accesstoken": self._access_token}
+
+        async with self._semaphore:
+            return await self._http_client.request(method, url, **kwargs)
+
+    async def sign_in(self):
+        response = await self._http_client.post("/auth/accesstoken")
+        access_token = response.json()["accesstoken"]
+
+        await self._http_client.post(
+            "/auth/signin",
+            params={
+                "accesstoken": access_token,
+                "username": self._username,
+                "password": hash_password(self._password),
+                "cid": self._cid,
+                "appkey": self._app_key,
+                "auth_secret": "",
+            },
+        )
+
+        self._access_token = access_token
+
+    async def sign_out(self):
+        await self._request("DELETE", f"/auth/signout/{self._access_token}")
+        self._access_token = None
+
+    async def get_flight_data(self, fid: int) -> dict:
+        response = await self._request("GET", f"/flight/get/{fid}")
+        return response.json()
+
+    async def get_flight(self, fid: int) -> Flight:
+        return Flight.from_vereinsflieger_api(await self.get_flight_data(fid))
+
+    async def get_flights_data(self, fids: Iterable[int]) -> list[dict]:
+        return list(await asyncio.gather(*(self.get_flight_data(fid) for fid in fids)))
+
+    async def get_flights(self, fids: Iterable[int]) -> list[Flight]:
+        return [Flight.from_vereinsflieger_api(data) for data in await self.get_flights_data(fids)]
+
+    async def list_flight_ids(self, date_from: date, date_to: date, member: str | None = None) -> list[int]:
+        """
+        Resolves the flights from `date_from` to `date_to` inclusive, optionally of a member as pilot or attendant
+
+        The member name is given as listed by Vereinsflieger, i.e. "Last name, First name".
+        """
+        response = await self._request("POST", "/flight/list/sincedate", params={"dateparam": date_from.isoformat()})
+
+        return [
+            int(flight["flid"])
+            for flight in response.json().values()
+            if isinstance(flight, dict)
+            and date_from <= date.fromisoformat(flight["dateofflight"]) <= date_to
+            and (member is None or member in (flight["pilotname"], flight["attendantname"]))
+        ]
@@ -1,17 +1,63 @@
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable, Coroutine
 from typing import Self
 
-from playwright.async_api import async_playwright
+from playwright.async_api import Page, Route, async_playwright
 
 from vereinsflieger.models import Flight
 
+from .vereinsflieger_api import VereinsfliegerError
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.vereinsflieger.de"
+
+# Flight pages are only read for their text, so everything that only affects the rendering is skipped
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "stylesheet", "media"})
+
+
+async def block_resources(route: Route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def sign_in(
+    page: Page, base_url: str, username: str, password: str, before_submit: Callable[[], Awaitable] | None = None
+):
+    await page.goto(base_url)
+    await page.wait_for_load_state("load")
+
+    await page.get_by_placeholder("Benutzer oder E-Mail").fill(username)
+    await page.get_by_placeholder("Passwort").fill(password)
+
+    if before_submit is not None:
+        await before_submit()
+
+    await page.get_by_role("button", name="Anmelden").click()
+    await page.wait_for_url(f"{base_url}/member/overview/overview")
+
+
+async def open_flight(page: Page, base_url: str, fid: int) -> bool:
+    """
+    Opens the page of a flight, returns `False` if redirected to the sign-in page because the session expired
+    """
+    await page.goto(f"{base_url}/member/profile/viewflight.php?flid={fid}")
+    await page.wait_for_load_state("load")
+    return "viewflight.php" in page.url
+
 
 class VereinsfliegerScraperSession:
-    BASE_URL = "https://www.vereinsflieger.de"
+    BASE_URL = BASE_URL
 
-    def __init__(self, username: str, password: str, debug: bool = False):
+    def __init__(self, username: str, password: str, debug: bool = False, base_url: str = BASE_URL):
         self.username = username
         self.password = password
         self.debug = debug
+        self.base_url = base_url
         self._counter = 0
 
         assert self.username is not None
@@ -38,16 +84,13 @@ class VereinsfliegerScraperSession:
             self._counter += 1
 
     async def sign_in(self):
-        await self.page.goto(self.BASE_URL)
-        await self.page.wait_for_load_state("load")
-
-        await self.page.get_by_placeholder("Benutzer oder E-Mail").fill(self.username)
-        await self.page.get_by_placeholder("Passwort").fill(self.password)
-
-        await self._screenshot("before-sign-in")
-
-        await self.page.get_by_role("button", name="Anmelden").click()
-        await self.page.wait_for_url(f"{self.BASE_URL}/member/overview/overview")
+        await sign_in(
+            self.page,
+            self.base_url,
+            self.username,
+            self.password,
+            before_submit=lambda: self._screenshot("before-sign-in"),
+        )
 
         await self._screenshot("after-sign-in")
 
@@ -59,12 +102,127 @@ class VereinsfliegerScraperSession:
 
         await self._screenshot("after-logout")
 
-    async def get_flight(self, fid: int) -> Flight:
+    async def get_flight_fields(self, fid: int) -> dict[str, str | None]:
         await self._screenshot(f"before-flight-{fid}")
 
-        await self.page.goto(f"{self.BASE_URL}/member/profile/viewflight.php?flid={fid}")
-        await self.page.wait_for_load_state("load")
+        if not await open_flight(self.page, self.base_url, fid):
+            raise VereinsfliegerError("not signed in")
 
         await self._screenshot(f"after-flight-{fid}")
 
-        return await Flight.from_vereinsflieger_scraper(self.page)
+        return await Flight.scrape_fields(self.page)
+
+    async def get_flight(self, fid: int) -> Flight:
+        return Flight.from_vereinsflieger_fields(await self.get_flight_fields(fid))
+
+
+class VereinsfliegerBrowserPool:
+    """
+    Long-lived browser with one signed-in context, opening a page per concurrent flight request
+
+    Playwright objects are bound to the event loop that created them, so the pool runs its own loop on a daemon thread
+    and the synchronous methods submit coroutines to it. Resources irrelevant for scraping are blocked, and the
+    context signs in again only when a flight page redirects to the sign-in page.
+    """
+
+    DEFAULT_MAX_PAGES = 4
+
+    def __init__(self, username: str, password: str, base_url: str = BASE_URL, max_pages: int = DEFAULT_MAX_PAGES):
+        self.username = username
+        self.password = password
+        self.base_url = base_url
+
+        self._thread_lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+        self._start_lock = asyncio.Lock()
+        self._sign_in_lock = asyncio.Lock()
+        self._pages = asyncio.Semaphore(max_pages)
+        self._sign_in_generation = 0
+
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    def _run(self, coroutine: Coroutine):
+        with self._thread_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="vereinsflieger-browser-pool", daemon=True
+                )
+                self._thread.start()
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _start(self):
+        async with self._start_lock:
+            if self._context is not None:
+                return
+
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.firefox.launch()
+            self._context = await self._browser.new_context()
+            await self._context.route("**/*", block_resources)
+            await self._sign_in(self._sign_in_generation)
+
+    async def _sign_in(self, generation: int):
+        async with self._sign_in_lock:
+            # Pages that found the session expired at the same time only sign in once
+            if generation != self._sign_in_generation:
+                return
+
+            page = await self._context.new_page()
+            try:
+                await sign_in(page, self.base_url, self.username, self.password)
+            finally:
+                await page.close()
+
+            self._sign_in_generation += 1
+            logger.debug(f"VF browser pool signed in (generation {self._sign_in_generation})")
+
+    async def _get_flight_fields(self, fid: int) -> dict[str, str | None]:
+        await self._start()
+
+        async with self._pages:
+            page = await self._context.new_page()
+            try:
+                generation = self._sign_in_generation
+                if not await open_flight(page, self.base_url, fid):
+                    await self._sign_in(generation)
+                    if not await open_flight(page, self.base_url, fid):
+                        raise VereinsfliegerError("not signed in")
+
+                return await Flight.scrape_fields(page)
+            finally:
+                await page.close()
+
+    async def _close(self):
+        for resource in (self._context, self._browser):
+            if resource is not None:
+                await resource.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+        self._context = self._browser = self._playwright = None
+
+    def get_flight_fields(self, fid: int) -> dict[str, str | None]:
+        return self._run(self._get_flight_fields(fid))
+
+    def get_flight(self, fid: int) -> Flight:
+        return Flight.from_vereinsflieger_fields(self.get_flight_fields(fid))
+
+    def warm_up(self):
+        self._run(self._start())
+
+    def close(self):
+        with self._thread_lock:
+            if self._loop is None:
+                return
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+
+        asyncio.run_coroutine_threadsafe(self._close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()